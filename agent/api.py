@@ -1,19 +1,59 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List, Awaitable
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List, Awaitable, Set
 from langgraph.types import Command
 from .graph import workflow
-from .models import InterviewState
+from .nodes import achoose_opening_question
+from .models import APPEND_ONLY_CHANNELS, InterviewState
+from .config import (
+    QUESTION_CACHE_WATCH,
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_SHARDS,
+    CHECKPOINT_KEEP_LAST,
+    CHECKPOINT_COMPACTION_INTERVAL_SECONDS,
+    CHECKPOINT_VACUUM,
+    SESSION_SWEEP_INTERVAL_SECONDS,
+    SESSION_SWEEP_BATCH_SIZE,
+    START_BATCH_CONCURRENCY,
+    START_BATCH_MAX_CANDIDATES,
+    WARMUP_JOB_ROLES,
+    WARMUP_LLM,
+)
+from .question_cache import aget_questions_for_role, question_cache, watch_question_changes
+from .retention import run_periodic_compaction
+from .speculation import discard_speculation, speculation_stats
+from .llm_cache import llm_cache
+from .llm_dispatcher import llm_dispatcher
+from .checkpointing import (
+    DeltaCheckpointSaver,
+    ShardedCheckpointSaver,
+    TimedCheckpointSaver,
+    latest_checkpoint_id,
+    open_sqlite_shards,
+    shard_paths,
+)
+from .idempotency import IdempotencyKeyReused, submit_guard
+from .scoring import build_report
+from .sessions import run_periodic_sweep, session_store
+from .snapshots import snapshot_cache
+from .warmup import warmup
+from . import metrics
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+import asyncio
+import contextlib
+import json
+import threading
+import time
 import uuid
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-DATABASE_URL = "./db/checkpoints.db"
+DATABASE_URL = CHECKPOINT_DB_PATH
 
 api = FastAPI(title="AI agent-backend API")
 
@@ -32,17 +72,27 @@ api.add_middleware(
 )
 
 runnable_app = None
-saver_instance: Optional[AsyncSqliteSaver] = None
+saver_instance: Optional[BaseCheckpointSaver] = None
+saver_shards: List[AsyncSqliteSaver] = []
 saver_context_manager: Optional[Awaitable] = None
-
-
-interview_sessions: Dict[str, str] = {}
+question_watch_stop: Optional[threading.Event] = None
+compaction_tasks: List[asyncio.Task] = []
+warmup_task: Optional[asyncio.Task] = None
+session_sweep_task: Optional[asyncio.Task] = None
+# Batch starts left running after their client disconnected (see start_interview_batch).
+detached_start_tasks: Set[asyncio.Task] = set()
 
 
 class StartInterviewRequest(BaseModel):
     job_role: str
     candidate_id: str
 
+class StartBatchRequest(BaseModel):
+    job_role: str
+    candidate_ids: List[str] = Field(min_length=1, max_length=START_BATCH_MAX_CANDIDATES)
+    # Ask every candidate the same first question, chosen once for the batch.
+    share_opening_question: bool = True
+
 class InterviewResponse(BaseModel):
     session_id: str # This will now be the generated UUID
     status: str
@@ -57,17 +107,153 @@ class SubmitAnswerRequest(BaseModel):
     candidate_response: str
 
 
+class InterviewReport(BaseModel):
+    session_id: str
+    status: str
+    job_role: Optional[str] = None
+    questions_planned: Optional[int] = None
+    questions_answered: int = 0
+    questions_scored: int = 0
+    overall_score: Optional[float] = None # raw sum, as in InterviewResponse
+    mean_score: Optional[float] = None # out of 10
+    normalized_score: Optional[float] = None # percent of the maximum
+    weighted_score: Optional[float] = None # mean weighted by question difficulty
+    topics: Dict[str, Dict[str, Any]] = {}
+    difficulties: Dict[str, Dict[str, Any]] = {}
+    strengths: List[str] = [] # topics ranked by strong answers
+    weaknesses: List[str] = [] # topics ranked by weak answers
+
+
+def _build_interview_response(session_id: str, final_state: Dict[str, Any]) -> InterviewResponse:
+    return InterviewResponse(
+        session_id=session_id,
+        status=final_state.get('interview_status', 'unknown'),
+        current_question=final_state.get('current_question'),
+        feedback=final_state.get('feedback'),
+        overall_score=final_state.get('overall_score'),
+        error_message=final_state.get('error_message'),
+        interview_history_summary=final_state.get('interview_history_summary')
+    )
+
+
+async def _remember_snapshot(session_id: str, response_data: InterviewResponse, checkpoint_id: Optional[str] = None) -> None:
+    if response_data.status == "error":
+        return
+    if checkpoint_id is None:
+        checkpoint_id = await latest_checkpoint_id(saver_shards, session_id)
+    snapshot_cache.put(session_id, checkpoint_id, response_data.model_dump())
+
+
+async def _require_session(session_id: str) -> None:
+    """404 for unknown sessions, 410 for ones the sweeper expired."""
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
+    if session["expired_at"] is not None:
+        raise HTTPException(status_code=410, detail=f"Interview session {session_id} has expired.")
+
+
+async def _claim_turn(session_id: str) -> None:
+    """Mark the session active before a turn runs, so the sweeper cannot expire it mid-turn."""
+    if not await session_store.touch(session_id):
+        raise HTTPException(status_code=410, detail=f"Interview session {session_id} has expired.")
+
+
+async def _record_activity(session_id: str, response_data: InterviewResponse) -> None:
+    # An error response leaves the interview where it was, so only its activity counts.
+    status = None if response_data.status == "error" else response_data.status
+    await session_store.touch(session_id, status)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _llm_cache_gauges():
+    stats = llm_cache.stats()
+    yield "interview_llm_cache_memory_entries", "Entries in the in-memory LLM result cache.", {}, stats["memory_entries"]
+    for kind, counters in stats["kinds"].items():
+        for key, value in counters.items():
+            yield f"interview_llm_cache_{key}", f"LLM result cache {key}.", {"kind": kind}, value
+
+
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_question_cache", "Question catalog cache", question_cache.stats))
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_speculation", "Speculative question selection", speculation_stats))
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_llm_dispatcher", "LLM dispatcher", llm_dispatcher.stats))
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_sessions", "Interview session store", session_store.stats))
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_snapshot_cache", "Interview snapshot cache", snapshot_cache.stats))
+metrics.register_collector(metrics.gauges_from_stats(
+    "interview_submits", "Answer submission guard", submit_guard.stats))
+metrics.register_collector(_llm_cache_gauges)
+
+
+class InvalidateQuestionCacheRequest(BaseModel):
+    job_role: Optional[str] = None # None invalidates every cached role
+
+
 @api.on_event("startup")
 async def startup_event():
-    global runnable_app, saver_instance, saver_context_manager
+    global runnable_app, saver_instance, saver_shards, saver_context_manager, question_watch_stop, warmup_task, session_sweep_task
     try:
-        saver_context_manager = AsyncSqliteSaver.from_conn_string("./db/checkpoints.db")
-        saver_instance = await saver_context_manager.__aenter__()
-        logger.info(f"AsyncSqliteSaver initialized with database: {DATABASE_URL}")
-        runnable_app = workflow.compile(checkpointer=saver_instance)
+        paths = shard_paths(DATABASE_URL, CHECKPOINT_SHARDS)
+        saver_context_manager = open_sqlite_shards(paths)
+        saver_shards = await saver_context_manager.__aenter__()
+        checkpointers = [DeltaCheckpointSaver(shard, APPEND_ONLY_CHANNELS) for shard in saver_shards]
+        for checkpointer in checkpointers:
+            await checkpointer.setup()
+        saver_instance = checkpointers[0] if len(checkpointers) == 1 else ShardedCheckpointSaver(checkpointers)
+        logger.info(f"AsyncSqliteSaver initialized with database: {', '.join(paths)}")
+        await session_store.setup(saver_shards[0], checkpointer=saver_instance)
+        await submit_guard.setup(saver_shards[0])
+        runnable_app = workflow.compile(checkpointer=TimedCheckpointSaver(saver_instance))
         # logger.info(runnable_app.get_graph().draw_mermaid())
         logger.info("LangGraph workflow compiled with AsyncSqliteSaver.")
 
+        if CHECKPOINT_KEEP_LAST > 0:
+            for path, shard in zip(paths, saver_shards):
+                compaction_tasks.append(asyncio.create_task(run_periodic_compaction(
+                    shard.conn,
+                    path,
+                    CHECKPOINT_KEEP_LAST,
+                    CHECKPOINT_COMPACTION_INTERVAL_SECONDS,
+                    lock=shard.lock,
+                    serde=shard.serde,
+                    vacuum=CHECKPOINT_VACUUM,
+                    log=logger.info,
+                )))
+            logger.info(f"Checkpoint compaction enabled: keep_last={CHECKPOINT_KEEP_LAST}, every {CHECKPOINT_COMPACTION_INTERVAL_SECONDS}s.")
+
+        session_sweep_task = asyncio.create_task(run_periodic_sweep(
+            session_store,
+            saver_instance,
+            SESSION_SWEEP_INTERVAL_SECONDS,
+            SESSION_SWEEP_BATCH_SIZE,
+            evict=(snapshot_cache.discard, discard_speculation),
+        ))
+
+        warmup_task = asyncio.create_task(warmup.run(WARMUP_JOB_ROLES, WARMUP_LLM))
+
+        if QUESTION_CACHE_WATCH:
+            question_watch_stop = threading.Event()
+            threading.Thread(
+                target=watch_question_changes,
+                args=(question_watch_stop,),
+                name="question-cache-watch",
+                daemon=True,
+            ).start()
+
     except Exception as e:
         logger.error(f"Error during startup: Could not initialize saver or compile graph: {e}", exc_info=True) # Log exception details
         raise e
@@ -76,47 +262,53 @@ async def startup_event():
 @api.on_event("shutdown")
 async def shutdown_event():
     global saver_context_manager
+    if question_watch_stop:
+        question_watch_stop.set()
+    background_tasks = compaction_tasks + [task for task in (warmup_task, session_sweep_task) if task]
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    compaction_tasks.clear()
+    if detached_start_tasks:
+        # Let batch starts whose client went away finish before the saver closes.
+        await asyncio.gather(*detached_start_tasks, return_exceptions=True)
     if saver_context_manager:
         await saver_context_manager.__aexit__(None, None, None)
         logger.info("AsyncSqliteSaver context exited.")
 
 
-@api.post("/interview/start", response_model=InterviewResponse)
-async def start_interview(request: StartInterviewRequest):
-    global runnable_app
-    if runnable_app is None:
-        raise HTTPException(status_code=500,
-                            detail="Graph not initialized. Server encountered a startup error.")
-
+async def _start_session(
+        job_role: str,
+        candidate_id: str,
+        opening_decision: Optional[Dict[str, Any]] = None,
+) -> InterviewResponse:
     generated_session_id = str(uuid.uuid4())
-    interview_sessions[generated_session_id] = request.candidate_id
-    logger.info(f"Generated session ID {generated_session_id} for candidate {request.candidate_id}")
-
     initial_state = InterviewState(
-        job_role=request.job_role,
+        job_role=job_role,
         candidate_id=generated_session_id
     )
+    configurable = {"thread_id": generated_session_id}
+    if opening_decision is not None:
+        configurable["opening_decision"] = opening_decision
 
     try:
+        await session_store.create(generated_session_id, candidate_id, job_role)
+        logger.info(f"Generated session ID {generated_session_id} for candidate {candidate_id}")
+
         final_state = await runnable_app.ainvoke(
             initial_state,
-            config={"configurable": {"thread_id": generated_session_id}}
+            config={"configurable": configurable}
         )
 
-        response_data = InterviewResponse(
-            session_id=generated_session_id,
-            status=final_state.get('interview_status', 'unknown'),
-            current_question=final_state.get('current_question'),
-            feedback=final_state.get('feedback'),
-            overall_score=final_state.get('overall_score'),
-            error_message=final_state.get('error_message'),
-            interview_history_summary=final_state.get('interview_history_summary')
-        )
+        response_data = _build_interview_response(generated_session_id, final_state)
+        await _remember_snapshot(generated_session_id, response_data)
+        await _record_activity(generated_session_id, response_data)
         logger.info(f"Started interview session {generated_session_id} successfully.")
         return response_data
 
     except Exception as e:
-        logger.error(f"Error starting interview for candidate {request.candidate_id} (session {generated_session_id}): {e}", exc_info=True)
+        logger.error(f"Error starting interview for candidate {candidate_id} (session {generated_session_id}): {e}", exc_info=True)
         return InterviewResponse(
              session_id=generated_session_id,
              status='error',
@@ -124,47 +316,356 @@ async def start_interview(request: StartInterviewRequest):
         )
 
 
+@api.post("/interview/start", response_model=InterviewResponse)
+async def start_interview(request: StartInterviewRequest):
+    global runnable_app
+    if runnable_app is None:
+        raise HTTPException(status_code=500,
+                            detail="Graph not initialized. Server encountered a startup error.")
+
+    return await _start_session(request.job_role, request.candidate_id)
+
+
+@api.post("/interview/start_batch")
+async def start_interview_batch(request: StartBatchRequest):
+    """Start one interview per candidate and stream the results as NDJSON.
+
+    The role's question pool is loaded once and, with
+    ``share_opening_question``, the first question is selected once for the
+    whole batch. Up to ``START_BATCH_CONCURRENCY`` interviews start at a time.
+    Each line is an InterviewResponse plus the candidate's ``index`` and
+    ``candidate_id``, in completion order.
+    """
+    global runnable_app
+    if runnable_app is None:
+        raise HTTPException(status_code=500,
+                            detail="Graph not initialized. Server encountered a startup error.")
+
+    job_role = request.job_role
+    logger.info(f"Starting a batch of {len(request.candidate_ids)} interviews for role {job_role}")
+
+    async def results():
+        started = time.perf_counter()
+        opening_decision = None
+        try:
+            await aget_questions_for_role(job_role)
+            if request.share_opening_question:
+                opening_decision = await achoose_opening_question(job_role)
+        except Exception as e:
+            # Each interview then loads and selects on its own and reports its own error.
+            logger.warning(f"Shared preparation for batch ({job_role}) failed: {e}")
+
+        semaphore = asyncio.Semaphore(START_BATCH_CONCURRENCY)
+
+        running = set()
+
+        async def start_one(index: int, candidate_id: str):
+            async with semaphore:
+                running.add(index)
+                return index, candidate_id, await _start_session(job_role, candidate_id, opening_decision)
+
+        tasks = [asyncio.create_task(start_one(index, candidate_id))
+                 for index, candidate_id in enumerate(request.candidate_ids)]
+        failed = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, candidate_id, response_data = await finished
+                failed += response_data.status == "error"
+                yield json.dumps({"index": index, "candidate_id": candidate_id, **response_data.model_dump()}) + "\n"
+        finally:
+            # The client went away: interviews still queued are dropped, and the
+            # ones already running finish so no session is left half-started.
+            for index, task in enumerate(tasks):
+                if task.done():
+                    continue
+                if index in running:
+                    detached_start_tasks.add(task)
+                    task.add_done_callback(detached_start_tasks.discard)
+                else:
+                    task.cancel()
+        logger.info(f"Started batch of {len(tasks)} interviews for role {job_role} "
+                    f"({failed} failed) in {time.perf_counter() - started:.2f}s")
+
+    return StreamingResponse(
+        results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @api.post("/interview/{session_id}/submit_answer", response_model=InterviewResponse)
-async def submit_answer(session_id: str, request: SubmitAnswerRequest):
+async def submit_answer(
+        session_id: str,
+        request: SubmitAnswerRequest,
+        response: Response,
+        idempotency_key: Optional[str] = Header(None),
+):
+    """Submits to one session run one at a time, across workers. Repeating an ``Idempotency-Key``
+    returns the stored response (with ``Idempotent-Replayed: true``) instead of
+    answering again."""
     global runnable_app
     if runnable_app is None:
         raise HTTPException(status_code=500,
                             detail="Graph not initialized. Server encountered a startup error.")
 
 
-    if session_id not in interview_sessions:
-         logger.warning(f"Received submit for unknown session ID: {session_id}")
-         raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found or has expired.")
+    await _require_session(session_id)
+    await _claim_turn(session_id)
 
     logger.info(f"Received submit for session ID: {session_id}")
 
+    async with submit_guard.serialized(session_id):
+        try:
+            replay = await submit_guard.lookup(session_id, idempotency_key, request.candidate_response)
+        except IdempotencyKeyReused as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if replay is not None:
+            logger.info(f"Replayed submit for session {session_id} (Idempotency-Key {idempotency_key})")
+            response.headers["Idempotent-Replayed"] = "true"
+            return replay
+
+        try:
+
+            final_state = await runnable_app.ainvoke(
+                Command(resume=request.candidate_response),
+                config={"configurable": {"thread_id": session_id}} # Use the UUID from the path
+            )
+
+            response_data = _build_interview_response(session_id, final_state)
+            await _remember_snapshot(session_id, response_data)
+            await _record_activity(session_id, response_data)
+            if response_data.status != "error":
+                await submit_guard.store(session_id, idempotency_key, request.candidate_response, response_data.model_dump())
+            logger.info(f"Processed answer for session {session_id}, status: {response_data.status}")
+            return response_data
+
+        except Exception as e:
+            logger.error(f"Error submitting answer for session {session_id}: {e}", exc_info=True)
+            return InterviewResponse(
+                 session_id=session_id,
+                 status='error',
+                 error_message=f"An error occurred while processing the answer: {e}"
+            )
+
+
+
+@api.post("/interview/{session_id}/submit_answer/stream")
+async def submit_answer_stream(
+        session_id: str,
+        request: SubmitAnswerRequest,
+        idempotency_key: Optional[str] = Header(None),
+):
+    """Server-sent events variant of submit_answer.
+
+    Emits ``node_start``/``node_end`` as the graph runs, ``feedback_token`` while
+    feedback is generated, ``feedback`` and ``question`` as soon as they are
+    known, and finally ``result`` (or ``error``) with the usual InterviewResponse.
+    A repeated ``Idempotency-Key`` only gets the stored ``result``.
+    """
+    global runnable_app
+    if runnable_app is None:
+        raise HTTPException(status_code=500,
+                            detail="Graph not initialized. Server encountered a startup error.")
+
+    await _require_session(session_id)
+    await _claim_turn(session_id)
 
     try:
+        # Fails fast on a reused key before the stream starts; replays are
+        # found (and counted) by the lookup under the claim below.
+        await submit_guard.check(session_id, idempotency_key, request.candidate_response)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    logger.info(f"Received streaming submit for session ID: {session_id}")
+    config = {"configurable": {"thread_id": session_id}}
+
+    async def event_stream():
+        async with submit_guard.serialized(session_id):
+            async for chunk in _stream_answer():
+                yield chunk
+
+    async def _stream_answer():
+        try:
+            replay = await submit_guard.lookup(session_id, idempotency_key, request.candidate_response)
+            if replay is not None:
+                logger.info(f"Replayed streaming submit for session {session_id} (Idempotency-Key {idempotency_key})")
+                yield _sse("result", replay)
+                return
+
+            async for event in runnable_app.astream_events(
+                Command(resume=request.candidate_response),
+                config=config,
+                version="v2",
+            ):
+                kind = event["event"]
+                node = event.get("metadata", {}).get("langgraph_node")
+                if kind == "on_chat_model_stream" and event["name"] == "generate_feedback":
+                    token = event["data"]["chunk"].content
+                    if isinstance(token, str) and token:
+                        yield _sse("feedback_token", {"text": token})
+                elif event["name"] != node:
+                    # Only report the graph's own nodes, not the runnables nested inside them.
+                    continue
+                elif kind == "on_chain_start":
+                    yield _sse("node_start", {"node": node})
+                elif kind == "on_chain_end":
+                    yield _sse("node_end", {"node": node})
+                    output = event["data"].get("output")
+                    if not isinstance(output, dict):
+                        continue
+                    if output.get("feedback"):
+                        yield _sse("feedback", {"text": output["feedback"]})
+                    if output.get("current_question"):
+                        # Only the selecting node (select_question or select_and_ask) sets a question.
+                        yield _sse("question", {"current_question": output["current_question"]})
+
+            snapshot = await runnable_app.aget_state(config)
+            response_data = _build_interview_response(session_id, snapshot.values)
+            await _remember_snapshot(session_id, response_data, snapshot.config["configurable"].get("checkpoint_id"))
+            await _record_activity(session_id, response_data)
+            if response_data.status != "error":
+                await submit_guard.store(session_id, idempotency_key, request.candidate_response, response_data.model_dump())
+            logger.info(f"Streamed answer for session {session_id}, status: {response_data.status}")
+            yield _sse("result", response_data.model_dump())
+
+        except Exception as e:
+            logger.error(f"Error streaming answer for session {session_id}: {e}", exc_info=True)
+            yield _sse("error", InterviewResponse(
+                session_id=session_id,
+                status='error',
+                error_message=f"An error occurred while processing the answer: {e}"
+            ).model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        final_state = await runnable_app.ainvoke(
-            Command(resume=request.candidate_response),
-            config={"configurable": {"thread_id": session_id}} # Use the UUID from the path
-        )
 
-        response_data = InterviewResponse(
-            session_id=session_id,
-            status=final_state.get('interview_status', 'unknown'),
-            current_question=final_state.get('current_question'),
-            feedback=final_state.get('feedback'),
-            overall_score=final_state.get('overall_score'),
-            error_message=final_state.get('error_message'),
-            interview_history_summary=final_state.get('interview_history_summary')
-        )
-        logger.info(f"Processed answer for session {session_id}, status: {response_data.status}")
-        return response_data
+@api.get("/interview/{session_id}", response_model=InterviewResponse)
+async def get_interview(session_id: str, request: Request):
+    """Current state of a session, as the last start/submit_answer returned it.
 
-    except Exception as e:
-        logger.error(f"Error submitting answer for session {session_id}: {e}", exc_info=True)
-        return InterviewResponse(
-             session_id=session_id,
-             status='error',
-             error_message=f"An error occurred while processing the answer: {e}"
-        )
+    Served from the snapshot cache while the session's newest checkpoint is
+    unchanged. The ETag is that checkpoint's ID, so ``If-None-Match`` polling
+    gets a 304 without loading anything.
+    """
+    global runnable_app
+    if runnable_app is None:
+        raise HTTPException(status_code=500,
+                            detail="Graph not initialized. Server encountered a startup error.")
+
+    await _require_session(session_id)
+
+    checkpoint_id = await latest_checkpoint_id(saver_shards, session_id)
+    if checkpoint_id is None:
+        raise HTTPException(status_code=404, detail=f"Interview session {session_id} has no state yet.")
+    etag = f'"{checkpoint_id}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = snapshot_cache.get(session_id, checkpoint_id)
+    if body is None:
+        snapshot = await runnable_app.aget_state({"configurable": {"thread_id": session_id}})
+        response_data = _build_interview_response(session_id, snapshot.values or {})
+        checkpoint_id = snapshot.config["configurable"].get("checkpoint_id") or checkpoint_id
+        await _remember_snapshot(session_id, response_data, checkpoint_id)
+        body = response_data.model_dump()
+        headers["ETag"] = f'"{checkpoint_id}"'
+    return JSONResponse(content=body, headers=headers)
+
+
+@api.get("/interview/{session_id}/report", response_model=InterviewReport)
+async def interview_report(session_id: str):
+    """Scores per topic and difficulty, from the running aggregates (no history scan, no LLM call)."""
+    global runnable_app
+    if runnable_app is None:
+        raise HTTPException(status_code=500,
+                            detail="Graph not initialized. Server encountered a startup error.")
+
+    await _require_session(session_id)
+
+    snapshot = await runnable_app.aget_state({"configurable": {"thread_id": session_id}})
+    values = snapshot.values or {}
+    return InterviewReport(
+        session_id=session_id,
+        status=values.get("interview_status", "unknown"),
+        job_role=values.get("job_role"),
+        questions_planned=values.get("total_questions_planned"),
+        overall_score=values.get("overall_score"),
+        **build_report(values.get("score_aggregates") or {}),
+    )
+
+
+@api.get("/health/live")
+async def health_live():
+    return {"status": "alive"}
+
+
+@api.get("/health/ready")
+async def health_ready():
+    ready = runnable_app is not None and warmup.done
+    if not ready:
+        status = "not_ready"
+    else:
+        # A degraded warm-up left some work to the first requests; they are still served.
+        status = "degraded" if warmup.status == "degraded" else "ready"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": status, "graph": runnable_app is not None, "warmup": warmup.stats()},
+    )
+
+
+@api.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@api.get("/admin/question_cache")
+async def question_cache_stats():
+    return question_cache.stats()
+
+
+@api.post("/admin/question_cache/invalidate")
+async def invalidate_question_cache(request: InvalidateQuestionCacheRequest):
+    removed = question_cache.invalidate(request.job_role)
+    logger.info(f"Question cache invalidated (role={request.job_role or 'all'}, entries removed={removed}).")
+    return {"job_role": request.job_role, "removed": removed}
+
+
+@api.get("/admin/speculation")
+async def speculation_metrics():
+    return speculation_stats()
+
+
+@api.get("/admin/llm_cache")
+async def llm_cache_stats():
+    return llm_cache.stats()
+
+
+@api.post("/admin/llm_cache/clear")
+async def clear_llm_cache():
+    llm_cache.clear()
+    logger.info("LLM result cache cleared.")
+    return {"cleared": True}
+
+
+@api.get("/admin/sessions")
+async def session_store_stats():
+    return session_store.stats()
+
+
+@api.get("/admin/submits")
+async def submit_guard_stats():
+    return submit_guard.stats()
+
+
+@api.get("/admin/llm_dispatcher")
+async def llm_dispatcher_stats():
+    return llm_dispatcher.stats()
 
 
-# uvicorn agent.api:api --reload
\ No newline at end of file
+# uvicorn agent.api:api --reload
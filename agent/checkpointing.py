@@ -0,0 +1,360 @@
+"""Checkpointer wrappers used when compiling the graph for the API."""
+import asyncio
+import contextlib
+import os
+import zlib
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .metrics import checkpoint_seconds
+
+
+class TimedCheckpointSaver(BaseCheckpointSaver):
+    """Delegates to ``saver`` and records every read and write in ``checkpoint_seconds``."""
+
+    def __init__(self, saver: BaseCheckpointSaver):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_next_version(self, current: Any, channel: Any) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with checkpoint_seconds.time(operation="get_tuple"):
+            return self.saver.get_tuple(config)
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, **kwargs)
+
+    def put(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        with checkpoint_seconds.time(operation="put"):
+            return self.saver.put(config, *args, **kwargs)
+
+    def put_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        with checkpoint_seconds.time(operation="put_writes"):
+            return self.saver.put_writes(config, *args, **kwargs)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with checkpoint_seconds.time(operation="delete_thread"):
+            return self.saver.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with checkpoint_seconds.time(operation="get_tuple"):
+            return await self.saver.aget_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        async for item in self.saver.alist(config, **kwargs):
+            yield item
+
+    async def aput(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        with checkpoint_seconds.time(operation="put"):
+            return await self.saver.aput(config, *args, **kwargs)
+
+    async def aput_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        with checkpoint_seconds.time(operation="put_writes"):
+            return await self.saver.aput_writes(config, *args, **kwargs)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        with checkpoint_seconds.time(operation="delete_thread"):
+            return await self.saver.adelete_thread(thread_id)
+
+
+def shard_paths(db_path: str, shards: int) -> List[str]:
+    """SQLite files for ``shards`` shards; a single shard keeps ``db_path`` itself."""
+    if shards <= 1:
+        return [db_path]
+    base, ext = os.path.splitext(db_path)
+    return [f"{base}.shard{i}{ext}" for i in range(shards)]
+
+
+def shard_index(thread_id: str, shards: int) -> int:
+    # crc32 rather than hash(): it must agree across worker processes and restarts.
+    return zlib.crc32(str(thread_id).encode("utf-8")) % shards
+
+
+async def latest_checkpoint_id(shards: Sequence[AsyncSqliteSaver], thread_id: str) -> Optional[str]:
+    """ID of the thread's newest checkpoint, read from the primary key without loading the checkpoint."""
+    saver = shards[shard_index(thread_id, len(shards))]
+    async with saver.lock:
+        async with saver.conn.execute(
+            "SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ''",
+            (str(thread_id),),
+        ) as cur:
+            row = await cur.fetchone()
+    return row[0] if row else None
+
+
+@contextlib.asynccontextmanager
+async def open_sqlite_shards(paths: Sequence[str]):
+    """Open (and set up, which enables WAL) one ``AsyncSqliteSaver`` per path."""
+    async with contextlib.AsyncExitStack() as stack:
+        savers = []
+        for path in paths:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            saver = await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(path))
+            await saver.setup()
+            savers.append(saver)
+        yield savers
+
+
+class ShardedCheckpointSaver(BaseCheckpointSaver):
+    """Spreads threads over several savers by a stable hash of ``thread_id``.
+
+    Each shard has its own connection and lock, so checkpoint writes of
+    different interviews no longer queue behind one another. Every call for a
+    thread goes to the same shard; listing without a thread_id merges all shards.
+    """
+
+    def __init__(self, shards: Sequence[BaseCheckpointSaver]):
+        if not shards:
+            raise ValueError("ShardedCheckpointSaver needs at least one shard.")
+        super().__init__(serde=shards[0].serde)
+        self.shards = list(shards)
+
+    def shard_for(self, thread_id: str) -> BaseCheckpointSaver:
+        return self.shards[shard_index(thread_id, len(self.shards))]
+
+    def _route(self, config: Optional[RunnableConfig]) -> Optional[BaseCheckpointSaver]:
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        return None if thread_id is None else self.shard_for(thread_id)
+
+    @property
+    def config_specs(self) -> list:
+        return self.shards[0].config_specs
+
+    def get_next_version(self, current: Any, channel: Any) -> Any:
+        return self.shards[0].get_next_version(current, channel)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._route(config).get_tuple(config)
+
+    def list(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            limit: Optional[int] = None,
+            **kwargs: Any,
+    ) -> Iterator[CheckpointTuple]:
+        shard = self._route(config)
+        if shard is not None:
+            yield from shard.list(config, limit=limit, **kwargs)
+            return
+        merged = [t for s in self.shards for t in s.list(config, limit=limit, **kwargs)]
+        merged.sort(key=lambda t: t.checkpoint["id"], reverse=True)
+        yield from merged[:limit] if limit else merged
+
+    def put(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        return self._route(config).put(config, *args, **kwargs)
+
+    def put_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        return self._route(config).put_writes(config, *args, **kwargs)
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self.shard_for(thread_id).delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._route(config).aget_tuple(config)
+
+    async def alist(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            limit: Optional[int] = None,
+            **kwargs: Any,
+    ) -> AsyncIterator[CheckpointTuple]:
+        shard = self._route(config)
+        if shard is not None:
+            async for item in shard.alist(config, limit=limit, **kwargs):
+                yield item
+            return
+        merged = []
+        for s in self.shards:
+            merged.extend([t async for t in s.alist(config, limit=limit, **kwargs)])
+        merged.sort(key=lambda t: t.checkpoint["id"], reverse=True)
+        for item in merged[:limit] if limit else merged:
+            yield item
+
+    async def aput(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        return await self._route(config).aput(config, *args, **kwargs)
+
+    async def aput_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        return await self._route(config).aput_writes(config, *args, **kwargs)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await self.shard_for(thread_id).adelete_thread(thread_id)
+
+
+class DeltaCheckpointSaver(BaseCheckpointSaver):
+    """Stores append-only list channels of an ``AsyncSqliteSaver`` as per-version deltas.
+
+    The SQLite saver writes every channel's full value into every checkpoint,
+    so a list that grows by one entry per turn is re-serialized at every
+    superstep. Here each listed channel is left out of the checkpoint and only
+    the entries appended at a new channel version are written, to a
+    ``checkpoint_deltas`` table; reads rebuild the list up to the checkpoint's
+    version. Channels must only grow (an ``operator.add`` reducer) within a
+    thread; a shorter value is stored whole. Checkpoints written before the
+    wrapper keep their inline value and are read as-is.
+    """
+
+    def __init__(self, saver: AsyncSqliteSaver, channels: Sequence[str]):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.channels = tuple(channels)
+        self._is_setup = False
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_next_version(self, current: Any, channel: Any) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+    async def setup(self) -> None:
+        if self._is_setup:
+            return
+        await self.saver.setup()
+        async with self.saver.lock:
+            await self.saver.conn.execute(
+                """CREATE TABLE IF NOT EXISTS checkpoint_deltas (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    channel TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    start_index INTEGER NOT NULL,
+                    end_index INTEGER NOT NULL,
+                    type TEXT,
+                    blob BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+                )"""
+            )
+            await self.saver.conn.commit()
+        self._is_setup = True
+
+    async def _write_delta(self, thread_id: str, checkpoint_ns: str, channel: str, version: str, value: list) -> None:
+        async with self.saver.lock:
+            async with self.saver.conn.execute(
+                "SELECT end_index FROM checkpoint_deltas WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? "
+                "AND version < ? ORDER BY version DESC LIMIT 1",
+                (thread_id, checkpoint_ns, channel, version),
+            ) as cur:
+                row = await cur.fetchone()
+            start = row[0] if row and row[0] <= len(value) else 0
+            type_, blob = self.serde.dumps_typed(value[start:])
+            await self.saver.conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_deltas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, channel, version, start, len(value), type_, blob),
+            )
+            await self.saver.conn.commit()
+
+    async def _read_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> list:
+        async with self.saver.lock:
+            async with self.saver.conn.execute(
+                "SELECT start_index, type, blob FROM checkpoint_deltas WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version <= ? ORDER BY version",
+                (thread_id, checkpoint_ns, channel, version),
+            ) as cur:
+                rows = await cur.fetchall()
+        value: list = []
+        for start, type_, blob in rows:
+            value = value[:start] + self.serde.loads_typed((type_, blob))
+        return value
+
+    async def _restore(self, item: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        if item is None:
+            return None
+        configurable = item.config["configurable"]
+        values = item.checkpoint["channel_values"]
+        missing = [c for c in self.channels if c not in values and c in item.checkpoint["channel_versions"]]
+        if not missing:
+            return item
+        values = dict(values)
+        for channel in missing:
+            values[channel] = await self._read_channel(
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                channel,
+                str(item.checkpoint["channel_versions"][channel]),
+            )
+        return item._replace(checkpoint={**item.checkpoint, "channel_values": values})
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self.setup()
+        return await self._restore(await self.saver.aget_tuple(config))
+
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        await self.setup()
+        # The SQLite saver holds its lock while listing, and restoring needs it too.
+        items = [item async for item in self.saver.alist(config, **kwargs)]
+        for item in items:
+            yield await self._restore(item)
+
+    async def aput(
+            self,
+            config: RunnableConfig,
+            checkpoint: Any,
+            metadata: Any,
+            new_versions: Any,
+    ) -> RunnableConfig:
+        await self.setup()
+        values = checkpoint["channel_values"]
+        if any(c in values for c in self.channels):
+            configurable = config["configurable"]
+            for channel in self.channels:
+                if channel in values and channel in new_versions:
+                    await self._write_delta(
+                        configurable["thread_id"],
+                        configurable.get("checkpoint_ns", ""),
+                        channel,
+                        str(checkpoint["channel_versions"][channel]),
+                        list(values[channel]),
+                    )
+            values = {k: v for k, v in values.items() if k not in self.channels}
+            checkpoint = {**checkpoint, "channel_values": values}
+        return await self.saver.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        return await self.saver.aput_writes(config, *args, **kwargs)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.setup()
+        await self.saver.adelete_thread(thread_id)
+        async with self.saver.lock:
+            await self.saver.conn.execute("DELETE FROM checkpoint_deltas WHERE thread_id = ?", (thread_id,))
+            await self.saver.conn.commit()
+
+    # The sync interface runs the async one on the saver's event loop, as AsyncSqliteSaver does.
+    def _run(self, coro):
+        try:
+            if asyncio.get_running_loop() is self.saver.loop:
+                coro.close()
+                raise asyncio.InvalidStateError(
+                    "Synchronous calls to DeltaCheckpointSaver are only allowed from a different thread. "
+                    "From the main thread, use the async interface.")
+        except RuntimeError:
+            pass
+        return asyncio.run_coroutine_threadsafe(coro, self.saver.loop).result()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._run(self.aget_tuple(config))
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        async def collect():
+            return [item async for item in self.alist(config, **kwargs)]
+        yield from self._run(collect())
+
+    def put(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        return self._run(self.aput(config, *args, **kwargs))
+
+    def put_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        return self._run(self.aput_writes(config, *args, **kwargs))
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self._run(self.adelete_thread(thread_id))
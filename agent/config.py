@@ -1,32 +1,171 @@
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+from .log import configure_logging
 
 load_dotenv()
+
+# DEBUG traces every node and LLM call; LOG_FORMAT=json emits one JSON object per line.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+configure_logging(LOG_LEVEL, LOG_FORMAT)
+logger = logging.getLogger(__name__)
+
 mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
 database_name = os.getenv("MONGODB_DB_NAME", "interviewDB")
 
+# Mongo and Gemini clients are created on first use (get_db / get_llm), so
+# importing the agent never blocks on the network. A failed Mongo connection
+# is retried on a later call once MONGO_RETRY_SECONDS have passed.
+MONGO_RETRY_SECONDS = float(os.getenv("MONGO_RETRY_SECONDS", "30"))
+
 client = None
 db = None
+llm = None
+_client_lock = threading.Lock()
+_mongo_failed_at: float | None = None
+
+
+def get_db():
+    global client, db, _mongo_failed_at
+    if db is not None:
+        return db
+    with _client_lock:
+        if db is not None:
+            return db
+        if _mongo_failed_at is not None and time.monotonic() - _mongo_failed_at < MONGO_RETRY_SECONDS:
+            return None
+        from pymongo import MongoClient
+        from pymongo.errors import ConnectionFailure
+        try:
+            client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
+            client.admin.command('ismaster') # Check connection
+            db = client[database_name]
+            _mongo_failed_at = None
+            logger.info("MongoDB connection successful! Connected to database: %s", database_name)
+        except ConnectionFailure as e:
+            logger.error("MongoDB connection failed: %s", e)
+            logger.error("Please ensure MongoDB is running and accessible.")
+            client = None
+            _mongo_failed_at = time.monotonic()
+        except Exception as e:
+            logger.error("An unexpected error occurred during MongoDB connection: %s", e)
+            client = None
+            _mongo_failed_at = time.monotonic()
+        return db
+
+
+def get_llm():
+    global llm
+    if llm is None:
+        with _client_lock:
+            if llm is None:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                # Retries are owned by llm_dispatcher, so the client makes a single attempt.
+                llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", max_retries=1)
+    return llm
+
+
+TOTAL_QUESTIONS_PLANNED = int(os.getenv("NUM_QUESTIONS", "5"))
+
+# Roles whose question catalogs (and search index) are loaded in the background
+# at API startup, comma separated. WARMUP_LLM also opens the Gemini connection.
+WARMUP_JOB_ROLES = [role.strip() for role in os.getenv("WARMUP_JOB_ROLES", "").split(",") if role.strip()]
+WARMUP_LLM = os.getenv("WARMUP_LLM", "true").lower() == "true"
+# Warm-up stops waiting for Mongo and retrying failed preloads after this long
+# and reports itself degraded; readiness does not wait any longer than that.
+WARMUP_DEADLINE_SECONDS = float(os.getenv("WARMUP_DEADLINE_SECONDS", "120"))
+
+QUESTION_CACHE_TTL_SECONDS = float(os.getenv("QUESTION_CACHE_TTL_SECONDS", "300"))
+QUESTION_CACHE_MAX_ROLES = int(os.getenv("QUESTION_CACHE_MAX_ROLES", "64"))
+QUESTION_CACHE_WATCH = os.getenv("QUESTION_CACHE_WATCH", "false").lower() == "true"
+
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "./db/checkpoints.db")
+# >1 spreads threads over that many SQLite files (<name>.shard<i>.db), each with its own connection.
+CHECKPOINT_SHARDS = max(1, int(os.getenv("CHECKPOINT_SHARDS", "1")))
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "0")) # 0 disables background compaction
+CHECKPOINT_COMPACTION_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL_SECONDS", "600"))
+CHECKPOINT_VACUUM = os.getenv("CHECKPOINT_VACUUM", "false").lower() == "true"
+
+# Sessions are stored in the checkpoint database (see sessions.py); this bounds
+# the per-worker LRU in front of it.
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+# Abandoned sessions: unfinished ones idle longer than the idle TTL, and any
+# session older than the max age, are marked terminated and their checkpoints
+# deleted by a background sweeper (0 disables either rule). Their rows are kept
+# as tombstones, answering 410 instead of 404, for SESSION_TOMBSTONE_SECONDS.
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "0"))
+SESSION_MAX_AGE_SECONDS = float(os.getenv("SESSION_MAX_AGE_SECONDS", "0"))
+SESSION_TOMBSTONE_SECONDS = float(os.getenv("SESSION_TOMBSTONE_SECONDS", "604800"))
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "100"))
+
+# How long submit_answer responses are kept (in the checkpoint database) for
+# replaying a repeated Idempotency-Key, and how many each worker also keeps in
+# memory. A session's turn claim older than the timeout is from a worker that
+# died mid-turn and is taken over.
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+SUBMIT_CLAIM_TIMEOUT_SECONDS = float(os.getenv("SUBMIT_CLAIM_TIMEOUT_SECONDS", "600"))
+
+# POST /interview/start_batch: interviews started at once, and candidates per request.
+START_BATCH_CONCURRENCY = max(1, int(os.getenv("START_BATCH_CONCURRENCY", "8")))
+START_BATCH_MAX_CANDIDATES = int(os.getenv("START_BATCH_MAX_CANDIDATES", "1000"))
+
+# Latest InterviewResponse per session kept by each worker for GET /interview/{id}.
+SNAPSHOT_CACHE_MAX_ENTRIES = int(os.getenv("SNAPSHOT_CACHE_MAX_ENTRIES", "10000"))
+
+# "llm": Gemini picks every question. "local": the deterministic selector in
+# selector.py picks (no LLM call). "hybrid": the local selector ranks and the
+# LLM only breaks ties between equally ranked questions.
+QUESTION_SELECTION_MODE = os.getenv("QUESTION_SELECTION_MODE", "llm").lower()
+
+# Pick the next question in the background while the candidate is answering
+# (async API path only; ignored when QUESTION_SELECTION_MODE is "local").
+SPECULATIVE_SELECTION = os.getenv("SPECULATIVE_SELECTION", "false").lower() == "true"
+
+# "two_call": evaluate, then generate feedback in a second LLM call.
+# "fused": one call returns analysis, evaluation and feedback together.
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "two_call").lower()
+
+# "classic": one graph node per step of a turn. "lean": selecting and asking
+# run as one node, and receiving, evaluating, feedback and the state update as
+# another, so a turn takes fewer supersteps and checkpoint writes. Threads left
+# waiting for an answer cannot be resumed after switching topology.
+GRAPH_TOPOLOGY = os.getenv("GRAPH_TOPOLOGY", "classic").lower()
+
+# Selection and evaluation replies are requested in JSON mode, constrained to
+# the schemas in structured_output.py. A reply that still cannot be parsed
+# (after repairing common defects) is re-asked once.
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "true").lower() == "true"
+STRUCTURED_OUTPUT_REASK = os.getenv("STRUCTURED_OUTPUT_REASK", "true").lower() == "true"
+
+# Evaluation and feedback results are cached by question, role, prompt version
+# and normalized answer. Set LLM_CACHE_DB_PATH to add a SQLite tier on disk.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH") or None
 
+# The LLM selection prompt lists only the SELECTION_SHORTLIST_K questions most
+# similar to the recent conversation, plus up to SELECTION_COVERAGE_SAMPLE from
+# topics those miss. 0 sends the whole pool.
+SELECTION_SHORTLIST_K = int(os.getenv("SELECTION_SHORTLIST_K", "20"))
+SELECTION_COVERAGE_SAMPLE = int(os.getenv("SELECTION_COVERAGE_SAMPLE", "5"))
 
-try:
-    client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
-    client.admin.command('ismaster') # Check connection
-    db = client[database_name]
-    print(f"MongoDB connection successful! Connected to database: {database_name}")
-except ConnectionFailure as e:
-    print(f"MongoDB connection failed: {e}")
-    print("Please ensure MongoDB is running and accessible.")
-    client = None
-    db = None
-except Exception as e:
-    print(f"An unexpected error occurred during MongoDB connection: {e}")
-    client = None
-    db = None
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
-
-TOTAL_QUESTIONS_PLANNED = int(os.getenv("NUM_QUESTIONS"))
+# LLM dispatcher (llm_dispatcher.py): quota, concurrency, deadlines, retries
+# and circuit breaking shared by every Gemini call. A rate of 0 disables the
+# token bucket.
+LLM_RATE_PER_MINUTE = float(os.getenv("LLM_RATE_PER_MINUTE", "900"))
+LLM_BURST = int(os.getenv("LLM_BURST", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "90"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "8"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
@@ -1,11 +1,18 @@
+import logging
+import time
 from typing import List, Dict, Any, Optional
-from .config import db
+from .config import get_db
+from .metrics import question_fetch_seconds
+
+logger = logging.getLogger(__name__)
 
-def fetch_questions_from_db(job_role: str) -> List[Dict[str, Any]]:
-    print(f"-> DB: Fetching questions for {job_role} from MongoDB (using _id)")
 
+def _fetch_questions_from_db(job_role: str) -> List[Dict[str, Any]]:
+    logger.debug("-> DB: Fetching questions for %s from MongoDB (using _id)", job_role)
+
+    db = get_db()
     if db is None:
-        print("MongoDB client is not available. Cannot fetch questions.")
+        logger.warning("MongoDB client is not available. Cannot fetch questions.")
         return []
 
     questions_collection = db.questions
@@ -28,11 +35,17 @@ def fetch_questions_from_db(job_role: str) -> List[Dict[str, Any]]:
             questions_list_formatted.append(formatted_question)
 
 
-        print(f"Found and formatted {len(questions_list_formatted)} questions in DB for role '{job_role}'.")
+        logger.info("Found and formatted %s questions in DB for role '%s'.", len(questions_list_formatted), job_role)
         return questions_list_formatted
 
     except Exception as e:
-        print(f"Error fetching questions from MongoDB for role '{job_role}': {e}")
+        logger.warning("Error fetching questions from MongoDB for role '%s': %s", job_role, e)
         return []
 
 
+def fetch_questions_from_db(job_role: str) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    questions = _fetch_questions_from_db(job_role)
+    # An empty list is also what a failed or unavailable Mongo returns.
+    question_fetch_seconds.observe(time.perf_counter() - started, outcome="ok" if questions else "empty")
+    return questions
@@ -1,5 +1,8 @@
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from .config import GRAPH_TOPOLOGY
+from .metrics import timed_node
 from .models import InterviewState
 
 from .nodes import (
@@ -10,48 +13,117 @@ from .nodes import (
     process_response_node,
     generate_feedback_node,
     provide_feedback_node,
+    astart_interview_node,
+    aselect_question_node,
+    aask_question_node,
+    aprocess_response_node,
+    agenerate_feedback_node,
     update_state_node,
+    select_and_ask_node,
+    aselect_and_ask_node,
+    answer_node,
+    aanswer_node,
     decide_next_after_select,
+    decide_next_after_process,
     decide_next_after_update,
 )
 app = None
 saver = None
 
-workflow = StateGraph(InterviewState)
-workflow.add_node("start_interview", start_interview_node)
-workflow.add_node("select_question", select_question_node)
-workflow.add_node("ask_question", ask_question_node)
-workflow.add_node("receive_response", receive_response_node)
-workflow.add_node("process_response", process_response_node)
-workflow.add_node("generate_feedback", generate_feedback_node)
-workflow.add_node("provide_feedback", provide_feedback_node)
-workflow.add_node("update_state", update_state_node)
 
+def _node(name, func, afunc=None):
+    """Time every run of a node; with ``afunc``, ``ainvoke`` awaits it instead of running ``func`` in a thread."""
+    if afunc is None:
+        return timed_node(name, func)
+    return RunnableLambda(timed_node(name, func), afunc=timed_node(name, afunc))
 
 
-workflow.set_entry_point("start_interview")
-workflow.add_edge("start_interview", "select_question")
-workflow.add_conditional_edges(
-    "select_question",
-    decide_next_after_select,
-    {
-        "ask_question": "ask_question",
-        END: END,
-    }
-)
+def _classic_workflow() -> StateGraph:
+    # Nodes that do I/O carry both implementations: `invoke` runs the sync one
+    # (scripts), `ainvoke` awaits the async one so the API never parks a worker
+    # thread on an LLM round trip.
+    workflow = StateGraph(InterviewState)
+    workflow.add_node("start_interview", _node("start_interview", start_interview_node, astart_interview_node))
+    workflow.add_node("select_question", _node("select_question", select_question_node, aselect_question_node))
+    workflow.add_node("ask_question", _node("ask_question", ask_question_node, aask_question_node))
+    workflow.add_node("receive_response", _node("receive_response", receive_response_node))
+    workflow.add_node("process_response", _node("process_response", process_response_node, aprocess_response_node))
+    workflow.add_node("generate_feedback", _node("generate_feedback", generate_feedback_node, agenerate_feedback_node))
+    workflow.add_node("provide_feedback", _node("provide_feedback", provide_feedback_node))
+    workflow.add_node("update_state", _node("update_state", update_state_node))
 
-workflow.add_edge("ask_question", "receive_response")
-workflow.add_edge("receive_response", "process_response")
-workflow.add_edge("process_response", "generate_feedback")
-workflow.add_edge("generate_feedback", "provide_feedback")
-workflow.add_edge("provide_feedback", "update_state")
-workflow.add_conditional_edges(
-    "update_state",
-    decide_next_after_update,
-    {
-        "select_question": "select_question",
-        END: END,
-    }
-)
+    workflow.set_entry_point("start_interview")
+    workflow.add_edge("start_interview", "select_question")
+    workflow.add_conditional_edges(
+        "select_question",
+        decide_next_after_select,
+        {
+            "ask_question": "ask_question",
+            END: END,
+        }
+    )
+
+    workflow.add_edge("ask_question", "receive_response")
+    workflow.add_edge("receive_response", "process_response")
+    workflow.add_conditional_edges(
+        "process_response",
+        decide_next_after_process,
+        {
+            "generate_feedback": "generate_feedback",
+            "provide_feedback": "provide_feedback",
+        }
+    )
+    workflow.add_edge("generate_feedback", "provide_feedback")
+    workflow.add_edge("provide_feedback", "update_state")
+    workflow.add_conditional_edges(
+        "update_state",
+        decide_next_after_update,
+        {
+            "select_question": "select_question",
+            END: END,
+        }
+    )
+    return workflow
+
+
+def _lean_workflow() -> StateGraph:
+    # Same steps and routing as the classic graph, but a turn is two supersteps:
+    # select_and_ask (ends with the question) and answer (waits for the
+    # response, then evaluates, gives feedback and updates the state).
+    workflow = StateGraph(InterviewState)
+    workflow.add_node("start_interview", _node("start_interview", start_interview_node, astart_interview_node))
+    workflow.add_node("select_and_ask", _node("select_and_ask", select_and_ask_node, aselect_and_ask_node))
+    workflow.add_node("answer", _node("answer", answer_node, aanswer_node))
+
+    workflow.set_entry_point("start_interview")
+    workflow.add_edge("start_interview", "select_and_ask")
+    workflow.add_conditional_edges(
+        "select_and_ask",
+        decide_next_after_select,
+        {
+            "ask_question": "answer",
+            END: END,
+        }
+    )
+    workflow.add_conditional_edges(
+        "answer",
+        decide_next_after_update,
+        {
+            "select_question": "select_and_ask",
+            END: END,
+        }
+    )
+    return workflow
+
+
+TOPOLOGIES = {"classic": _classic_workflow, "lean": _lean_workflow}
+
+
+def build_workflow(topology: str = GRAPH_TOPOLOGY) -> StateGraph:
+    """Return the uncompiled interview graph for ``topology`` ("classic" or "lean")."""
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown graph topology '{topology}'; expected one of {', '.join(TOPOLOGIES)}.")
+    return TOPOLOGIES[topology]()
 
 
+workflow = build_workflow()
@@ -0,0 +1,252 @@
+"""Serialized, idempotent answer submission.
+
+A retried or double-clicked ``submit_answer`` would resume the graph a second
+time, so it would re-run every LLM call of the turn and race the first run's
+checkpoint writes. ``SubmitGuard`` prevents both, across every worker that
+opens the same checkpoint database:
+
+* ``serialized(session_id)`` holds the session's turn claim, a row in the
+  ``submit_claims`` table taken with ``INSERT ... ON CONFLICT DO NOTHING``, so
+  submits to one session run one after another whichever worker they reach
+  (different sessions still overlap). A worker that loses the race polls until
+  the row is released; a claim older than ``SUBMIT_CLAIM_TIMEOUT_SECONDS`` was
+  left by a worker that died mid-turn and is taken over. Within a worker, a
+  per-session ``asyncio.Lock`` queues contenders first so only one of them polls.
+* Responses are kept for ``IDEMPOTENCY_TTL_SECONDS`` under the client's
+  ``Idempotency-Key`` in the ``submit_results`` table. A repeat of the key,
+  including one that waited on the claim behind the original, gets the stored
+  response without touching the graph. Reusing a key with a different answer
+  raises ``IdempotencyKeyReused``. Each worker also keeps the responses it has
+  seen in a bounded in-memory LRU, which answers repeats without a query.
+
+Until ``setup`` binds the tables (e.g. in the benchmarks), both are per worker
+only.
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .config import IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_TTL_SECONDS, SUBMIT_CLAIM_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Polling for a turn claim held by another worker backs off between these.
+CLAIM_POLL_MIN_SECONDS = 0.05
+CLAIM_POLL_MAX_SECONDS = 0.5
+
+
+class IdempotencyKeyReused(ValueError):
+    """The Idempotency-Key was already used for a different answer."""
+
+
+def _fingerprint(answer: str) -> str:
+    return hashlib.sha256(answer.encode("utf-8")).hexdigest()
+
+
+class SubmitGuard:
+    def __init__(self, ttl_seconds: float, max_entries: int, claim_timeout_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._claim_timeout_seconds = claim_timeout_seconds
+        self._results: "OrderedDict[Tuple[str, str], Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        # session_id -> (lock, holders and waiters); dropped when nobody needs it.
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._saver: Optional[AsyncSqliteSaver] = None
+
+        self.submits = 0
+        self.serialized_waits = 0
+        self.claim_waits = 0
+        self.claims_taken_over = 0
+        self.replayed = 0
+        self.replayed_from_store = 0
+        self.conflicts = 0
+        self.stored = 0
+
+    async def setup(self, saver: AsyncSqliteSaver) -> None:
+        """Bind to the saver's connection (and lock) and create the tables if needed."""
+        self._saver = saver
+        self._results.clear()
+        async with saver.lock:
+            await saver.conn.execute(
+                """CREATE TABLE IF NOT EXISTS submit_claims (
+                    session_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    claimed_at REAL NOT NULL
+                )"""
+            )
+            await saver.conn.execute(
+                """CREATE TABLE IF NOT EXISTS submit_results (
+                    session_id TEXT NOT NULL,
+                    idempotency_key TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, idempotency_key)
+                )"""
+            )
+            await saver.conn.execute(
+                "CREATE INDEX IF NOT EXISTS submit_results_expires ON submit_results (expires_at)"
+            )
+            await saver.conn.commit()
+
+    @contextlib.asynccontextmanager
+    async def serialized(self, session_id: str) -> AsyncIterator[None]:
+        """Hold the session's turn claim for the duration of the block."""
+        lock, users = self._locks.get(session_id) or (asyncio.Lock(), 0)
+        self._locks[session_id] = (lock, users + 1)
+        self.submits += 1
+        if lock.locked():
+            self.serialized_waits += 1
+        try:
+            async with lock:
+                owner = await self._claim(session_id)
+                try:
+                    yield
+                finally:
+                    if owner is not None:
+                        await self._release(session_id, owner)
+        finally:
+            lock, users = self._locks[session_id]
+            if users == 1:
+                del self._locks[session_id]
+            else:
+                self._locks[session_id] = (lock, users - 1)
+
+    async def _claim(self, session_id: str) -> Optional[str]:
+        """Insert the session's claim row, waiting while another worker holds it."""
+        if self._saver is None:
+            return None
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        delay = CLAIM_POLL_MIN_SECONDS
+        waited = False
+        while True:
+            now = time.time()
+            async with self._saver.lock:
+                cur = await self._saver.conn.execute(
+                    "DELETE FROM submit_claims WHERE session_id = ? AND claimed_at < ?",
+                    (session_id, now - self._claim_timeout_seconds),
+                )
+                stale = cur.rowcount > 0
+                await cur.close()
+                cur = await self._saver.conn.execute(
+                    "INSERT INTO submit_claims (session_id, owner, claimed_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT (session_id) DO NOTHING",
+                    (session_id, owner, now),
+                )
+                claimed = cur.rowcount > 0
+                await cur.close()
+                await self._saver.conn.commit()
+            if stale:
+                self.claims_taken_over += 1
+                logger.warning(f"Took over a stale submit claim on session {session_id}")
+            if claimed:
+                return owner
+            if not waited:
+                waited = True
+                self.claim_waits += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CLAIM_POLL_MAX_SECONDS)
+
+    async def _release(self, session_id: str, owner: str) -> None:
+        async with self._saver.lock:
+            await self._saver.conn.execute(
+                "DELETE FROM submit_claims WHERE session_id = ? AND owner = ?", (session_id, owner)
+            )
+            await self._saver.conn.commit()
+
+    def _evict_expired(self, now: float) -> None:
+        while self._results:
+            key, (expires_at, _, _) = next(iter(self._results.items()))
+            if len(self._results) <= self._max_entries and expires_at > now:
+                break
+            del self._results[key]
+
+    def _remember(self, session_id: str, key: str, expires_at: float, fingerprint: str, body: Dict[str, Any]) -> None:
+        # Entries expire in insertion order, so a re-stored key moves to the end.
+        self._results.pop((session_id, key), None)
+        self._results[(session_id, key)] = (expires_at, fingerprint, body)
+        self._evict_expired(time.time())
+
+    async def _entry(self, session_id: str, key: Optional[str], answer: str) -> Optional[Tuple[float, str, Dict[str, Any]]]:
+        if not key:
+            return None
+        now = time.time()
+        self._evict_expired(now)
+        entry = self._results.get((session_id, key))
+        if entry is None and self._saver is not None:
+            async with self._saver.lock:
+                async with self._saver.conn.execute(
+                    "SELECT expires_at, fingerprint, body FROM submit_results"
+                    " WHERE session_id = ? AND idempotency_key = ? AND expires_at > ?",
+                    (session_id, key, now),
+                ) as cur:
+                    row = await cur.fetchone()
+            if row is not None:
+                entry = (row[0], row[1], json.loads(row[2]))
+                self._remember(session_id, key, *entry)
+        if entry is not None and entry[1] != _fingerprint(answer):
+            self.conflicts += 1
+            raise IdempotencyKeyReused(f"Idempotency-Key {key!r} was already used with a different answer.")
+        return entry
+
+    async def check(self, session_id: str, key: Optional[str], answer: str) -> None:
+        """Raise ``IdempotencyKeyReused`` early, without taking the claim or counting a replay."""
+        await self._entry(session_id, key, answer)
+
+    async def lookup(self, session_id: str, key: Optional[str], answer: str) -> Optional[Dict[str, Any]]:
+        """The response stored for ``key``, if any. Call it while holding ``serialized``."""
+        in_memory = (session_id, key) in self._results
+        entry = await self._entry(session_id, key, answer)
+        if entry is None:
+            return None
+        self.replayed += 1
+        if not in_memory:
+            self.replayed_from_store += 1
+        return entry[2]
+
+    async def store(self, session_id: str, key: Optional[str], answer: str, body: Dict[str, Any]) -> None:
+        if not key or self._ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + self._ttl_seconds
+        fingerprint = _fingerprint(answer)
+        self._remember(session_id, key, expires_at, fingerprint, body)
+        self.stored += 1
+        if self._saver is None:
+            return
+        async with self._saver.lock:
+            await self._saver.conn.execute(
+                "INSERT OR REPLACE INTO submit_results"
+                " (session_id, idempotency_key, fingerprint, body, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, key, fingerprint, json.dumps(body), expires_at),
+            )
+            await self._saver.conn.execute("DELETE FROM submit_results WHERE expires_at <= ?", (now,))
+            await self._saver.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._results),
+            "max_entries": self._max_entries,
+            "shared": self._saver is not None,
+            "sessions_locked": len(self._locks),
+            "submits": self.submits,
+            "serialized_waits": self.serialized_waits, # submits that queued behind another for the same session
+            "claim_waits": self.claim_waits, # ... behind one running on another worker
+            "claims_taken_over": self.claims_taken_over,
+            "replayed": self.replayed, # duplicates answered from the stored response
+            "replayed_from_store": self.replayed_from_store, # ... that this worker had not seen
+            "conflicts": self.conflicts,
+            "stored": self.stored,
+        }
+
+
+submit_guard = SubmitGuard(IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_ENTRIES, SUBMIT_CLAIM_TIMEOUT_SECONDS)
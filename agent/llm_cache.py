@@ -0,0 +1,195 @@
+"""Content-addressed cache for evaluation and feedback LLM calls.
+
+Keys hash the call kind, its prompt version, the job role, the question ID and
+the normalized candidate response (plus the evaluation for feedback), so
+retried submissions, load tests and identical canned answers reuse the first
+result. Entries live in an in-memory LRU and, when ``LLM_CACHE_DB_PATH`` is
+set, in a SQLite file shared across restarts and worker processes.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import (
+    LLM_CACHE_DB_PATH,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+# Expired rows are purged from the disk tier once every this many writes.
+PURGE_EVERY_WRITES = 500
+
+
+def normalize_response(response: str) -> str:
+    return " ".join(response.split()).casefold()
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+        kind: str,
+        prompt_version: str,
+        job_role: str,
+        question: Dict[str, Any],
+        response: str,
+        extra: Any = None,
+) -> str:
+    question_ref = question.get("id") or _digest(question.get("text"))
+    return _digest([
+        kind,
+        prompt_version,
+        job_role,
+        question_ref,
+        _digest(normalize_response(response)),
+        _digest(extra) if extra is not None else None,
+    ])
+
+
+class LLMResultCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: Optional[str] = None):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        # Opened on first use by _connection_locked, so importing this module
+        # touches no files and a forked worker opens its own connection.
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._writes_since_purge = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _connection_locked(self) -> sqlite3.Connection:
+        if self._db is None or self._db_pid != os.getpid():
+            os.makedirs(os.path.dirname(self._db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, kind TEXT, value TEXT, expires_at REAL)"
+            )
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _count(self, kind: str, outcome: str) -> None:
+        counters = self._stats.setdefault(kind, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0})
+        counters[outcome] += 1
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    def _memory_set(self, key: str, payload: str, expires_at: float) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, str]]:
+        with self._lock:
+            row = self._connection_locked().execute(
+                "SELECT expires_at, value FROM llm_cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+            if row is not None:
+                self._memory_set(key, row[1], row[0])
+        return row
+
+    def _disk_set(self, key: str, kind: str, payload: str, expires_at: float) -> None:
+        with self._lock:
+            db = self._connection_locked()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, kind, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, kind, payload, expires_at),
+            )
+            self._writes_since_purge += 1
+            if self._writes_since_purge >= PURGE_EVERY_WRITES:
+                db.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+                self._writes_since_purge = 0
+
+    def _lookup_memory(self, kind: str, key: str) -> Optional[Any]:
+        with self._lock:
+            payload = self._memory_get(key)
+            if payload is not None:
+                self._count(kind, "memory_hits")
+                return json.loads(payload)
+            if not self._db_path:
+                self._count(kind, "misses")
+        return None
+
+    def _record_disk_result(self, kind: str, row: Optional[tuple[float, str]]) -> Optional[Any]:
+        with self._lock:
+            self._count(kind, "disk_hits" if row is not None else "misses")
+        return json.loads(row[1]) if row is not None else None
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        value = self._lookup_memory(kind, key)
+        if value is not None or not self._db_path:
+            return value
+        return self._record_disk_result(kind, self._disk_get(key))
+
+    async def aget(self, kind: str, key: str) -> Optional[Any]:
+        value = self._lookup_memory(kind, key)
+        if value is not None or not self._db_path:
+            return value
+        return self._record_disk_result(kind, await asyncio.to_thread(self._disk_get, key))
+
+    def _prepare_set(self, kind: str, key: str, value: Any) -> tuple[str, float]:
+        payload = json.dumps(value, default=str)
+        expires_at = time.time() + self._ttl_seconds
+        with self._lock:
+            self._memory_set(key, payload, expires_at)
+            self._count(kind, "writes")
+        return payload, expires_at
+
+    def set(self, kind: str, key: str, value: Any) -> None:
+        payload, expires_at = self._prepare_set(kind, key, value)
+        if self._db_path:
+            self._disk_set(key, kind, payload, expires_at)
+
+    async def aset(self, kind: str, key: str, value: Any) -> None:
+        payload, expires_at = self._prepare_set(kind, key, value)
+        if self._db_path:
+            await asyncio.to_thread(self._disk_set, key, kind, payload, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db_path:
+                self._connection_locked().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_kind = {}
+            for kind, counters in self._stats.items():
+                lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+                hits = counters["memory_hits"] + counters["disk_hits"]
+                per_kind[kind] = {**counters, "hit_ratio": hits / lookups if lookups else 0.0}
+            return {
+                "enabled": LLM_CACHE_ENABLED,
+                "memory_entries": len(self._memory),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl_seconds,
+                "disk_path": self._db_path,
+                "kinds": per_kind,
+            }
+
+
+llm_cache = LLMResultCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+    db_path=LLM_CACHE_DB_PATH,
+)
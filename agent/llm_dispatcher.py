@@ -0,0 +1,408 @@
+"""Central scheduler for every Gemini call.
+
+All helpers in ``llm_helpers`` go through ``llm_dispatcher``, which applies,
+in order: a circuit breaker that fails fast while the provider is down, a
+token bucket sized to the request quota, a cap on concurrent calls, a
+per-attempt timeout inside an overall deadline, and jittered exponential
+backoff between retries of rate-limit, timeout and server errors. Queue depth,
+wait times and outcomes are kept for ``GET /admin/llm_dispatcher``.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+from .metrics import llm_call_seconds, observe_llm_response
+from .config import (
+    LLM_RATE_PER_MINUTE,
+    LLM_BURST,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_DEADLINE_SECONDS,
+    LLM_MAX_ATTEMPTS,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SECONDS,
+)
+
+_RETRYABLE_EXCEPTIONS = (
+    TimeoutError,
+    ConnectionError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+)
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_RETRYABLE_MESSAGES = ("429", "resource exhausted", "rate limit", "quota", "unavailable", "timed out", "deadline")
+
+WAIT_SAMPLES = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, _RETRYABLE_EXCEPTIONS):
+        return True
+    if getattr(error, "code", None) in _RETRYABLE_STATUS_CODES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _RETRYABLE_MESSAGES)
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _named(config: Optional[Dict[str, Any]], call: str) -> Dict[str, Any]:
+    # Name the model run after the call so callbacks and streamed events can
+    # tell calls apart when one graph node makes several.
+    return {**(config or {}), "run_name": call}
+
+
+class LLMDispatcher:
+    """Rate limiting, concurrency, deadlines, retries and circuit breaking for LLM calls.
+
+    The token bucket and breaker are shared by sync and async callers. The
+    concurrency cap applies to each event loop and to sync callers separately.
+    """
+
+    def __init__(
+            self,
+            rate_per_minute: float,
+            burst: int,
+            max_concurrency: int,
+            timeout_seconds: float,
+            deadline_seconds: float,
+            max_attempts: int,
+            backoff_base_seconds: float,
+            backoff_max_seconds: float,
+            breaker_failures: int,
+            breaker_reset_seconds: float,
+    ):
+        self._rate_per_second = rate_per_minute / 60.0
+        self._burst = max(1, burst)
+        self._max_concurrency = max(1, max_concurrency)
+        self._timeout_seconds = timeout_seconds
+        self._deadline_seconds = deadline_seconds
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._breaker_failures = max(1, breaker_failures)
+        self._breaker_reset_seconds = breaker_reset_seconds
+
+        self._lock = threading.Lock()
+        self._tokens = float(self._burst)
+        self._refilled_at = time.monotonic()
+        self._sync_slots = threading.BoundedSemaphore(self._max_concurrency)
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        # Sync calls run on this pool so a hung request can be abandoned at its timeout.
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="llm-call")
+
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        self._queued = 0
+        self._in_flight = 0
+        self._waits: "deque[float]" = deque(maxlen=WAIT_SAMPLES)
+        self._stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "retryable_errors": 0,
+            "rejected_open_circuit": 0,
+            "circuit_opened": 0,
+            "max_queue_depth": 0,
+        }
+
+    # Token bucket -----------------------------------------------------------
+
+    def _reserve_token(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        if self._rate_per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate_per_second)
+            self._refilled_at = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate_per_second
+
+    # Circuit breaker --------------------------------------------------------
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self._breaker_reset_seconds or self._probe_in_flight:
+                self._stats["rejected_open_circuit"] += 1
+                raise LLMUnavailableError("LLM circuit breaker is open; failing fast.")
+            # Half-open: let one probe through; its outcome closes or re-opens the circuit.
+            self._probe_in_flight = True
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def _record_failure(self, retryable: bool) -> None:
+        with self._lock:
+            if not retryable:
+                # The provider answered; a bad request says nothing about its health.
+                self._probe_in_flight = False
+                return
+            self._stats["retryable_errors"] += 1
+            self._consecutive_failures += 1
+            if self._probe_in_flight or self._consecutive_failures >= self._breaker_failures:
+                if self._opened_at is None or self._probe_in_flight:
+                    self._stats["circuit_opened"] += 1
+                    logger.warning("LLM circuit breaker opened after %s consecutive failures.", self._consecutive_failures)
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    # Bookkeeping ------------------------------------------------------------
+
+    def _enter_queue(self) -> float:
+        with self._lock:
+            self._queued += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queued)
+        return time.monotonic()
+
+    def _leave_queue(self, queued_at: float) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._waits.append(time.monotonic() - queued_at)
+
+    def _start(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _release_sync_slot(self, future: Optional[concurrent.futures.Future] = None) -> None:
+        self._sync_slots.release()
+        self._finish()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self._backoff_max_seconds, self._backoff_base_seconds * 2 ** attempt))
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_slots.get(loop)
+        if semaphore is None:
+            semaphore = self._async_slots[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("LLM call deadline exceeded.")
+        return min(self._timeout_seconds, remaining)
+
+    def _should_retry(self, error: BaseException, attempt: int, deadline: float) -> Optional[float]:
+        """Seconds to back off before the next attempt, or None to give up."""
+        retryable = is_retryable(error)
+        if isinstance(error, TimeoutError):
+            with self._lock:
+                self._stats["timeouts"] += 1
+        self._record_failure(retryable)
+        if not retryable or attempt + 1 >= self._max_attempts:
+            return None
+        delay = self._backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            return None
+        with self._lock:
+            self._stats["retries"] += 1
+        logger.warning("LLM call failed (%s: %s); retrying in %.2fs.", type(error).__name__, error, delay)
+        return delay
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats[outcome] += 1
+
+    # Public API -------------------------------------------------------------
+
+    def invoke(self, llm: Any, prompt: Any, config: Optional[Dict[str, Any]] = None, *, call: str = "llm") -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = self._invoke(llm, prompt, _named(config, call))
+            outcome = "ok"
+        except LLMUnavailableError:
+            outcome = "rejected"
+            raise
+        finally:
+            llm_call_seconds.observe(time.perf_counter() - started, call=call, outcome=outcome)
+        observe_llm_response(call, prompt, result)
+        return result
+
+    async def ainvoke(self, llm: Any, prompt: Any, config: Optional[Dict[str, Any]] = None, *, call: str = "llm") -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await self._ainvoke(llm, prompt, _named(config, call))
+            outcome = "ok"
+        except LLMUnavailableError:
+            outcome = "rejected"
+            raise
+        finally:
+            llm_call_seconds.observe(time.perf_counter() - started, call=call, outcome=outcome)
+        observe_llm_response(call, prompt, result)
+        return result
+
+    def _invoke(self, llm: Any, prompt: Any, config: Optional[Dict[str, Any]]) -> Any:
+        deadline = time.monotonic() + self._deadline_seconds
+        attempt = 0
+        while True:
+            try:
+                self._admit()
+                queued_at = self._enter_queue()
+                try:
+                    wait = self._reserve_token()
+                    if wait:
+                        time.sleep(wait)
+                    # Abandoned calls keep their slot until they return, so
+                    # waiting for one is bounded by the deadline too.
+                    if not self._sync_slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                        raise TimeoutError("No LLM call slot became free before the deadline.")
+                finally:
+                    self._leave_queue(queued_at)
+                self._start()
+                try:
+                    context = contextvars.copy_context()
+                    future = self._executor.submit(context.run, llm.invoke, prompt, config)
+                except BaseException:
+                    self._release_sync_slot()
+                    raise
+                # A call that times out cannot be stopped and keeps its executor
+                # thread, so the slot is released when the call really returns.
+                future.add_done_callback(self._release_sync_slot)
+                try:
+                    result = future.result(timeout=self._attempt_timeout(deadline))
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    raise TimeoutError(f"LLM call timed out after {self._timeout_seconds:g}s.")
+            except LLMUnavailableError:
+                self._count("failed")
+                raise
+            except Exception as e:
+                delay = self._should_retry(e, attempt, deadline)
+                if delay is None:
+                    self._count("failed")
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._record_success()
+            self._count("succeeded")
+            return result
+
+    async def _ainvoke(self, llm: Any, prompt: Any, config: Optional[Dict[str, Any]]) -> Any:
+        deadline = time.monotonic() + self._deadline_seconds
+        semaphore = self._async_semaphore()
+        attempt = 0
+        while True:
+            try:
+                self._admit()
+                queued_at = self._enter_queue()
+                try:
+                    wait = self._reserve_token()
+                    if wait:
+                        await asyncio.sleep(wait)
+                    await semaphore.acquire()
+                finally:
+                    self._leave_queue(queued_at)
+                self._start()
+                try:
+                    result = await asyncio.wait_for(llm.ainvoke(prompt, config), self._attempt_timeout(deadline))
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"LLM call timed out after {self._timeout_seconds:g}s.")
+                finally:
+                    semaphore.release()
+                    self._finish()
+            except LLMUnavailableError:
+                self._count("failed")
+                raise
+            except asyncio.CancelledError:
+                self._release_probe()
+                raise
+            except Exception as e:
+                delay = self._should_retry(e, attempt, deadline)
+                if delay is None:
+                    self._count("failed")
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._record_success()
+            self._count("succeeded")
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._waits)
+            if self._opened_at is None:
+                circuit = "closed"
+            elif time.monotonic() - self._opened_at >= self._breaker_reset_seconds:
+                circuit = "half_open"
+            else:
+                circuit = "open"
+            return {
+                **self._stats,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "circuit": circuit,
+                "consecutive_failures": self._consecutive_failures,
+                "wait_seconds_mean": sum(waits) / len(waits) if waits else 0.0,
+                "wait_seconds_p50": _percentile(waits, 0.50),
+                "wait_seconds_p95": _percentile(waits, 0.95),
+                "wait_seconds_max": max(waits) if waits else 0.0,
+                "rate_per_minute": self._rate_per_second * 60,
+                "max_concurrency": self._max_concurrency,
+            }
+
+
+llm_dispatcher = LLMDispatcher(
+    rate_per_minute=LLM_RATE_PER_MINUTE,
+    burst=LLM_BURST,
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    timeout_seconds=LLM_TIMEOUT_SECONDS,
+    deadline_seconds=LLM_DEADLINE_SECONDS,
+    max_attempts=LLM_MAX_ATTEMPTS,
+    backoff_base_seconds=LLM_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=LLM_BACKOFF_MAX_SECONDS,
+    breaker_failures=LLM_BREAKER_FAILURES,
+    breaker_reset_seconds=LLM_BREAKER_RESET_SECONDS,
+)
@@ -1,16 +1,86 @@
 from typing import List, Dict, Any, Optional
 import json
-from .config import llm
+import logging
+from pydantic import BaseModel
+from .config import get_llm, LLM_CACHE_ENABLED, STRUCTURED_OUTPUT, STRUCTURED_OUTPUT_REASK
+from .llm_cache import llm_cache, make_cache_key
+from .llm_dispatcher import llm_dispatcher
+from .structured_output import (
+    AnalysisAndEvaluation,
+    EvaluationWithFeedback,
+    QuestionSelection,
+    parse_reply,
+    reask_prompt,
+    response_schema,
+)
+
+# Bump a version whenever its prompt or parser changes so cached results from
+# the old prompt are no longer served.
+EVALUATION_PROMPT_VERSION = "2"
+EVALUATE_WITH_FEEDBACK_PROMPT_VERSION = "2"
+
+logger = logging.getLogger(__name__)
+FEEDBACK_PROMPT_VERSION = "1"
+
+
+def _json_llm(schema: type[BaseModel]):
+    llm = get_llm()
+    if not STRUCTURED_OUTPUT:
+        return llm
+    return llm.bind(response_mime_type="application/json", response_schema=response_schema(schema))
+
+
+def _invoke_structured(prompt_text: str, schema: type[BaseModel], call: str) -> Dict[str, Any] | None:
+    """Ask for a reply matching ``schema``; an unusable reply is re-asked once."""
+    llm = _json_llm(schema)
+    try:
+        response_content = llm_dispatcher.invoke(llm, prompt_text, {"recursion_limit": 100}, call=call).content
+        logger.debug("LLM Raw Response for %s received.", call)
+    except Exception as e:
+        logger.error("LLM %s call failed: %s", call, e)
+        return None
+    result, error = parse_reply(response_content, schema, call)
+    if result is not None or not STRUCTURED_OUTPUT_REASK:
+        return result
+
+    try:
+        response_content = llm_dispatcher.invoke(
+            llm, reask_prompt(prompt_text, response_content, error), {"recursion_limit": 100}, call=call).content
+    except Exception as e:
+        logger.error("LLM %s re-ask failed: %s", call, e)
+        return None
+    result, _ = parse_reply(response_content, schema, call, attempt="reask")
+    return result
 
 
-def call_llm_select_question(
+async def _ainvoke_structured(prompt_text: str, schema: type[BaseModel], call: str) -> Dict[str, Any] | None:
+    llm = _json_llm(schema)
+    try:
+        response_content = (await llm_dispatcher.ainvoke(llm, prompt_text, {"recursion_limit": 100}, call=call)).content
+        logger.debug("LLM Raw Response for %s received.", call)
+    except Exception as e:
+        logger.error("LLM %s call failed: %s", call, e)
+        return None
+    result, error = parse_reply(response_content, schema, call)
+    if result is not None or not STRUCTURED_OUTPUT_REASK:
+        return result
+
+    try:
+        response_content = (await llm_dispatcher.ainvoke(
+            llm, reask_prompt(prompt_text, response_content, error), {"recursion_limit": 100}, call=call)).content
+    except Exception as e:
+        logger.error("LLM %s re-ask failed: %s", call, e)
+        return None
+    result, _ = parse_reply(response_content, schema, call, attempt="reask")
+    return result
+
+
+def _build_select_question_prompt(
         available_questions: List[Dict[str, Any]],
         interview_history: List[Dict[str, Any]],
         interview_config: Dict[str, Any],
         job_role: str,
-) -> Dict[str, Any] | None:
-    print("Loading next question...")
-
+) -> str:
     history_summary = []
     for i, turn in enumerate(interview_history[-3:]):
         history_summary.append(f"Turn {len(interview_history) - len(interview_history[-3:]) + i + 1}:")
@@ -61,38 +131,16 @@ def call_llm_select_question(
 
     Ensure your response contains ONLY the JSON object and is valid. Do not add any other text before or after the JSON. Also ensure the each JSON object should contain an "action".
     """
+    return prompt_text
 
-    print(f"Sending prompt ({len(prompt_text)} chars) to LLM...")
-    response_content = None
-    try:
-        llm_response = llm.invoke(prompt_text, {"recursion_limit": 100})
-        response_content = llm_response.content
-        print(f"LLM Raw Response received.")
-    except Exception as e:
-        print(f"LLM call failed: {e}")
-        return None
-
-    if not response_content:
-        print("LLM response was empty.")
-        return None
-
-    response_content = response_content.strip()
-    if response_content.startswith("```json"):
-        response_content = response_content[len("```json"):].strip()
-        if response_content.endswith("```"):
-            response_content = response_content[:-len("```")].strip()
 
-    llm_decision = None
-    try:
-        llm_decision = json.loads(response_content)
-        print(f"Parsed LLM Decision: {llm_decision}")
-    except json.JSONDecodeError:
-        print(f"Failed to parse LLM response as JSON: {response_content}")
-        return None
-
-    if not isinstance(llm_decision, dict):
-        print(f"Parsed LLM response is not a dictionary: {llm_decision}")
+def _parse_select_question_response(
+        llm_decision: Dict[str, Any] | None,
+        available_questions: List[Dict[str, Any]],
+) -> Dict[str, Any] | None:
+    if llm_decision is None:
         return None
+    logger.debug("Parsed LLM Decision: %s", llm_decision)
 
     action = llm_decision.get("action")
 
@@ -101,32 +149,54 @@ def call_llm_select_question(
         if selected_id:
             selected_question = next((q for q in available_questions if q.get('id') == selected_id), None)
             if selected_question:
-                print(f"LLM selected question ID: {selected_id}")
+                logger.debug("LLM selected question ID: %s", selected_id)
                 return selected_question
             else:
-                print(f"LLM selected ID '{selected_id}' not found in available pool.")
+                logger.warning("LLM selected ID '%s' not found in available pool.", selected_id)
                 return None
 
         else:
-            print("LLM action was 'ask_question' but no 'selected_question_id' provided.")
+            logger.warning("LLM action was 'ask_question' but no 'selected_question_id' provided.")
             return None
 
-    elif action == "end_interview":
-        print(f"LLM decided to end interview. Reason: {llm_decision.get('reason', 'N/A')}")
+    else:
+        logger.info("LLM decided to end interview. Reason: %s", llm_decision.get('reason', 'N/A'))
         return {"action": "end_interview", "reason": llm_decision.get('reason')}
 
-    else:
-        print(f"LLM returned unknown action: {action}")
-        return None
 
+def call_llm_select_question(
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+        interview_config: Dict[str, Any],
+        job_role: str,
+) -> Dict[str, Any] | None:
+    logger.debug("Loading next question...")
+    prompt_text = _build_select_question_prompt(available_questions, interview_history, interview_config, job_role)
+
+    logger.debug("Sending prompt (%s chars) to LLM...", len(prompt_text))
+    llm_decision = _invoke_structured(prompt_text, QuestionSelection, "select_question")
+    return _parse_select_question_response(llm_decision, available_questions)
 
-def call_llm_analyze_and_evaluate_response(
-        question: Dict[str, Any],
-        response: str,
+
+async def acall_llm_select_question(
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+        interview_config: Dict[str, Any],
         job_role: str,
 ) -> Dict[str, Any] | None:
-    print(f"-> LLM: Calling Gemini for combined analysis & evaluation...")
+    logger.debug("Loading next question...")
+    prompt_text = _build_select_question_prompt(available_questions, interview_history, interview_config, job_role)
+
+    logger.debug("Sending prompt (%s chars) to LLM...", len(prompt_text))
+    llm_decision = await _ainvoke_structured(prompt_text, QuestionSelection, "select_question")
+    return _parse_select_question_response(llm_decision, available_questions)
+
 
+def _build_analyze_and_evaluate_prompt(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+) -> str:
     prompt_text = f"""
     You are an AI interviewer evaluating a candidate's response for a {job_role} role.
 
@@ -163,68 +233,158 @@ def call_llm_analyze_and_evaluate_response(
     Ensure your response contains ONLY the JSON object and is valid. Do not add any other text.
     Fill all keys in the JSON object based on the response. Use null or empty arrays/strings where information is not applicable or found.
     """
+    return prompt_text
 
-    print(f"Sending combined analysis/evaluation prompt ({len(prompt_text)} chars) to LLM...")
-    response_content = None
 
-    try:
-        llm_response = llm.invoke(prompt_text, {"recursion_limit": 100})
-        response_content = llm_response.content
-        print("LLM Raw Response for combined analysis/evaluation received.")
-    except Exception as e:
-        print(f"LLM combined analysis/evaluation call failed: {e}")
-        return None
-
-    if not response_content:
-        print("LLM combined analysis/evaluation response was empty.")
-        return None
-
-    response_content = response_content.strip()
-    if response_content.startswith("```json"):
-        response_content = response_content[len("```json"):].strip()
-        if response_content.endswith("```"):
-            response_content = response_content[:-len("```")].strip()
-
-    combined_result = None
-    try:
-        combined_result = json.loads(response_content)
-        print("Parsed LLM Combined Result.")
-        if (
-                not isinstance(combined_result, dict) or
-                "analysis" not in combined_result or
-                "evaluation" not in combined_result or
-                not isinstance(combined_result.get("evaluation"), dict) or
-                "score" not in combined_result["evaluation"]
-        ):
-            print("Parsed combined result is not a valid structure or missing score.")
-            return None
+def call_llm_analyze_and_evaluate_response(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+        use_cache: bool = True,
+) -> Dict[str, Any] | None:
+    logger.debug("-> LLM: Calling Gemini for combined analysis & evaluation...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("evaluation", EVALUATION_PROMPT_VERSION, job_role, question, response)
+        cached = llm_cache.get("evaluation", cache_key)
+        if cached is not None:
+            logger.debug("Using cached combined analysis/evaluation result.")
+            return cached
+    prompt_text = _build_analyze_and_evaluate_prompt(question, response, job_role)
+
+    logger.debug("Sending combined analysis/evaluation prompt (%s chars) to LLM...", len(prompt_text))
+    result = _invoke_structured(prompt_text, AnalysisAndEvaluation, "analyze_and_evaluate_response")
+    if cache_key is not None and result is not None:
+        llm_cache.set("evaluation", cache_key, result)
+    return result
+
+
+async def acall_llm_analyze_and_evaluate_response(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+        use_cache: bool = True,
+) -> Dict[str, Any] | None:
+    logger.debug("-> LLM: Calling Gemini for combined analysis & evaluation...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("evaluation", EVALUATION_PROMPT_VERSION, job_role, question, response)
+        cached = await llm_cache.aget("evaluation", cache_key)
+        if cached is not None:
+            logger.debug("Using cached combined analysis/evaluation result.")
+            return cached
+    prompt_text = _build_analyze_and_evaluate_prompt(question, response, job_role)
+
+    logger.debug("Sending combined analysis/evaluation prompt (%s chars) to LLM...", len(prompt_text))
+    result = await _ainvoke_structured(prompt_text, AnalysisAndEvaluation, "analyze_and_evaluate_response")
+    if cache_key is not None and result is not None:
+        await llm_cache.aset("evaluation", cache_key, result)
+    return result
+
+
+def _build_evaluate_with_feedback_prompt(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+) -> str:
+    prompt_text = f"""
+    You are an AI interviewer evaluating a candidate's response for a {job_role} role and giving them feedback on it.
 
-        score = combined_result["evaluation"].get("score")
-        if score is not None and not isinstance(score, (int, float)):
-            try:
-                combined_result["evaluation"]["score"] = float(score)
-            except (ValueError, TypeError):
-                print(f"Evaluation score is not a valid number: {score}")
-                return None
+    Question Asked: {question.get('text', 'N/A')}
+    Candidate Response: {response}
 
+    Instructions:
+    Analyze the candidate's response thoroughly based on the question asked and the context of a {job_role} role.
+    Then, evaluate the response quality and assign a score.
+    Finally, write feedback for the candidate based on your analysis and evaluation:
+    - Make it clear, constructive, and encouraging.
+    - Mention the strengths and areas for improvement from your evaluation.
+    - Include the score for this response.
+    - Keep it concise, address the candidate directly (e.g., "Your response regarding..."), and avoid conversational filler.
+    Respond ONLY with a valid JSON object containing the analysis, evaluation and feedback.
 
-    except json.JSONDecodeError:
-        print(f"Failed to parse LLM combined analysis/evaluation response as JSON: {response_content}")
-        return None
+    JSON Response Format:
+    {{
+      "analysis": {{
+        "key_points_extracted": [], // List of main ideas/facts mentioned
+        "relevance_to_question": "", // How well the response addresses the question ("high" | "medium" | "low" | "partial")
+        "clarity_assessment": "", // How easy the response was to understand ("clear" | "somewhat clear" | "unclear")
+        "technical_accuracy_assessment": "", // If applicable, assess technical correctness ("accurate" | "mostly accurate" | "some inaccuracies" | "inaccurate" | "not applicable")
+        "confidence_level": "", // Based on language used ("high" | "medium" | "low")
+        "sentiment": "", // ("positive" | "neutral" | "negative")
+        "keywords": [] // Relevant terms mentioned
+        // Add other analysis points relevant to job role
+      }},
+      "evaluation": {{
+        "score": null, // Assign a score (int out of 10). Use null if not scorable.
+        "overall_evaluation_summary": "", // Concise summary of the evaluation for this response
+        "relevance_judgment": "", // ("Relevant" | "Partially Relevant" | "Not Relevant")
+        "strengths": [], // Key positive points
+        "areas_for_improvement": [] // Key points to improve or points missed
+        // Add other evaluation points specific to question/role
+      }},
+      "feedback": "" // Plain-text feedback addressed to the candidate
+    }}
 
-    return combined_result
+    Ensure your response contains ONLY the JSON object and is valid. Do not add any other text.
+    Fill all keys in the JSON object based on the response. Use null or empty arrays/strings where information is not applicable or found.
+    """
+    return prompt_text
 
 
-def call_llm_generate_feedback(
+def call_llm_evaluate_with_feedback(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+        use_cache: bool = True,
+) -> Dict[str, Any] | None:
+    logger.debug("-> LLM: Calling Gemini for fused analysis, evaluation & feedback...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("evaluate_with_feedback", EVALUATE_WITH_FEEDBACK_PROMPT_VERSION, job_role, question, response)
+        cached = llm_cache.get("evaluate_with_feedback", cache_key)
+        if cached is not None:
+            logger.debug("Using cached fused evaluation result.")
+            return cached
+    prompt_text = _build_evaluate_with_feedback_prompt(question, response, job_role)
+
+    logger.debug("Sending fused evaluation prompt (%s chars) to LLM...", len(prompt_text))
+    result = _invoke_structured(prompt_text, EvaluationWithFeedback, "evaluate_with_feedback")
+    if cache_key is not None and result is not None:
+        llm_cache.set("evaluate_with_feedback", cache_key, result)
+    return result
+
+
+async def acall_llm_evaluate_with_feedback(
+        question: Dict[str, Any],
+        response: str,
+        job_role: str,
+        use_cache: bool = True,
+) -> Dict[str, Any] | None:
+    logger.debug("-> LLM: Calling Gemini for fused analysis, evaluation & feedback...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("evaluate_with_feedback", EVALUATE_WITH_FEEDBACK_PROMPT_VERSION, job_role, question, response)
+        cached = await llm_cache.aget("evaluate_with_feedback", cache_key)
+        if cached is not None:
+            logger.debug("Using cached fused evaluation result.")
+            return cached
+    prompt_text = _build_evaluate_with_feedback_prompt(question, response, job_role)
+
+    logger.debug("Sending fused evaluation prompt (%s chars) to LLM...", len(prompt_text))
+    result = await _ainvoke_structured(prompt_text, EvaluationWithFeedback, "evaluate_with_feedback")
+    if cache_key is not None and result is not None:
+        await llm_cache.aset("evaluate_with_feedback", cache_key, result)
+    return result
+
+
+def _build_feedback_prompt(
         question: Dict[str, Any],
         response: str,
         analysis: Dict[str, Any],
         evaluation: Dict[str, Any],
         job_role: str,
-) -> str | None:
-    print(f"-> LLM: Calling Gemini for feedback generation...")
-
-
+) -> str:
     prompt_text = f"""
     You are an AI interviewer providing feedback on a candidate's response for a {job_role} role.
     You have analyzed and evaluated their response.
@@ -244,25 +404,84 @@ def call_llm_generate_feedback(
 
     Provide ONLY the feedback text as a plain string. Do not include JSON or any other formatting unless explicitly part of the feedback content.
     """
+    return prompt_text
 
-    print(f"Sending feedback prompt ({len(prompt_text)} chars) to LLM...")
-    response_content = None
-    try:
-        llm_response = llm.invoke(prompt_text, {"recursion_limit": 100})
-        response_content = llm_response.content
-        print("LLM Raw Response for feedback received.")
-    except Exception as e:
-        print(f"LLM feedback generation call failed: {e}")
-        return None
 
+def _parse_feedback_response(response_content: str | None) -> str | None:
     if not response_content:
-        print("LLM feedback response was empty.")
+        logger.warning("LLM feedback response was empty.")
         return None
 
     feedback_text = response_content.strip()
 
-    print(f"Generated feedback (first 50 chars): {feedback_text[:50]}...")
+    logger.debug("Generated feedback (first 50 chars): %s...", feedback_text[:50])
 
     return feedback_text
 
 
+def call_llm_generate_feedback(
+        question: Dict[str, Any],
+        response: str,
+        analysis: Dict[str, Any],
+        evaluation: Dict[str, Any],
+        job_role: str,
+        use_cache: bool = True,
+) -> str | None:
+    logger.debug("-> LLM: Calling Gemini for feedback generation...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("feedback", FEEDBACK_PROMPT_VERSION, job_role, question, response, {"analysis": analysis, "evaluation": evaluation})
+        cached = llm_cache.get("feedback", cache_key)
+        if cached is not None:
+            logger.debug("Using cached feedback result.")
+            return cached
+    prompt_text = _build_feedback_prompt(question, response, analysis, evaluation, job_role)
+
+    logger.debug("Sending feedback prompt (%s chars) to LLM...", len(prompt_text))
+    response_content = None
+    try:
+        llm_response = llm_dispatcher.invoke(get_llm(), prompt_text, {"recursion_limit": 100}, call="generate_feedback")
+        response_content = llm_response.content
+        logger.debug("LLM Raw Response for feedback received.")
+    except Exception as e:
+        logger.error("LLM feedback generation call failed: %s", e)
+        return None
+
+    result = _parse_feedback_response(response_content)
+    if cache_key is not None and result is not None:
+        llm_cache.set("feedback", cache_key, result)
+    return result
+
+
+async def acall_llm_generate_feedback(
+        question: Dict[str, Any],
+        response: str,
+        analysis: Dict[str, Any],
+        evaluation: Dict[str, Any],
+        job_role: str,
+        use_cache: bool = True,
+) -> str | None:
+    logger.debug("-> LLM: Calling Gemini for feedback generation...")
+    cache_key = None
+    if use_cache and LLM_CACHE_ENABLED:
+        cache_key = make_cache_key("feedback", FEEDBACK_PROMPT_VERSION, job_role, question, response, {"analysis": analysis, "evaluation": evaluation})
+        cached = await llm_cache.aget("feedback", cache_key)
+        if cached is not None:
+            logger.debug("Using cached feedback result.")
+            return cached
+    prompt_text = _build_feedback_prompt(question, response, analysis, evaluation, job_role)
+
+    logger.debug("Sending feedback prompt (%s chars) to LLM...", len(prompt_text))
+    response_content = None
+    try:
+        llm_response = await llm_dispatcher.ainvoke(get_llm(), prompt_text, {"recursion_limit": 100}, call="generate_feedback")
+        response_content = llm_response.content
+        logger.debug("LLM Raw Response for feedback received.")
+    except Exception as e:
+        logger.error("LLM feedback generation call failed: %s", e)
+        return None
+
+    result = _parse_feedback_response(response_content)
+    if cache_key is not None and result is not None:
+        await llm_cache.aset("feedback", cache_key, result)
+    return result
@@ -0,0 +1,40 @@
+"""Logging setup for the agent.
+
+``LOG_LEVEL`` picks the level (per-turn tracing such as node entry and prompt
+sizes is logged at DEBUG, so it costs nothing at INFO and above) and
+``LOG_FORMAT=json`` switches to one JSON object per line, including any
+``extra={...}`` fields passed to the logger.
+"""
+import json
+import logging
+import time
+
+# Attributes every LogRecord has; anything else came from ``extra``.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str, fmt: str) -> None:
+    handler = logging.StreamHandler()
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    # Leave logging alone if the host process (e.g. a test runner) already configured it.
+    if not root.handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
@@ -0,0 +1,218 @@
+"""Process-wide latency histograms and counters in Prometheus text format.
+
+A small in-process registry keeps the agent free of a metrics dependency.
+``render()`` produces the exposition served by ``GET /metrics``; the stats
+already kept by the caches, the LLM dispatcher and speculation are added to it
+as gauges through ``register_collector``.
+"""
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers in-process work (sub-millisecond) up to slow LLM calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (100, 300, 1_000, 3_000, 10_000, 30_000, 100_000, 300_000, 1_000_000)
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {} # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+    def time(self, **labels: Any) -> "_Timer":
+        return _Timer(self, labels)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+
+
+def register_collector(collector: Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]) -> None:
+    """Add a callable yielding ``(name, help, labels, value)`` gauges, read at every scrape."""
+    _collectors.append(collector)
+
+
+def gauges_from_stats(prefix: str, documentation: str, stats: Callable[[], Dict[str, Any]], **labels: str):
+    """Collector exposing every numeric field of a ``stats()`` dict as ``<prefix>_<field>``."""
+    def collect():
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            yield f"{prefix}_{key}", f"{documentation} ({key})", labels, value
+    return collect
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    seen = set()
+    for collector in _collectors:
+        try:
+            gauges = list(collector())
+        except Exception:
+            continue
+        for name, documentation, labels, value in gauges:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+node_seconds = Histogram("interview_node_duration_seconds", "Time spent in each graph node.", ["node"])
+llm_call_seconds = Histogram(
+    "interview_llm_call_duration_seconds",
+    "LLM helper call time including rate-limit waits and retries.",
+    ["call", "outcome"],
+)
+llm_prompt_chars = Histogram("interview_llm_prompt_chars", "Prompt size per LLM call.", ["call"], SIZE_BUCKETS)
+llm_output_chars = Histogram("interview_llm_output_chars", "Response size per LLM call.", ["call"], SIZE_BUCKETS)
+llm_tokens = Counter("interview_llm_tokens_total", "Tokens reported by the provider.", ["call", "direction"])
+llm_parse_total = Counter(
+    "interview_llm_parse_total", "Structured LLM replies by attempt and parse outcome (ok, repaired, failed).",
+    ["call", "attempt", "outcome"])
+checkpoint_seconds = Histogram("interview_checkpoint_duration_seconds", "Checkpointer call time.", ["operation"])
+question_fetch_seconds = Histogram(
+    "interview_question_fetch_duration_seconds", "fetch_questions_from_db time.", ["outcome"])
+
+
+def timed_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node so every run is observed in ``node_seconds``; keeps its signature."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with node_seconds.time(node=name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with node_seconds.time(node=name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def observe_llm_response(call: str, prompt: str, response: Any) -> None:
+    if isinstance(prompt, str):
+        llm_prompt_chars.observe(len(prompt), call=call)
+    content = getattr(response, "content", None)
+    if isinstance(content, str):
+        llm_output_chars.observe(len(content), call=call)
+    usage: Optional[Dict[str, Any]] = getattr(response, "usage_metadata", None)
+    if usage:
+        for direction in ("input", "output"):
+            tokens = usage.get(f"{direction}_tokens")
+            if tokens:
+                llm_tokens.inc(tokens, call=call, direction=direction)
@@ -1,12 +1,59 @@
-from typing import List, Dict, Any, Literal, Optional
+import operator
+from datetime import datetime
+from typing import Annotated, List, Dict, Any, Literal, Optional, TypedDict
 from pydantic import BaseModel, Field
 from .config import TOTAL_QUESTIONS_PLANNED
 InterviewStatus = Literal['not_started', 'in_progress', 'completed', 'terminated']
 
+# State channels whose reducer only appends; the API checkpointer stores them as deltas.
+APPEND_ONLY_CHANNELS = ("interview_history", "interview_history_summary")
+
+# Analysis and evaluation fields kept in the history; the prompts invite the
+# model to add free-form extras, which are dropped.
+TURN_ANALYSIS_KEYS = ("keywords", "relevance_to_question", "clarity_assessment", "technical_accuracy_assessment")
+TURN_EVALUATION_KEYS = ("score", "overall_evaluation_summary", "relevance_judgment", "strengths", "areas_for_improvement")
+
+
+class TurnRecord(TypedDict):
+    """One answered question as kept in ``interview_history``."""
+    question: Dict[str, Any] # id, text, topic, difficulty
+    response: Optional[str]
+    analysis: Dict[str, Any]
+    evaluation: Dict[str, Any]
+    feedback: Optional[str]
+    timestamp: str # ISO 8601
+
+
+def make_turn_record(
+        question: Optional[Dict[str, Any]],
+        response: Optional[str],
+        analysis: Optional[Dict[str, Any]],
+        evaluation: Optional[Dict[str, Any]],
+        feedback: Optional[str],
+) -> TurnRecord:
+    question = question or {}
+    analysis = analysis or {}
+    evaluation = evaluation or {}
+    return TurnRecord(
+        question={k: question.get(k) for k in ("id", "text", "topic", "difficulty")},
+        response=response,
+        analysis={k: analysis[k] for k in TURN_ANALYSIS_KEYS if k in analysis},
+        evaluation={k: evaluation[k] for k in TURN_EVALUATION_KEYS if k in evaluation},
+        feedback=feedback,
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+    )
+
+
 class InterviewState(BaseModel):
     job_role: str
     candidate_id: str
-    interview_history: List[Dict[str, Any]] = Field(default_factory=list)
+    # Append-only: nodes return just the new turns, and the checkpointer stores
+    # each turn once (see checkpointing.DeltaCheckpointSaver).
+    interview_history: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list)
+    # One small entry per answered question (scoring.summarize_turn), returned with every response.
+    interview_history_summary: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list)
+    # Running totals maintained by update_state_node (see scoring.update_aggregates).
+    score_aggregates: Dict[str, Any] = Field(default_factory=dict)
     current_question: Optional[Dict[str, Any]] = None
     candidate_response: Optional[str] = None
     response_analysis: Optional[Dict[str, Any]] = None
@@ -16,7 +63,9 @@ class InterviewState(BaseModel):
     interview_status: InterviewStatus = 'not_started'
     questions_asked_count: int = 0
     total_questions_planned: int = TOTAL_QUESTIONS_PLANNED
-    available_questions_pool: List[Dict[str, Any]] = Field(default_factory=list)
+    # Question bodies live in the shared catalog (see question_cache); the
+    # state only carries the IDs still available to ask.
+    available_question_ids: List[str] = Field(default_factory=list)
     interview_config: Dict[str, Any] = Field(default_factory=dict)
     error_message: Optional[str] = None
 
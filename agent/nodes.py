@@ -1,33 +1,52 @@
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, List
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import interrupt
 
-from .models import InterviewState
+from .models import InterviewState, make_turn_record
+from .scoring import summarize_turn, update_aggregates
 from langgraph.graph import END
-from .database import fetch_questions_from_db
-from .config import db
-from datetime import datetime
+from .question_cache import (
+    get_questions_for_role,
+    aget_questions_for_role,
+    resolve_questions,
+    aresolve_questions,
+    get_question_index,
+    aget_question_index,
+)
+from .config import (
+    QUESTION_SELECTION_MODE,
+    SPECULATIVE_SELECTION,
+    EVALUATION_MODE,
+    SELECTION_SHORTLIST_K,
+    SELECTION_COVERAGE_SAMPLE,
+)
+from .question_index import QuestionIndex, shortlist_for_prompt
+from .selector import select_question_locally, shortlist_questions
+from .speculation import start_speculation, confirm_speculation, discard_speculation
 from .llm_helpers import (
     call_llm_select_question,
     call_llm_analyze_and_evaluate_response,
     call_llm_generate_feedback,
+    acall_llm_select_question,
+    acall_llm_analyze_and_evaluate_response,
+    acall_llm_generate_feedback,
+    call_llm_evaluate_with_feedback,
+    acall_llm_evaluate_with_feedback,
 )
 
-def start_interview_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: start_interview ---")
-    job_role = state.job_role
-    candidate_id = state.candidate_id
+logger = logging.getLogger(__name__)
 
-    print(f"Starting interview for {candidate_id} ({job_role})")
 
-    questions_pool = fetch_questions_from_db(job_role)
+def _start_interview_updates(state: InterviewState, questions_pool: List[Dict[str, Any]]) -> Dict[str, Any]:
     total_planned = min(len(questions_pool), state.total_questions_planned)
     updates = {
         "interview_status": "in_progress",
         "questions_asked_count": 0,
         "overall_score": 0.0,
-        "interview_history": [],
-        "available_questions_pool": questions_pool,
+        "score_aggregates": {},
+        "available_question_ids": [q["id"] for q in questions_pool if q.get("id")],
         "total_questions_planned": total_planned,
         "current_question": None,
         "candidate_response": None,
@@ -38,37 +57,33 @@ def start_interview_node(state: InterviewState) -> Dict[str, Any]:
     }
 
     return updates
-def select_question_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: select_question ---")
-    available_questions = state.available_questions_pool
-    asked_count = state.questions_asked_count
-    total_planned = state.total_questions_planned
-    interview_history = state.interview_history
-    interview_config = state.interview_config
-    job_role = state.job_role
-
-    if asked_count >= total_planned:
-         print("System limit reached: Reached planned questions count. Forcing end.")
-         return {"interview_status": "completed"}
-
-
-
-    llm_decision_result = call_llm_select_question(
-        available_questions=available_questions,
-        interview_history=interview_history,
-        interview_config=interview_config,
-        job_role=job_role,
-    )
-
+def start_interview_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: start_interview ---")
+    logger.info("Starting interview for %s (%s)", state.candidate_id, state.job_role)
+
+    questions_pool = get_questions_for_role(state.job_role)
+    return _start_interview_updates(state, questions_pool)
+async def astart_interview_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: start_interview ---")
+    logger.info("Starting interview for %s (%s)", state.candidate_id, state.job_role)
+
+    questions_pool = await aget_questions_for_role(state.job_role)
+    return _start_interview_updates(state, questions_pool)
+def _select_question_limit_reached(state: InterviewState) -> bool:
+    if state.questions_asked_count >= state.total_questions_planned:
+         logger.info("System limit reached: Reached planned questions count. Forcing end.")
+         return True
+    return False
+def _select_question_updates(state: InterviewState, llm_decision_result: Dict[str, Any] | None) -> Dict[str, Any]:
     error_message = None
 
     if llm_decision_result is None:
-        print("LLM question selection failed or returned invalid result.")
+        logger.warning("LLM question selection failed or returned invalid result.")
         error_message = state.error_message or "Question selection failed."
         updates = {"interview_status": "terminated", "error_message": error_message}
 
     elif isinstance(llm_decision_result, dict) and llm_decision_result.get("action") == "end_interview":
-         print("LLM decided to end the interview.")
+         logger.info("LLM decided to end the interview.")
          error_message = llm_decision_result.get('reason')
          updates = {"interview_status": "completed", "error_message": error_message or state.error_message}
 
@@ -79,13 +94,13 @@ def select_question_node(state: InterviewState) -> Dict[str, Any]:
         selected_id = selected_question.get('id')
 
 
-        new_pool = [q for q in available_questions if q.get('id') != selected_id]
+        new_pool = [qid for qid in state.available_question_ids if qid != selected_id]
 
-        print(f"Selected question from pool: ID {selected_id}")
+        logger.debug("Selected question from pool: ID %s", selected_id)
 
         updates = {
             "current_question": selected_question,
-            "available_questions_pool": new_pool,
+            "available_question_ids": new_pool,
             "interview_status": state.interview_status
         }
 
@@ -94,19 +109,142 @@ def select_question_node(state: InterviewState) -> Dict[str, Any]:
         updates["error_message"] = error_message
 
     return updates
+def _local_selection(state: InterviewState, available_questions: List[Dict[str, Any]]) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Local decision plus the tied shortlist the LLM may choose from in hybrid mode."""
+    decision = select_question_locally(available_questions, state.interview_history)
+    if decision.get("action") == "end_interview" or QUESTION_SELECTION_MODE != "hybrid":
+        return decision, []
+    shortlist = shortlist_questions(available_questions, state.interview_history)
+    return decision, shortlist if len(shortlist) > 1 else []
+def _needs_prompt_shortlist(questions: List[Dict[str, Any]]) -> bool:
+    return 0 < SELECTION_SHORTLIST_K and SELECTION_SHORTLIST_K + SELECTION_COVERAGE_SAMPLE < len(questions)
+def _prompt_shortlist(state: InterviewState, questions: List[Dict[str, Any]], index: QuestionIndex) -> List[Dict[str, Any]]:
+    shortlist = shortlist_for_prompt(
+        index, questions, state.interview_history, SELECTION_SHORTLIST_K, SELECTION_COVERAGE_SAMPLE)
+    logger.debug("Shortlisted %s of %s questions for the selection prompt.", len(shortlist), len(questions))
+    return shortlist
+def _prompt_questions(state: InterviewState, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not _needs_prompt_shortlist(questions):
+        return questions
+    return _prompt_shortlist(state, questions, get_question_index(state.job_role))
+async def _aprompt_questions(state: InterviewState, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not _needs_prompt_shortlist(questions):
+        return questions
+    return _prompt_shortlist(state, questions, await aget_question_index(state.job_role))
+def _choose_question(state: InterviewState, available_questions: List[Dict[str, Any]]) -> Dict[str, Any] | None:
+    if QUESTION_SELECTION_MODE == "llm":
+        return call_llm_select_question(
+            available_questions=_prompt_questions(state, available_questions),
+            interview_history=state.interview_history,
+            interview_config=state.interview_config,
+            job_role=state.job_role,
+        )
+
+    decision, tied = _local_selection(state, available_questions)
+    if tied:
+        logger.debug("Local selector tied between %s questions. Asking LLM to break the tie.", len(tied))
+        tie_break = call_llm_select_question(
+            available_questions=_prompt_questions(state, tied),
+            interview_history=state.interview_history,
+            interview_config=state.interview_config,
+            job_role=state.job_role,
+        )
+        if tie_break is not None and tie_break.get("action") != "end_interview":
+            decision = tie_break
+    return decision
+def select_question_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: select_question ---")
+    if _select_question_limit_reached(state):
+        return {"interview_status": "completed"}
+
+    available_questions = resolve_questions(state.job_role, state.available_question_ids)
+    decision = _choose_question(state, available_questions)
+    return _select_question_updates(state, decision)
+async def _achoose_question(state: InterviewState, available_questions: List[Dict[str, Any]]) -> Dict[str, Any] | None:
+    if QUESTION_SELECTION_MODE == "llm":
+        return await acall_llm_select_question(
+            available_questions=await _aprompt_questions(state, available_questions),
+            interview_history=state.interview_history,
+            interview_config=state.interview_config,
+            job_role=state.job_role,
+        )
+
+    decision, tied = _local_selection(state, available_questions)
+    if tied:
+        logger.debug("Local selector tied between %s questions. Asking LLM to break the tie.", len(tied))
+        tie_break = await acall_llm_select_question(
+            available_questions=await _aprompt_questions(state, tied),
+            interview_history=state.interview_history,
+            interview_config=state.interview_config,
+            job_role=state.job_role,
+        )
+        if tie_break is not None and tie_break.get("action") != "end_interview":
+            decision = tie_break
+    return decision
+async def _aspeculate_next_question(state: InterviewState) -> Dict[str, Any] | None:
+    available_questions = await aresolve_questions(state.job_role, state.available_question_ids)
+    return await _achoose_question(state, available_questions)
+async def achoose_opening_question(job_role: str) -> Dict[str, Any] | None:
+    """The first question for ``job_role``, chosen once for a batch of interviews.
+
+    With no history yet the choice depends only on the role's question pool.
+    Pass it to each interview's first run as ``configurable.opening_decision``.
+    """
+    questions_pool = await aget_questions_for_role(job_role)
+    state = InterviewState(
+        job_role=job_role,
+        candidate_id="",
+        available_question_ids=[q["id"] for q in questions_pool if q.get("id")],
+    )
+    decision = await _achoose_question(state, questions_pool)
+    if not decision or decision.get("action") == "end_interview":
+        return None
+    return decision
+async def aselect_question_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    logger.debug("--- Node: select_question ---")
+    thread_id = config["configurable"]["thread_id"]
+    if _select_question_limit_reached(state):
+        discard_speculation(thread_id)
+        return {"interview_status": "completed"}
+
+    opening = config["configurable"].get("opening_decision")
+    if opening is not None and not state.interview_history and opening.get("id") in state.available_question_ids:
+        return _select_question_updates(state, opening)
+
+    available_questions = await aresolve_questions(state.job_role, state.available_question_ids)
+    if SPECULATIVE_SELECTION and state.interview_history:
+        decision = await confirm_speculation(thread_id, available_questions, state.interview_history)
+        if decision is not None:
+            return _select_question_updates(state, decision)
+
+    decision = await _achoose_question(state, available_questions)
+    return _select_question_updates(state, decision)
 def ask_question_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: ask_question ---")
+    logger.debug("--- Node: ask_question ---")
     question = state.current_question
 
     if question and question.get('text'):
-        print(f"\nAI Interviewer asks: {question['text']}\n")
+        logger.debug("AI Interviewer asks: %s", question['text'])
 
     else:
-        print("Error: No current question found in state to ask.")
+        logger.warning("Error: No current question found in state to ask.")
         return {"error_message": state.error_message or "No question available to ask."}
 
 
     return {}
+async def aask_question_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    updates = ask_question_node(state)
+    # Pick the following question while the candidate is answering this one,
+    # unless this is the last planned question or selection is local (cheap).
+    if (
+            SPECULATIVE_SELECTION
+            and QUESTION_SELECTION_MODE != "local"
+            and state.current_question
+            and state.available_question_ids
+            and state.questions_asked_count + 1 < state.total_questions_planned
+    ):
+        start_speculation(config["configurable"]["thread_id"], _aspeculate_next_question(state))
+    return updates
 def receive_response_node(state: InterviewState) -> Dict[str, Any]:
     candidate_response = interrupt(
         {
@@ -114,108 +252,132 @@ def receive_response_node(state: InterviewState) -> Dict[str, Any]:
         }
     )
 
-    print("--- Node: receive_response ---")
+    logger.debug("--- Node: receive_response ---")
 
     updates = {
         "candidate_response": candidate_response,
         "error_message": None,
     }
     return updates
-def process_response_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: process_response ---")
-    question = state.current_question
-    response = state.candidate_response
-    job_role = state.job_role
-
-    if not question or not response:
-        print("Error: Missing question or response for processing.")
+def _process_response_precheck(state: InterviewState) -> Dict[str, Any] | None:
+    if not state.current_question or not state.candidate_response:
+        logger.warning("Error: Missing question or response for processing.")
         error_msg = "Missing question or response for processing."
         return {"error_message": state.error_message or error_msg, "interview_status": "terminated"} # Terminate on critical error
-
-    combined_result = call_llm_analyze_and_evaluate_response(question, response, job_role)
-
+    return None
+def _process_response_updates(state: InterviewState, combined_result: Dict[str, Any] | None) -> Dict[str, Any]:
     updates = {}
     error_message = state.error_message
 
     if combined_result is None:
-        print("Response analysis and evaluation failed.")
+        logger.warning("Response analysis and evaluation failed.")
         error_message = error_message or "Response analysis and evaluation failed."
         updates = {"interview_status": "terminated"}
     else:
-        print("Response analysis and evaluation successful.")
+        logger.debug("Response analysis and evaluation successful.")
         updates = {
             "response_analysis": combined_result.get("analysis"),
             "response_evaluation": combined_result.get("evaluation"),
         }
+        if "feedback" in combined_result:
+            updates["feedback"] = combined_result["feedback"]
         if combined_result.get("error_reason"):
              updates["error_message"] = combined_result["error_reason"]
 
     if error_message is not None:
         updates["error_message"] = error_message
     return updates
-def generate_feedback_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: generate_feedback ---")
-    question = state.current_question
-    response = state.candidate_response
-    analysis = state.response_analysis
-    evaluation = state.response_evaluation
-    job_role = state.job_role
-
+def process_response_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: process_response ---")
+    if (updates := _process_response_precheck(state)) is not None:
+        return updates
 
-    if not question or not response or not analysis or not evaluation:
-        print("Error: Missing data (Q, A, Analysis, or Evaluation) for feedback generation.")
+    if EVALUATION_MODE == "fused":
+        combined_result = call_llm_evaluate_with_feedback(state.current_question, state.candidate_response, state.job_role)
+    else:
+        combined_result = call_llm_analyze_and_evaluate_response(state.current_question, state.candidate_response, state.job_role)
+    return _process_response_updates(state, combined_result)
+async def aprocess_response_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: process_response ---")
+    if (updates := _process_response_precheck(state)) is not None:
+        return updates
+
+    if EVALUATION_MODE == "fused":
+        combined_result = await acall_llm_evaluate_with_feedback(state.current_question, state.candidate_response, state.job_role)
+    else:
+        combined_result = await acall_llm_analyze_and_evaluate_response(state.current_question, state.candidate_response, state.job_role)
+    return _process_response_updates(state, combined_result)
+def _generate_feedback_precheck(state: InterviewState) -> Dict[str, Any] | None:
+    if not state.current_question or not state.candidate_response or not state.response_analysis or not state.response_evaluation:
+        logger.warning("Error: Missing data (Q, A, Analysis, or Evaluation) for feedback generation.")
         error_msg = "Missing data for feedback generation."
         return {"error_message": state.error_message or error_msg, "interview_status": "terminated"}
-
-    feedback_text = call_llm_generate_feedback(
-        question=question,
-        response=response,
-        analysis=analysis,
-        evaluation=evaluation,
-        job_role=job_role,
-    )
-
+    return None
+def _generate_feedback_updates(state: InterviewState, feedback_text: str | None) -> Dict[str, Any]:
     updates = {}
     error_message = state.error_message
 
     if feedback_text is None:
-        print("Feedback generation failed.")
+        logger.warning("Feedback generation failed.")
         error_message = error_message or "Feedback generation failed."
         updates = {"interview_status": "terminated"}
     else:
-        print("Feedback generation successful.")
+        logger.debug("Feedback generation successful.")
         updates = {"feedback": feedback_text}
 
     if error_message is not None:
         updates["error_message"] = error_message
 
     return updates
+def generate_feedback_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: generate_feedback ---")
+    if (updates := _generate_feedback_precheck(state)) is not None:
+        return updates
+
+    feedback_text = call_llm_generate_feedback(
+        question=state.current_question,
+        response=state.candidate_response,
+        analysis=state.response_analysis,
+        evaluation=state.response_evaluation,
+        job_role=state.job_role,
+    )
+    return _generate_feedback_updates(state, feedback_text)
+async def agenerate_feedback_node(state: InterviewState) -> Dict[str, Any]:
+    logger.debug("--- Node: generate_feedback ---")
+    if (updates := _generate_feedback_precheck(state)) is not None:
+        return updates
+
+    feedback_text = await acall_llm_generate_feedback(
+        question=state.current_question,
+        response=state.candidate_response,
+        analysis=state.response_analysis,
+        evaluation=state.response_evaluation,
+        job_role=state.job_role,
+    )
+    return _generate_feedback_updates(state, feedback_text)
 def provide_feedback_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: provide_feedback ---")
+    logger.debug("--- Node: provide_feedback ---")
     feedback = state.feedback
 
     if feedback:
-        print(f"\nAI Interviewer provides feedback: {feedback}\n")
+        logger.debug("AI Interviewer provides feedback: %s", feedback)
     else:
-        print("Error: No feedback found in state to provide.")
+        logger.warning("Error: No feedback found in state to provide.")
 
         pass
     return {}
 
 
 def update_state_node(state: InterviewState) -> Dict[str, Any]:
-    print("--- Node: update_state ---")
-
-    current_cycle_data = {
-        "question": state.current_question,
-        "response": state.candidate_response,
-        "analysis": state.response_analysis,
-        "evaluation": state.response_evaluation,
-        "feedback": state.feedback,
-        "timestamp": datetime.now()
-    }
-
-    interview_history = state.interview_history + [current_cycle_data]
+    logger.debug("--- Node: update_state ---")
+
+    current_cycle_data = make_turn_record(
+        state.current_question,
+        state.candidate_response,
+        state.response_analysis,
+        state.response_evaluation,
+        state.feedback,
+    )
 
     latest_score = state.response_evaluation.get("score", 0.0) if state.response_evaluation else 0.0
     if latest_score is  None:
@@ -224,19 +386,22 @@ def update_state_node(state: InterviewState) -> Dict[str, Any]:
 
     new_questions_asked_count = state.questions_asked_count + 1
 
-    print(f"Cycle completed: Q {new_questions_asked_count}. Score for this Q: {latest_score:.2f}. Cumulative Score: {current_overall_score:.2f}")
+    logger.info("Cycle completed: Q %s. Score for this Q: %.2f. Cumulative Score: %.2f", new_questions_asked_count, latest_score, current_overall_score)
 
     interview_status = state.interview_status
     if new_questions_asked_count >= state.total_questions_planned:
-        print("Completion criteria met: Reached planned questions count.")
+        logger.info("Completion criteria met: Reached planned questions count.")
         interview_status = "completed"
     elif state.error_message:
-         print(f"Error message found: {state.error_message}. Setting status to terminated.")
+         logger.warning("Error message found: %s. Setting status to terminated.", state.error_message)
          interview_status = "terminated"
 
 
     updates = {
-        "interview_history": interview_history,
+        "interview_history": [current_cycle_data],
+        "interview_history_summary": [
+            summarize_turn(new_questions_asked_count, state.current_question, state.response_evaluation)],
+        "score_aggregates": update_aggregates(state.score_aggregates, state.current_question, state.response_evaluation),
         "overall_score": current_overall_score,
         "questions_asked_count": new_questions_asked_count,
         "interview_status": interview_status,
@@ -246,29 +411,80 @@ def update_state_node(state: InterviewState) -> Dict[str, Any]:
 
     return updates
 
+def _apply(state: InterviewState, updates: Dict[str, Any], step_updates: Dict[str, Any]) -> InterviewState:
+    """Fold one step's updates into a merged node's result and return the state the next step sees."""
+    updates.update(step_updates)
+    return state.model_copy(update=step_updates)
+
+
+# Lean topology (GRAPH_TOPOLOGY=lean): the steps of a turn run as two nodes
+# instead of six, so each turn takes fewer supersteps and checkpoint writes.
+def select_and_ask_node(state: InterviewState) -> Dict[str, Any]:
+    updates = {}
+    state = _apply(state, updates, select_question_node(state))
+    if decide_next_after_select(state) == "ask_question":
+        _apply(state, updates, ask_question_node(state))
+    return updates
+async def aselect_and_ask_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    updates = {}
+    state = _apply(state, updates, await aselect_question_node(state, config))
+    if decide_next_after_select(state) == "ask_question":
+        _apply(state, updates, await aask_question_node(state, config))
+    return updates
+
+
+# The interrupt comes first: on resume the node runs again from the top, so
+# nothing before it may be expensive.
+def answer_node(state: InterviewState) -> Dict[str, Any]:
+    updates = {}
+    state = _apply(state, updates, receive_response_node(state))
+    state = _apply(state, updates, process_response_node(state))
+    if decide_next_after_process(state) == "generate_feedback":
+        state = _apply(state, updates, generate_feedback_node(state))
+    state = _apply(state, updates, provide_feedback_node(state))
+    _apply(state, updates, update_state_node(state))
+    return updates
+async def aanswer_node(state: InterviewState) -> Dict[str, Any]:
+    updates = {}
+    state = _apply(state, updates, receive_response_node(state))
+    state = _apply(state, updates, await aprocess_response_node(state))
+    if decide_next_after_process(state) == "generate_feedback":
+        state = _apply(state, updates, await agenerate_feedback_node(state))
+    state = _apply(state, updates, provide_feedback_node(state))
+    _apply(state, updates, update_state_node(state))
+    return updates
+
 def decide_next_after_select(state: InterviewState):
 
-    print("--- Router: decide_next_after_select ---")
+    logger.debug("--- Router: decide_next_after_select ---")
     if state.interview_status in ['completed', 'terminated']:
-        print(f"Interview status is {state.interview_status}. Ending.")
+        logger.debug("Interview status is %s. Ending.", state.interview_status)
         return END
     elif state.current_question:
-        print("Question selected. Proceeding to ask_question.")
+        logger.debug("Question selected. Proceeding to ask_question.")
         return "ask_question"
     else:
-        print("No question selected and status not terminal. Forcing termination.")
+        logger.warning("No question selected and status not terminal. Forcing termination.")
         return END
 
+def decide_next_after_process(state: InterviewState):
+
+    logger.debug("--- Router: decide_next_after_process ---")
+    if EVALUATION_MODE == "fused":
+        logger.debug("Feedback was generated with the evaluation. Skipping generate_feedback.")
+        return "provide_feedback"
+    return "generate_feedback"
+
 def decide_next_after_update(state: InterviewState):
 
-    print("--- Router: decide_next_after_update ---")
+    logger.debug("--- Router: decide_next_after_update ---")
     if state.interview_status in ['completed', 'terminated']:
-        print(f"Interview status is {state.interview_status}. Ending.")
+        logger.debug("Interview status is %s. Ending.", state.interview_status)
         return END
-    elif state.questions_asked_count < state.total_questions_planned and state.available_questions_pool:
-        print(f"Asked {state.questions_asked_count}/{state.total_questions_planned} questions. Questions left: {len(state.available_questions_pool)}. Proceeding to select next question.")
+    elif state.questions_asked_count < state.total_questions_planned and state.available_question_ids:
+        logger.debug("Asked %s/%s questions. Questions left: %s. Proceeding to select next question.", state.questions_asked_count, state.total_questions_planned, len(state.available_question_ids))
         return "select_question"
     else:
-        print("Completion criteria met or no questions left. Ending interview.")
+        logger.info("Completion criteria met or no questions left. Ending interview.")
         return END
 
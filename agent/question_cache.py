@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .config import QUESTION_CACHE_MAX_ROLES, QUESTION_CACHE_TTL_SECONDS
+from .database import fetch_questions_from_db
+from .question_index import QuestionIndex
+
+logger = logging.getLogger(__name__)
+
+
+class _CatalogEntry:
+    __slots__ = ("questions", "by_id", "loaded_at", "_index")
+
+    def __init__(self, questions: List[Dict[str, Any]], loaded_at: float):
+        self.questions = questions
+        self.by_id = {q["id"]: q for q in questions if q.get("id")}
+        self.loaded_at = loaded_at
+        self._index: Optional[QuestionIndex] = None
+
+    @property
+    def index(self) -> QuestionIndex:
+        # Built on first use and dropped with the entry, so it always matches the cached catalog.
+        if self._index is None:
+            self._index = QuestionIndex(self.questions)
+        return self._index
+
+    @property
+    def index_built(self) -> bool:
+        return self._index is not None
+
+
+class _InFlightLoad:
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[_CatalogEntry] = None
+
+
+class QuestionCatalogCache:
+    """Process-wide cache of question catalogs keyed by job_role.
+
+    Entries expire after ``ttl_seconds`` and the least recently used role is
+    evicted once ``max_roles`` is exceeded. Concurrent misses for the same role
+    share a single loader call. Empty results are not cached, since the loader
+    also returns an empty list when Mongo is unavailable.
+    """
+
+    def __init__(
+            self,
+            loader: Callable[[str], List[Dict[str, Any]]],
+            ttl_seconds: float,
+            max_roles: int,
+    ):
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._max_roles = max_roles
+        self._entries: "OrderedDict[str, _CatalogEntry]" = OrderedDict()
+        self._inflight: Dict[str, _InFlightLoad] = {}
+        self._async_inflight: Dict[str, asyncio.Future] = {}
+        self._async_loads: Set[asyncio.Task] = set() # keeps running loads referenced
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so a load that started before the
+        # invalidation does not write its (possibly stale) result back.
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup_locked(self, job_role: str) -> Optional[_CatalogEntry]:
+        entry = self._entries.get(job_role)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self._ttl_seconds:
+            del self._entries[job_role]
+            return None
+        self._entries.move_to_end(job_role)
+        return entry
+
+    def _store_locked(self, job_role: str, entry: _CatalogEntry) -> None:
+        self._entries[job_role] = entry
+        self._entries.move_to_end(job_role)
+        while len(self._entries) > self._max_roles:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _get_entry(self, job_role: str) -> _CatalogEntry:
+        with self._lock:
+            entry = self._lookup_locked(job_role)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            flight = self._inflight.get(job_role)
+            is_leader = flight is None
+            if is_leader:
+                flight = _InFlightLoad()
+                self._inflight[job_role] = flight
+                generation = self._generation
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            return flight.result
+
+        entry = _CatalogEntry([], time.monotonic())
+        try:
+            entry = _CatalogEntry(self._loader(job_role), time.monotonic())
+        finally:
+            with self._lock:
+                self.loads += 1
+                if entry.questions and generation == self._generation:
+                    self._store_locked(job_role, entry)
+                del self._inflight[job_role]
+            flight.result = entry
+            flight.done.set()
+
+        return entry
+
+    async def _aget_entry(self, job_role: str) -> _CatalogEntry:
+        with self._lock:
+            entry = self._lookup_locked(job_role)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+        # Collapse concurrent misses on the event loop first, so a burst of
+        # requests waits on one future instead of parking executor threads.
+        future = self._async_inflight.get(job_role)
+        if future is not None:
+            with self._lock:
+                self.misses += 1
+                self.coalesced += 1
+            return await asyncio.shield(future)
+
+        # The load runs as its own task and the leader waits on the shared
+        # future like everyone else, so cancelling the leader cannot fail the
+        # requests coalesced on it (the thread would keep loading anyway).
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[job_role] = future
+
+        def resolve(load: asyncio.Task) -> None:
+            self._async_loads.discard(load)
+            del self._async_inflight[job_role]
+            if load.cancelled():
+                future.cancel()
+            elif load.exception() is not None:
+                future.set_exception(load.exception())
+                # Mark the exception as retrieved when nobody is waiting any more.
+                future.exception()
+            else:
+                future.set_result(load.result())
+
+        load = asyncio.create_task(asyncio.to_thread(self._get_entry, job_role))
+        self._async_loads.add(load)
+        load.add_done_callback(resolve)
+        return await asyncio.shield(future)
+
+    def get(self, job_role: str) -> List[Dict[str, Any]]:
+        return list(self._get_entry(job_role).questions)
+
+    async def aget(self, job_role: str) -> List[Dict[str, Any]]:
+        return list((await self._aget_entry(job_role)).questions)
+
+    @staticmethod
+    def _resolve(entry: _CatalogEntry, question_ids: List[str]) -> List[Dict[str, Any]]:
+        # IDs that vanished from the catalog since the interview started are skipped.
+        return [entry.by_id[qid] for qid in question_ids if qid in entry.by_id]
+
+    def resolve(self, job_role: str, question_ids: List[str]) -> List[Dict[str, Any]]:
+        """Return the question bodies for ``question_ids``, in the same order."""
+        return self._resolve(self._get_entry(job_role), question_ids)
+
+    async def aresolve(self, job_role: str, question_ids: List[str]) -> List[Dict[str, Any]]:
+        return self._resolve(await self._aget_entry(job_role), question_ids)
+
+    def index(self, job_role: str) -> QuestionIndex:
+        return self._get_entry(job_role).index
+
+    async def aindex(self, job_role: str) -> QuestionIndex:
+        entry = await self._aget_entry(job_role)
+        if entry.index_built:
+            return entry.index
+        # Building the index for a large catalog would stall the event loop.
+        return await asyncio.to_thread(lambda: entry.index)
+
+    def invalidate(self, job_role: Optional[str] = None) -> int:
+        """Drop one role (or every role when ``job_role`` is None). Returns the number of entries removed."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if job_role is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                removed = 1 if self._entries.pop(job_role, None) is not None else 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "coalesced": self.coalesced,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "cached_roles": list(self._entries.keys()),
+                "ttl_seconds": self._ttl_seconds,
+                "max_roles": self._max_roles,
+            }
+
+
+question_cache = QuestionCatalogCache(
+    loader=fetch_questions_from_db,
+    ttl_seconds=QUESTION_CACHE_TTL_SECONDS,
+    max_roles=QUESTION_CACHE_MAX_ROLES,
+)
+
+
+def get_questions_for_role(job_role: str) -> List[Dict[str, Any]]:
+    return question_cache.get(job_role)
+
+
+async def aget_questions_for_role(job_role: str) -> List[Dict[str, Any]]:
+    return await question_cache.aget(job_role)
+
+
+def resolve_questions(job_role: str, question_ids: List[str]) -> List[Dict[str, Any]]:
+    return question_cache.resolve(job_role, question_ids)
+
+
+async def aresolve_questions(job_role: str, question_ids: List[str]) -> List[Dict[str, Any]]:
+    return await question_cache.aresolve(job_role, question_ids)
+
+
+def get_question_index(job_role: str) -> QuestionIndex:
+    return question_cache.index(job_role)
+
+
+async def aget_question_index(job_role: str) -> QuestionIndex:
+    return await question_cache.aindex(job_role)
+
+
+def watch_question_changes(stop_event: threading.Event) -> None:
+    """Invalidate cached catalogs from a Mongo change stream until ``stop_event`` is set.
+
+    Change streams need a replica set or sharded cluster; on a standalone
+    server the watch fails once and the cache falls back to TTL expiry.
+    """
+    from .config import get_db
+
+    db = get_db()
+    if db is None:
+        logger.warning("MongoDB client is not available. Question cache watch disabled.")
+        return
+
+    try:
+        with db.questions.watch(full_document="updateLookup", max_await_time_ms=1000) as stream:
+            logger.info("Watching questions collection for catalog invalidation.")
+            while not stop_event.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    continue
+                document = change.get("fullDocument") or {}
+                job_role = document.get("job_role")
+                # Deletes carry no document, so we cannot tell which role changed.
+                question_cache.invalidate(job_role)
+                logger.info("Question catalog invalidated by change stream (%s, role=%s).", change.get('operationType'), job_role or 'all')
+    except Exception as e:
+        logger.warning("Question cache watch stopped: %s", e)
@@ -0,0 +1,145 @@
+"""TF-IDF index used to shortlist questions before the selection prompt.
+
+``call_llm_select_question`` lists every candidate question in its prompt, so
+prompt size grows with the question bank. ``shortlist_for_prompt`` keeps the
+top ``k`` questions most similar to the recent conversation (question and
+answer text plus the keywords from the last analysis) and adds a coverage
+sample with one question from each topic the top ``k`` missed, so the LLM can
+still steer the interview towards areas that have not been discussed.
+"""
+import math
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# The topic is short but says the most about a question, so it counts more
+# than a single word of the question text.
+TOPIC_WEIGHT = 3
+HISTORY_TURNS = 2
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class QuestionIndex:
+    """TF-IDF vectors for one role's question catalog, stored as term postings."""
+
+    def __init__(self, questions: List[Dict[str, Any]]):
+        self.ids = [q["id"] for q in questions if q.get("id")]
+        self._rows = {qid: row for row, qid in enumerate(self.ids)}
+
+        term_counts: List[Dict[str, int]] = []
+        document_frequency: Dict[str, int] = {}
+        for q in questions:
+            if not q.get("id"):
+                continue
+            counts: Dict[str, int] = {}
+            for token in tokenize(str(q.get("text") or "")):
+                counts[token] = counts.get(token, 0) + 1
+            for token in tokenize(str(q.get("topic") or "")):
+                counts[token] = counts.get(token, 0) + TOPIC_WEIGHT
+            term_counts.append(counts)
+            for token in counts:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+
+        n = len(self.ids)
+        self._idf = {t: math.log((1 + n) / (1 + df)) + 1.0 for t, df in document_frequency.items()}
+
+        # Sublinear TF, then every document vector is L2-normalized.
+        postings: Dict[str, tuple[List[int], List[float]]] = {}
+        for row, counts in enumerate(term_counts):
+            weights = {t: (1.0 + math.log(c)) * self._idf[t] for t, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for token, weight in weights.items():
+                rows, values = postings.setdefault(token, ([], []))
+                rows.append(row)
+                values.append(weight / norm)
+        self._postings = {
+            t: (np.asarray(rows, dtype=np.int32), np.asarray(values, dtype=np.float32))
+            for t, (rows, values) in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Cosine similarity of ``query`` against every indexed question."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        counts: Dict[str, int] = {}
+        for token in tokenize(query):
+            if token in self._postings:
+                counts[token] = counts.get(token, 0) + 1
+        if not counts:
+            return scores
+        weights = {t: (1.0 + math.log(c)) * self._idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        for token, weight in weights.items():
+            rows, values = self._postings[token]
+            scores[rows] += values * (weight / norm)
+        return scores
+
+    def row(self, question_id: str) -> int:
+        return self._rows.get(question_id, -1)
+
+
+def history_query(interview_history: List[Dict[str, Any]]) -> str:
+    """Text describing where the conversation is: recent Q&A and the last analysis keywords."""
+    parts = []
+    for turn in interview_history[-HISTORY_TURNS:]:
+        question = turn.get("question") or {}
+        parts.append(str(question.get("text") or ""))
+        parts.append(str(question.get("topic") or ""))
+        parts.append(str(turn.get("response") or ""))
+    if interview_history:
+        analysis = interview_history[-1].get("analysis") or {}
+        keywords = analysis.get("keywords") or []
+        if isinstance(keywords, list):
+            # Keywords are the model's own summary of the answer, so repeat them to weight them up.
+            parts.extend(str(k) for k in keywords for _ in range(2))
+    return " ".join(parts)
+
+
+def shortlist_for_prompt(
+        index: QuestionIndex,
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+        k: int,
+        coverage: int,
+) -> List[Dict[str, Any]]:
+    """Top ``k`` questions by similarity plus up to ``coverage`` from topics they miss, in pool order."""
+    candidates = [q for q in available_questions if q.get("id") and q.get("text")]
+    if k <= 0 or len(candidates) <= k + coverage:
+        return available_questions
+
+    scores = index.scores(history_query(interview_history))
+    rows = np.asarray([index.row(q["id"]) for q in candidates], dtype=np.int64)
+    if scores.size:
+        candidate_scores = np.where(rows >= 0, scores[np.maximum(rows, 0)], 0.0)
+    else:
+        # Empty (or stale) index for the role: every candidate ranks equally.
+        candidate_scores = np.zeros(len(candidates))
+    # Stable sort keeps pool order among equal scores (e.g. before the first answer).
+    order = np.argsort(-candidate_scores, kind="stable")
+
+    chosen = set(int(i) for i in order[:k])
+    chosen_topics = {candidates[i].get("topic") for i in chosen}
+
+    asked_per_topic: Dict[Any, int] = {}
+    for turn in interview_history:
+        topic = (turn.get("question") or {}).get("topic")
+        asked_per_topic[topic] = asked_per_topic.get(topic, 0) + 1
+
+    best_per_topic: Dict[Any, int] = {}
+    for i in order[k:]:
+        topic = candidates[int(i)].get("topic")
+        if topic not in chosen_topics and topic not in best_per_topic:
+            best_per_topic[topic] = int(i)
+    # Least-discussed topics get the coverage slots first.
+    missing = sorted(best_per_topic, key=lambda t: asked_per_topic.get(t, 0))
+    chosen.update(best_per_topic[t] for t in missing[:coverage])
+
+    return [q for i, q in enumerate(candidates) if i in chosen]
@@ -0,0 +1,241 @@
+"""Re-score finished interviews with the current evaluation prompt.
+
+Reads every finished thread from the checkpoint store (all shards), re-runs
+``acall_llm_analyze_and_evaluate_response`` on each (question, response) pair
+of its ``interview_history`` and appends one JSON line per answer to the
+output file. Answers are evaluated in chunks through ``abatch`` with bounded
+concurrency, still going through the LLM dispatcher's quota and retries, and
+only one chunk is held in memory at a time.
+
+The output doubles as the resume point: answers already in it are skipped, and
+failed evaluations are not written, so rerunning the same command retries
+them. ``--parquet`` converts the finished JSONL to Parquet (needs pyarrow).
+
+    python -m agent.rescore --out rescored.jsonl --concurrency 8
+    python -m agent.rescore --out rescored.jsonl --parquet rescored.parquet
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .checkpointing import DeltaCheckpointSaver, shard_paths
+from .config import CHECKPOINT_DB_PATH, CHECKPOINT_SHARDS, LLM_MAX_CONCURRENCY
+from .llm_helpers import EVALUATION_PROMPT_VERSION, acall_llm_analyze_and_evaluate_response
+from .models import APPEND_ONLY_CHANNELS
+
+logger = logging.getLogger(__name__)
+
+THREADS_PER_PAGE = 500
+PARQUET_ROWS_PER_GROUP = 10_000
+
+
+def _read_done(out_path: str) -> Set[Tuple[str, int]]:
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                done.add((row["thread_id"], row["turn"]))
+            except (json.JSONDecodeError, KeyError):
+                continue # a line cut short by an interrupted run
+    return done
+
+
+async def _finished_threads(saver: DeltaCheckpointSaver, statuses: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the latest state of every thread whose status is in ``statuses``, a page at a time."""
+    statuses = set(statuses)
+    last_thread_id = ""
+    while True:
+        async with saver.saver.lock:
+            async with saver.saver.conn.execute(
+                "SELECT DISTINCT thread_id FROM checkpoints WHERE checkpoint_ns = '' AND thread_id > ? "
+                "ORDER BY thread_id LIMIT ?",
+                (last_thread_id, THREADS_PER_PAGE),
+            ) as cur:
+                thread_ids = [row[0] for row in await cur.fetchall()]
+        if not thread_ids:
+            return
+        for thread_id in thread_ids:
+            checkpoint = await saver.aget_tuple({"configurable": {"thread_id": thread_id}})
+            values = checkpoint.checkpoint.get("channel_values", {}) if checkpoint else {}
+            if values.get("interview_status") in statuses:
+                yield {"thread_id": thread_id, **values}
+        last_thread_id = thread_ids[-1]
+
+
+async def _answers(paths, statuses, done: Set[Tuple[str, int]], report: Dict[str, int]) -> AsyncIterator[Dict[str, Any]]:
+    for path in paths:
+        async with AsyncSqliteSaver.from_conn_string(path) as sqlite_saver:
+            saver = DeltaCheckpointSaver(sqlite_saver, APPEND_ONLY_CHANNELS)
+            await saver.setup()
+            async for state in _finished_threads(saver, statuses):
+                report["threads"] += 1
+                for turn, entry in enumerate(state.get("interview_history") or []):
+                    if not entry.get("question") or entry.get("response") is None:
+                        continue
+                    if (state["thread_id"], turn) in done:
+                        report["skipped"] += 1
+                        continue
+                    yield {
+                        "thread_id": state["thread_id"],
+                        "turn": turn,
+                        "job_role": state.get("job_role", ""),
+                        "question": entry["question"],
+                        "response": entry["response"],
+                        "original_score": (entry.get("evaluation") or {}).get("score"),
+                    }
+
+
+def _write_chunk(out, chunk, results, report: Dict[str, int]) -> None:
+    for answer, result in zip(chunk, results):
+        if isinstance(result, Exception) or result is None:
+            report["failed"] += 1
+            continue
+        evaluation = result.get("evaluation") or {}
+        out.write(json.dumps({
+            "thread_id": answer["thread_id"],
+            "turn": answer["turn"],
+            "job_role": answer["job_role"],
+            "question_id": answer["question"].get("id"),
+            "original_score": answer["original_score"],
+            "new_score": evaluation.get("score"),
+            "prompt_version": EVALUATION_PROMPT_VERSION,
+            "analysis": result.get("analysis"),
+            "evaluation": evaluation,
+        }, default=str) + "\n")
+        report["rescored"] += 1
+    out.flush()
+
+
+async def rescore(
+        db_path: str,
+        shards: int,
+        out_path: str,
+        *,
+        statuses: Iterable[str] = ("completed",),
+        concurrency: int = LLM_MAX_CONCURRENCY,
+        batch_size: int = 200,
+        limit: int = 0,
+        use_cache: bool = False,
+) -> Dict[str, Any]:
+    paths = shard_paths(db_path, shards)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"Checkpoint database not found: {', '.join(missing)}")
+
+    async def _evaluate(answer: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await acall_llm_analyze_and_evaluate_response(
+            answer["question"], answer["response"], answer["job_role"], use_cache=use_cache)
+
+    evaluate = RunnableLambda(_evaluate)
+    report = {"threads": 0, "rescored": 0, "skipped": 0, "failed": 0}
+    done = _read_done(out_path)
+    started = time.perf_counter()
+
+    async with contextlib.aclosing(_answers(paths, statuses, done, report)) as answers:
+        with open(out_path, "a") as out:
+            chunk = []
+            async for answer in answers:
+                chunk.append(answer)
+                if limit and report["rescored"] + report["failed"] + len(chunk) >= limit:
+                    break
+                if len(chunk) >= batch_size:
+                    results = await evaluate.abatch(chunk, {"max_concurrency": concurrency}, return_exceptions=True)
+                    _write_chunk(out, chunk, results, report)
+                    logger.info("Rescored %s answers so far (%s failed).", report["rescored"], report["failed"])
+                    chunk = []
+            if chunk:
+                results = await evaluate.abatch(chunk, {"max_concurrency": concurrency}, return_exceptions=True)
+                _write_chunk(out, chunk, results, report)
+
+    report["duration_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def export_parquet(jsonl_path: str, parquet_path: str) -> int:
+    """Stream the JSONL output into a Parquet file; nested fields are kept as JSON strings."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("--parquet needs pyarrow: pip install pyarrow")
+
+    schema = pa.schema([
+        ("thread_id", pa.string()),
+        ("turn", pa.int64()),
+        ("job_role", pa.string()),
+        ("question_id", pa.string()),
+        ("original_score", pa.float64()),
+        ("new_score", pa.float64()),
+        ("prompt_version", pa.string()),
+        ("analysis", pa.string()),
+        ("evaluation", pa.string()),
+    ])
+    rows = 0
+    with open(jsonl_path) as f, pq.ParquetWriter(parquet_path, schema) as writer:
+        batch = []
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for key in ("original_score", "new_score"):
+                if not isinstance(row.get(key), (int, float)):
+                    row[key] = None
+            row["analysis"] = json.dumps(row.get("analysis"))
+            row["evaluation"] = json.dumps(row.get("evaluation"))
+            batch.append(row)
+            if len(batch) >= PARQUET_ROWS_PER_GROUP:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                rows += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            rows += len(batch)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score finished interviews with the current evaluation prompt.")
+    parser.add_argument("--db", default=CHECKPOINT_DB_PATH, help="Path to the SQLite checkpoint database.")
+    parser.add_argument("--shards", type=int, default=CHECKPOINT_SHARDS,
+                        help="Number of checkpoint shards the database is split into.")
+    parser.add_argument("--out", required=True, help="JSONL file to append results to (and resume from).")
+    parser.add_argument("--parquet", help="Also write the complete results to this Parquet file.")
+    parser.add_argument("--status", action="append", dest="statuses",
+                        help="Interview statuses to re-score (repeatable, default: completed).")
+    parser.add_argument("--concurrency", type=int, default=LLM_MAX_CONCURRENCY, help="LLM calls in flight at once.")
+    parser.add_argument("--batch-size", type=int, default=200, help="Answers evaluated (and held) per chunk.")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many answers (0 = all).")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Reuse cached evaluations for the current prompt version.")
+    args = parser.parse_args()
+
+    report = asyncio.run(rescore(
+        args.db,
+        args.shards,
+        args.out,
+        statuses=args.statuses or ("completed",),
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        limit=args.limit,
+        use_cache=args.use_cache,
+    ))
+    if args.parquet:
+        report["parquet_rows"] = export_parquet(args.out, args.parquet)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
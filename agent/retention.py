@@ -0,0 +1,211 @@
+"""Retention and compaction for the SQLite checkpoint store.
+
+Every superstep of every interview adds a checkpoint row, so the store grows
+without bound unless old rows are pruned. ``compact_checkpoints`` keeps the
+latest ``keep_last`` checkpoints per thread, collapses completed or terminated
+interviews to their final snapshot, drops the pending writes of removed
+checkpoints, and then checkpoints (and optionally vacuums) the database.
+
+Run it from the API (see ``CHECKPOINT_KEEP_LAST``) or as a one-off job, which
+compacts every shard when ``--shards`` (default ``CHECKPOINT_SHARDS``) is >1:
+
+    python -m agent.retention --db ./db/checkpoints.db --keep-last 3 --vacuum
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any, Dict, Optional
+
+import aiosqlite
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .checkpointing import shard_paths
+from .config import CHECKPOINT_DB_PATH, CHECKPOINT_SHARDS
+
+FINISHED_STATUSES = ("completed", "terminated")
+
+# Threads are compacted in small transactions so a shared saver connection is
+# only held for a few milliseconds at a time while interviews keep running.
+THREADS_PER_BATCH = 50
+
+
+def _store_size(db_path: str) -> int:
+    size = 0
+    for suffix in ("", "-wal"):
+        with contextlib.suppress(OSError):
+            size += os.path.getsize(db_path + suffix)
+    return size
+
+
+async def _latest_status(
+        conn: aiosqlite.Connection,
+        serde: SerializerProtocol,
+        thread_id: str,
+        checkpoint_ns: str,
+) -> Optional[str]:
+    async with conn.execute(
+        "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+        (thread_id, checkpoint_ns),
+    ) as cur:
+        row = await cur.fetchone()
+    if row is None:
+        return None
+    try:
+        checkpoint = serde.loads_typed((row[0], row[1]))
+    except Exception:
+        return None
+    return checkpoint.get("channel_values", {}).get("interview_status")
+
+
+async def _compact_thread(
+        conn: aiosqlite.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        keep: int,
+) -> tuple[int, int]:
+    cur = await conn.execute(
+        """DELETE FROM checkpoints
+        WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+            SELECT checkpoint_id FROM checkpoints
+            WHERE thread_id = ? AND checkpoint_ns = ?
+            ORDER BY checkpoint_id DESC LIMIT ?
+        )""",
+        (thread_id, checkpoint_ns, thread_id, checkpoint_ns, keep),
+    )
+    checkpoints_deleted = cur.rowcount
+    await cur.close()
+    cur = await conn.execute(
+        """DELETE FROM writes
+        WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+            SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+        )""",
+        (thread_id, checkpoint_ns, thread_id, checkpoint_ns),
+    )
+    writes_deleted = cur.rowcount
+    await cur.close()
+    return checkpoints_deleted, writes_deleted
+
+
+async def compact_checkpoints(
+        conn: aiosqlite.Connection,
+        db_path: str,
+        keep_last: int,
+        *,
+        lock: Optional[asyncio.Lock] = None,
+        serde: Optional[SerializerProtocol] = None,
+        vacuum: bool = False,
+) -> Dict[str, Any]:
+    """Prune old checkpoints and return a report of what was removed.
+
+    ``lock`` should be the saver's lock when ``conn`` is shared with a live
+    ``AsyncSqliteSaver``; the work is split into short critical sections.
+    """
+    keep_last = max(1, keep_last)
+    lock = lock or asyncio.Lock()
+    serde = serde or JsonPlusSerializer()
+    started = time.perf_counter()
+    bytes_before = _store_size(db_path)
+
+    async with lock:
+        async with conn.execute(
+            "SELECT thread_id, checkpoint_ns, COUNT(*) FROM checkpoints GROUP BY thread_id, checkpoint_ns HAVING COUNT(*) > 1"
+        ) as cur:
+            candidates = await cur.fetchall()
+
+    report = {
+        "threads_scanned": len(candidates),
+        "threads_finished": 0,
+        "checkpoints_deleted": 0,
+        "writes_deleted": 0,
+    }
+
+    for start in range(0, len(candidates), THREADS_PER_BATCH):
+        async with lock:
+            for thread_id, checkpoint_ns, count in candidates[start:start + THREADS_PER_BATCH]:
+                status = await _latest_status(conn, serde, thread_id, checkpoint_ns)
+                keep = 1 if status in FINISHED_STATUSES else keep_last
+                if status in FINISHED_STATUSES:
+                    report["threads_finished"] += 1
+                if count <= keep:
+                    continue
+                checkpoints_deleted, writes_deleted = await _compact_thread(conn, thread_id, checkpoint_ns, keep)
+                report["checkpoints_deleted"] += checkpoints_deleted
+                report["writes_deleted"] += writes_deleted
+            await conn.commit()
+
+    async with lock:
+        if vacuum:
+            await conn.execute("VACUUM")
+        await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        async with conn.execute("PRAGMA freelist_count") as cur:
+            freelist_pages = (await cur.fetchone())[0]
+        async with conn.execute("PRAGMA page_size") as cur:
+            page_size = (await cur.fetchone())[0]
+
+    bytes_after = _store_size(db_path)
+    report.update({
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "reclaimed_bytes": max(0, bytes_before - bytes_after),
+        # Freed pages stay inside the file for reuse until a VACUUM runs.
+        "reusable_bytes": freelist_pages * page_size,
+        "vacuumed": vacuum,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    })
+    return report
+
+
+async def run_periodic_compaction(
+        conn: aiosqlite.Connection,
+        db_path: str,
+        keep_last: int,
+        interval_seconds: float,
+        *,
+        lock: Optional[asyncio.Lock] = None,
+        serde: Optional[SerializerProtocol] = None,
+        vacuum: bool = False,
+        log=print,
+) -> None:
+    """Compact forever, sleeping ``interval_seconds`` between runs. Cancel the task to stop it."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            report = await compact_checkpoints(conn, db_path, keep_last, lock=lock, serde=serde, vacuum=vacuum)
+            log(f"Checkpoint compaction finished: {report}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log(f"Checkpoint compaction failed: {e}")
+
+
+async def _main(db_path: str, shards: int, keep_last: int, vacuum: bool) -> None:
+    paths = shard_paths(db_path, shards)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"Checkpoint database not found: {', '.join(missing)}")
+    for path in paths:
+        async with aiosqlite.connect(path) as conn:
+            report = await compact_checkpoints(conn, path, keep_last, vacuum=vacuum)
+        if len(paths) > 1:
+            print(f"[{path}]")
+        for key, value in report.items():
+            print(f"{key}: {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prune and compact the interview checkpoint store.")
+    parser.add_argument("--db", default=CHECKPOINT_DB_PATH, help="Path to the SQLite checkpoint database.")
+    parser.add_argument("--shards", type=int, default=CHECKPOINT_SHARDS,
+                        help="Number of checkpoint shards the database is split into.")
+    parser.add_argument("--keep-last", type=int, default=3,
+                        help="Checkpoints kept per in-progress thread (finished threads keep 1).")
+    parser.add_argument("--vacuum", action="store_true", help="Run VACUUM to return freed pages to the OS.")
+    args = parser.parse_args()
+    asyncio.run(_main(args.db, args.shards, args.keep_last, args.vacuum))
+
+
+if __name__ == "__main__":
+    main()
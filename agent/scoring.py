@@ -0,0 +1,102 @@
+"""Running score aggregates for the interview report.
+
+``update_state_node`` folds each answered question into
+``InterviewState.score_aggregates`` with ``update_aggregates``. The work per
+turn does not depend on how long the interview is, so ``build_report`` can
+serve ``GET /interview/{id}/report`` without rescanning ``interview_history``
+or calling the LLM.
+"""
+from typing import Any, Dict, List, Optional
+
+from .selector import difficulty_level
+
+MAX_SCORE = 10.0
+# Answers at or above STRONG_SCORE count as a strength of their topic, at or
+# below WEAK_SCORE as a weakness.
+STRONG_SCORE = 7.0
+WEAK_SCORE = 4.0
+
+
+def _bucket(buckets: Dict[str, Dict[str, Any]], key: str) -> Dict[str, Any]:
+    bucket = dict(buckets.get(key) or {"count": 0, "total": 0.0, "mean": 0.0, "strong": 0, "weak": 0})
+    buckets[key] = bucket
+    return bucket
+
+
+def update_aggregates(
+        aggregates: Dict[str, Any],
+        question: Optional[Dict[str, Any]],
+        evaluation: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Return ``aggregates`` with one more answered question folded in (the input is not modified)."""
+    question = question or {}
+    score = (evaluation or {}).get("score")
+    updated = {
+        "answered": aggregates.get("answered", 0) + 1,
+        "scored": aggregates.get("scored", 0),
+        "total": aggregates.get("total", 0.0),
+        "weighted_total": aggregates.get("weighted_total", 0.0),
+        "weight": aggregates.get("weight", 0.0),
+        "topics": dict(aggregates.get("topics") or {}),
+        "difficulties": dict(aggregates.get("difficulties") or {}),
+    }
+    if not isinstance(score, (int, float)):
+        return updated
+
+    score = float(score)
+    # Harder questions count for more in the weighted score, on the selector's
+    # scale, so "hard" and "advanced" (or 3) weigh and bucket the same.
+    level = difficulty_level(question.get("difficulty"))
+    weight = float(level)
+    updated["scored"] += 1
+    updated["total"] += score
+    updated["weighted_total"] += score * weight
+    updated["weight"] += weight
+
+    for buckets, key in ((updated["topics"], str(question.get("topic") or "unknown")),
+                         (updated["difficulties"], str(level))):
+        bucket = _bucket(buckets, key)
+        bucket["count"] += 1
+        bucket["total"] += score
+        bucket["mean"] = bucket["total"] / bucket["count"]
+        bucket["strong"] += score >= STRONG_SCORE
+        bucket["weak"] += score <= WEAK_SCORE
+    return updated
+
+
+def summarize_turn(turn: int, question: Optional[Dict[str, Any]], evaluation: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The compact entry kept in ``interview_history_summary`` for one answered question."""
+    question = question or {}
+    return {
+        "turn": turn,
+        "question_id": question.get("id"),
+        "topic": question.get("topic"),
+        "difficulty": question.get("difficulty"),
+        "score": (evaluation or {}).get("score"),
+    }
+
+
+def _ranked(topics: Dict[str, Dict[str, Any]], key: str) -> List[str]:
+    return [topic for topic, bucket in sorted(topics.items(), key=lambda item: (-item[1][key], item[0])) if bucket[key]]
+
+
+def build_report(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    scored = aggregates.get("scored", 0)
+    topics = aggregates.get("topics") or {}
+    return {
+        "questions_answered": aggregates.get("answered", 0),
+        "questions_scored": scored,
+        "mean_score": aggregates["total"] / scored if scored else None,
+        "normalized_score": 100 * aggregates["total"] / (scored * MAX_SCORE) if scored else None,
+        "weighted_score": aggregates["weighted_total"] / aggregates["weight"] if aggregates.get("weight") else None,
+        "topics": {
+            topic: {"count": b["count"], "mean": b["mean"], "strong": b["strong"], "weak": b["weak"]}
+            for topic, b in topics.items()
+        },
+        "difficulties": {
+            difficulty: {"count": b["count"], "mean": b["mean"]}
+            for difficulty, b in (aggregates.get("difficulties") or {}).items()
+        },
+        "strengths": _ranked(topics, "strong"),
+        "weaknesses": _ranked(topics, "weak"),
+    }
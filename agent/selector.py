@@ -0,0 +1,146 @@
+"""Deterministic local question selection.
+
+Picks the next question from structured data only (topic, difficulty and the
+scores already in the interview history), so a turn does not need an LLM
+round trip to choose an ID from a list. Topics that have been asked least
+come first; within them the question closest to the target difficulty wins.
+The target moves up a level after a strong answer and down after a weak one.
+"""
+from typing import Any, Dict, List, Optional
+
+DIFFICULTY_LEVELS = {
+    "easy": 1,
+    "beginner": 1,
+    "junior": 1,
+    "medium": 2,
+    "intermediate": 2,
+    "mid": 2,
+    "hard": 3,
+    "advanced": 3,
+    "senior": 3,
+    "expert": 4,
+}
+UNKNOWN_DIFFICULTY_LEVEL = 2
+
+RAISE_DIFFICULTY_SCORE = 7.0 # scores are out of 10
+LOWER_DIFFICULTY_SCORE = 4.0
+
+EARLY_END_WINDOW = 3 # consecutive answers considered for ending early
+STRUGGLING_SCORE = 3.0
+EXPERT_SCORE = 9.0
+
+
+def difficulty_level(difficulty: Any) -> int:
+    if isinstance(difficulty, str):
+        level = DIFFICULTY_LEVELS.get(difficulty)
+        if level is None:
+            value = difficulty.strip().lower()
+            level = int(value) if value.isdigit() else DIFFICULTY_LEVELS.get(value, UNKNOWN_DIFFICULTY_LEVEL)
+        return level
+    if isinstance(difficulty, (int, float)) and not isinstance(difficulty, bool):
+        return int(difficulty)
+    return UNKNOWN_DIFFICULTY_LEVEL
+
+
+def _recent_scores(interview_history: List[Dict[str, Any]]) -> List[float]:
+    scores = []
+    for turn in interview_history:
+        score = (turn.get("evaluation") or {}).get("score")
+        if isinstance(score, (int, float)) and not isinstance(score, bool):
+            scores.append(float(score))
+    return scores
+
+
+def _last_asked_level(interview_history: List[Dict[str, Any]]) -> Optional[int]:
+    for turn in reversed(interview_history):
+        question = turn.get("question")
+        if question:
+            return difficulty_level(question.get("difficulty"))
+    return None
+
+
+def target_difficulty(
+        interview_history: List[Dict[str, Any]],
+        levels: List[int],
+) -> int:
+    """Difficulty level to aim for next, given the levels still available in the pool."""
+    levels = sorted(set(levels))
+    start_index = (len(levels) - 1) // 2
+    last_level = _last_asked_level(interview_history)
+    if last_level is None:
+        return levels[start_index]
+
+    # Index of the closest available level to the last question asked.
+    index = min(range(len(levels)), key=lambda i: (abs(levels[i] - last_level), i))
+    scores = _recent_scores(interview_history[-1:])
+    if scores:
+        if scores[-1] >= RAISE_DIFFICULTY_SCORE and levels[index] <= last_level:
+            index = min(index + 1, len(levels) - 1)
+        elif scores[-1] <= LOWER_DIFFICULTY_SCORE and levels[index] >= last_level:
+            index = max(index - 1, 0)
+    return levels[index]
+
+
+def early_end_reason(
+        interview_history: List[Dict[str, Any]],
+        available_questions: List[Dict[str, Any]],
+) -> Optional[str]:
+    if not available_questions:
+        return "No questions left in pool."
+
+    recent = _recent_scores(interview_history)[-EARLY_END_WINDOW:]
+    if len(recent) < EARLY_END_WINDOW:
+        return None
+    if all(score <= STRUGGLING_SCORE for score in recent):
+        return f"Candidate scored {STRUGGLING_SCORE:g} or lower on the last {EARLY_END_WINDOW} answers."
+
+    hardest_available = max(difficulty_level(q.get("difficulty")) for q in available_questions)
+    last_level = _last_asked_level(interview_history)
+    if (
+            all(score >= EXPERT_SCORE for score in recent)
+            and last_level is not None
+            and last_level >= hardest_available
+    ):
+        return f"Candidate scored {EXPERT_SCORE:g} or higher on the last {EARLY_END_WINDOW} answers at the top difficulty."
+    return None
+
+
+def shortlist_questions(
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Return the equally ranked best candidates, in pool order."""
+    candidates = [q for q in available_questions if q.get("id") and q.get("text")]
+    if not candidates:
+        return []
+
+    topic_counts: Dict[Any, int] = {}
+    for turn in interview_history:
+        question = turn.get("question") or {}
+        topic = question.get("topic")
+        topic_counts[topic] = topic_counts.get(topic, 0) + 1
+
+    levels = [difficulty_level(q.get("difficulty")) for q in candidates]
+    target = target_difficulty(interview_history, levels)
+
+    ranks = [
+        (topic_counts.get(q.get("topic"), 0), abs(level - target))
+        for q, level in zip(candidates, levels)
+    ]
+    best = min(ranks)
+    return [q for q, r in zip(candidates, ranks) if r == best]
+
+
+def select_question_locally(
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Same contract as ``call_llm_select_question``: a question dict or an end_interview action."""
+    reason = early_end_reason(interview_history, available_questions)
+    if reason:
+        return {"action": "end_interview", "reason": reason}
+
+    shortlist = shortlist_questions(available_questions, interview_history)
+    if not shortlist:
+        return {"action": "end_interview", "reason": "No questions left in pool."}
+    return shortlist[0]
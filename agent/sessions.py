@@ -0,0 +1,415 @@
+"""Interview session registry shared by every API worker.
+
+Sessions live in an ``interview_sessions`` table in the checkpoint database
+(its first shard when sharded), so any uvicorn worker that opens the same
+database can serve any session and sessions survive restarts. A bounded in-process LRU in front of the table
+keeps the per-request lookup off SQLite for sessions this worker has seen.
+Only hits are cached: a session started on another worker may appear at any
+moment, and removals go through ``delete``.
+
+Threads that exist in the checkpointer without a row (interviews started
+before the table existed) are recognised through the checkpointer and
+recorded on first lookup.
+
+Each row also records when the session was last active and its last status.
+``sweep_expired_sessions`` marks sessions idle for ``SESSION_IDLE_TTL_SECONDS``
+(unfinished ones only) or older than ``SESSION_MAX_AGE_SECONDS`` as
+``terminated`` and deletes their checkpoint thread. The row stays behind as a
+tombstone for ``SESSION_TOMBSTONE_SECONDS`` so the API can answer 410 rather
+than 404. A cached entry that could have expired by its own timestamps is
+re-read from the table, so workers other than the sweeping one notice too.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .config import (
+    SESSION_CACHE_MAX_ENTRIES,
+    SESSION_IDLE_TTL_SECONDS,
+    SESSION_MAX_AGE_SECONDS,
+    SESSION_TOMBSTONE_SECONDS,
+)
+from .retention import FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "candidate_id, job_role, created_at, last_active_at, status, expired_at"
+# Columns added after the table was first shipped; older databases get them on setup.
+_ADDED_COLUMNS = {"last_active_at": "REAL", "status": "TEXT", "expired_at": "REAL"}
+
+
+def _session_from_row(session_id: str, row: Tuple) -> Dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "candidate_id": row[0],
+        "job_role": row[1],
+        "created_at": row[2],
+        "last_active_at": row[3] if row[3] is not None else row[2],
+        "status": row[4],
+        "expired_at": row[5],
+    }
+
+
+class SessionStore:
+    def __init__(
+            self,
+            max_cached: int,
+            idle_ttl_seconds: float = 0.0,
+            max_age_seconds: float = 0.0,
+            tombstone_seconds: float = 0.0,
+    ):
+        self._max_cached = max_cached
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.tombstone_seconds = tombstone_seconds
+        self._cached: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._saver: Optional[AsyncSqliteSaver] = None
+        self._checkpointer: Optional[BaseCheckpointSaver] = None
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.checkpoint_hits = 0
+        self.misses = 0
+        self.created = 0
+        self.deleted = 0
+        self.expired_idle = 0
+        self.expired_max_age = 0
+        self.tombstones_purged = 0
+        # Row counts as of the last sweep (or refresh_counts call).
+        self.live = 0
+        self.tombstones = 0
+
+    async def setup(self, saver: AsyncSqliteSaver, checkpointer: Optional[BaseCheckpointSaver] = None) -> None:
+        """Bind to the saver's connection (and lock) and create the table if needed.
+
+        ``checkpointer`` is where unrecorded threads are looked up (the saver
+        itself unless the checkpoints are sharded).
+        """
+        self._saver = saver
+        self._checkpointer = checkpointer or saver
+        self._cached.clear()
+        async with saver.lock:
+            await saver.conn.execute(
+                """CREATE TABLE IF NOT EXISTS interview_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    candidate_id TEXT NOT NULL,
+                    job_role TEXT,
+                    created_at REAL NOT NULL,
+                    last_active_at REAL,
+                    status TEXT,
+                    expired_at REAL
+                )"""
+            )
+            async with saver.conn.execute("PRAGMA table_info(interview_sessions)") as cur:
+                existing = {row[1] for row in await cur.fetchall()}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    await saver.conn.execute(f"ALTER TABLE interview_sessions ADD COLUMN {column} {column_type}")
+            await saver.conn.execute(
+                "UPDATE interview_sessions SET last_active_at = created_at WHERE last_active_at IS NULL"
+            )
+            await saver.conn.execute(
+                "CREATE INDEX IF NOT EXISTS interview_sessions_last_active ON interview_sessions (last_active_at)"
+            )
+            await saver.conn.execute(
+                "CREATE INDEX IF NOT EXISTS interview_sessions_created ON interview_sessions (created_at)"
+            )
+            await saver.conn.execute(
+                "CREATE INDEX IF NOT EXISTS interview_sessions_expired ON interview_sessions (expired_at)"
+            )
+            await saver.conn.commit()
+
+    def _remember(self, session: Dict[str, Any]) -> None:
+        self._cached[session["session_id"]] = session
+        self._cached.move_to_end(session["session_id"])
+        while len(self._cached) > self._max_cached:
+            self._cached.popitem(last=False)
+
+    async def _insert(self, session: Dict[str, Any]) -> None:
+        async with self._saver.lock:
+            await self._saver.conn.execute(
+                "INSERT OR IGNORE INTO interview_sessions (session_id, candidate_id, job_role, created_at, last_active_at, status)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (session["session_id"], session["candidate_id"], session["job_role"], session["created_at"],
+                 session["last_active_at"], session["status"]),
+            )
+            await self._saver.conn.commit()
+
+    async def create(self, session_id: str, candidate_id: str, job_role: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        session = {
+            "session_id": session_id,
+            "candidate_id": candidate_id,
+            "job_role": job_role,
+            "created_at": now,
+            "last_active_at": now,
+            "status": None,
+            "expired_at": None,
+        }
+        await self._insert(session)
+        self._remember(session)
+        self.created += 1
+        return session
+
+    def _may_have_expired(self, session: Dict[str, Any], now: float) -> bool:
+        """Whether the sweeper could have expired ``session`` since it was cached.
+
+        The cached ``last_active_at`` is never newer than the row's, so if it
+        is still within the idle TTL the row is too.
+        """
+        if session["expired_at"] is not None:
+            return False
+        if self.max_age_seconds > 0 and now - session["created_at"] > self.max_age_seconds:
+            return True
+        return (self.idle_ttl_seconds > 0 and session["status"] not in FINISHED_STATUSES
+                and now - session["last_active_at"] > self.idle_ttl_seconds)
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """The session's row, including tombstones (``expired_at`` set); None if unknown."""
+        session = self._cached.get(session_id)
+        if session is not None and not self._may_have_expired(session, time.time()):
+            self._cached.move_to_end(session_id)
+            self.memory_hits += 1
+            return session
+
+        async with self._saver.lock:
+            async with self._saver.conn.execute(
+                f"SELECT {_COLUMNS} FROM interview_sessions WHERE session_id = ?",
+                (session_id,),
+            ) as cur:
+                row = await cur.fetchone()
+        if row is not None:
+            session = _session_from_row(session_id, row)
+            self._remember(session)
+            self.store_hits += 1
+            return session
+
+        checkpoint = await self._checkpointer.aget_tuple({"configurable": {"thread_id": session_id}})
+        if checkpoint is None:
+            self.misses += 1
+            return None
+        values = checkpoint.checkpoint.get("channel_values", {})
+        session = {
+            "session_id": session_id,
+            "candidate_id": values.get("candidate_id") or session_id,
+            "job_role": values.get("job_role"),
+            "created_at": time.time(),
+            "status": values.get("interview_status"),
+            "expired_at": None,
+        }
+        session["last_active_at"] = session["created_at"]
+        logger.info("Recorded session %s found only in the checkpointer.", session_id)
+        await self._insert(session)
+        self._remember(session)
+        self.checkpoint_hits += 1
+        return session
+
+    async def exists(self, session_id: str) -> bool:
+        """True for live sessions; expired ones count as gone."""
+        session = await self.get(session_id)
+        return session is not None and session["expired_at"] is None
+
+    async def touch(self, session_id: str, status: Optional[str] = None) -> bool:
+        """Record activity on a live session, and its status when one is given.
+
+        Returns False when the session is no longer live (e.g. the sweeper
+        expired it since it was looked up).
+        """
+        now = time.time()
+        async with self._saver.lock:
+            cur = await self._saver.conn.execute(
+                "UPDATE interview_sessions SET last_active_at = ?, status = COALESCE(?, status)"
+                " WHERE session_id = ? AND expired_at IS NULL",
+                (now, status, session_id),
+            )
+            live = cur.rowcount > 0
+            await cur.close()
+            await self._saver.conn.commit()
+        session = self._cached.get(session_id)
+        if not live:
+            self._cached.pop(session_id, None)
+        elif session is not None and session["expired_at"] is None:
+            self._cached[session_id] = {**session, "last_active_at": now, "status": status or session["status"]}
+        return live
+
+    async def expire_batch(self, limit: int, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Mark up to ``limit`` sessions past a TTL as terminated; return ``(session_id, reason)`` pairs.
+
+        The conditions are checked again by the UPDATE itself, so a session
+        touched meanwhile, or expired by another worker's sweeper, is skipped.
+        """
+        now = time.time() if now is None else now
+        rules = []
+        if self.max_age_seconds > 0:
+            rules.append(("max_age", "created_at < ?", (now - self.max_age_seconds,)))
+        if self.idle_ttl_seconds > 0:
+            rules.append((
+                "idle",
+                f"last_active_at < ? AND COALESCE(status, '') NOT IN ({', '.join('?' * len(FINISHED_STATUSES))})",
+                (now - self.idle_ttl_seconds, *FINISHED_STATUSES),
+            ))
+        expired: List[Tuple[str, str]] = []
+        for reason, condition, params in rules:
+            if len(expired) >= limit:
+                break
+            async with self._saver.lock:
+                async with self._saver.conn.execute(
+                    f"""UPDATE interview_sessions SET expired_at = ?, status = 'terminated'
+                    WHERE expired_at IS NULL AND {condition} AND session_id IN (
+                        SELECT session_id FROM interview_sessions
+                        WHERE expired_at IS NULL AND {condition} LIMIT ?
+                    ) RETURNING session_id""",
+                    (now, *params, *params, limit - len(expired)),
+                ) as cur:
+                    rows = await cur.fetchall()
+                await self._saver.conn.commit()
+            for (session_id,) in rows:
+                expired.append((session_id, reason))
+                self._cached.pop(session_id, None)
+            if reason == "idle":
+                self.expired_idle += len(rows)
+            else:
+                self.expired_max_age += len(rows)
+        return expired
+
+    async def purge_tombstones(self, limit: int, now: Optional[float] = None) -> List[str]:
+        """Delete up to ``limit`` tombstones older than the retention; their IDs then get 404."""
+        if self.tombstone_seconds <= 0:
+            return []
+        now = time.time() if now is None else now
+        async with self._saver.lock:
+            async with self._saver.conn.execute(
+                """DELETE FROM interview_sessions WHERE session_id IN (
+                    SELECT session_id FROM interview_sessions WHERE expired_at < ? LIMIT ?
+                ) RETURNING session_id""",
+                (now - self.tombstone_seconds, limit),
+            ) as cur:
+                rows = await cur.fetchall()
+            await self._saver.conn.commit()
+        for (session_id,) in rows:
+            self._cached.pop(session_id, None)
+        self.tombstones_purged += len(rows)
+        return [session_id for (session_id,) in rows]
+
+    async def refresh_counts(self) -> None:
+        async with self._saver.lock:
+            async with self._saver.conn.execute(
+                "SELECT COUNT(*) - COUNT(expired_at), COUNT(expired_at) FROM interview_sessions"
+            ) as cur:
+                self.live, self.tombstones = await cur.fetchone()
+
+    async def delete(self, session_id: str) -> bool:
+        self._cached.pop(session_id, None)
+        async with self._saver.lock:
+            cur = await self._saver.conn.execute("DELETE FROM interview_sessions WHERE session_id = ?", (session_id,))
+            removed = cur.rowcount > 0
+            await cur.close()
+            await self._saver.conn.commit()
+        if removed:
+            self.deleted += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.store_hits + self.checkpoint_hits + self.misses
+        return {
+            "cached": len(self._cached),
+            "max_cached": self._max_cached,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "checkpoint_hits": self.checkpoint_hits,
+            "misses": self.misses,
+            "memory_hit_ratio": self.memory_hits / lookups if lookups else 0.0,
+            "created": self.created,
+            "deleted": self.deleted,
+            "live": self.live,
+            "tombstones": self.tombstones,
+            "expired_idle": self.expired_idle,
+            "expired_max_age": self.expired_max_age,
+            "tombstones_purged": self.tombstones_purged,
+        }
+
+
+async def sweep_expired_sessions(
+        store: SessionStore,
+        checkpointer: BaseCheckpointSaver,
+        batch_size: int,
+        *,
+        evict: Iterable[Callable[[str], None]] = (),
+) -> Dict[str, Any]:
+    """Expire sessions past their TTL in batches, deleting their checkpoint threads.
+
+    ``evict`` callbacks drop whatever else the worker keeps per session (the
+    snapshot cache, pending speculation). Purged tombstones have their thread
+    deleted once more, which catches a write that raced the expiry.
+    """
+    batch_size = max(1, batch_size)
+    started = time.perf_counter()
+    report = {"expired_idle": 0, "expired_max_age": 0, "threads_deleted": 0, "tombstones_purged": 0}
+    evict = list(evict)
+
+    async def drop_thread(session_id: str) -> None:
+        try:
+            await checkpointer.adelete_thread(session_id)
+            report["threads_deleted"] += 1
+        except Exception as e:
+            logger.warning("Could not delete checkpoint thread %s: %s", session_id, e)
+        for forget in evict:
+            forget(session_id)
+
+    while True:
+        expired = await store.expire_batch(batch_size)
+        for session_id, reason in expired:
+            report[f"expired_{reason}"] += 1
+            await drop_thread(session_id)
+        if len(expired) < batch_size:
+            break
+        await asyncio.sleep(0) # let requests in between batches
+
+    while True:
+        purged = await store.purge_tombstones(batch_size)
+        report["tombstones_purged"] += len(purged)
+        for session_id in purged:
+            await drop_thread(session_id)
+        if len(purged) < batch_size:
+            break
+        await asyncio.sleep(0)
+
+    await store.refresh_counts()
+    report.update({"live": store.live, "tombstones": store.tombstones,
+                   "duration_seconds": round(time.perf_counter() - started, 3)})
+    return report
+
+
+async def run_periodic_sweep(
+        store: SessionStore,
+        checkpointer: BaseCheckpointSaver,
+        interval_seconds: float,
+        batch_size: int,
+        *,
+        evict: Iterable[Callable[[str], None]] = (),
+) -> None:
+    """Sweep forever, ``interval_seconds`` apart (the first sweep runs at once). Cancel the task to stop it."""
+    evict = list(evict)
+    while True:
+        try:
+            report = await sweep_expired_sessions(store, checkpointer, batch_size, evict=evict)
+            if report["expired_idle"] or report["expired_max_age"] or report["tombstones_purged"]:
+                logger.info("Session sweep finished: %s", report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Session sweep failed: %s", e)
+        await asyncio.sleep(interval_seconds)
+
+
+session_store = SessionStore(
+    SESSION_CACHE_MAX_ENTRIES,
+    idle_ttl_seconds=SESSION_IDLE_TTL_SECONDS,
+    max_age_seconds=SESSION_MAX_AGE_SECONDS,
+    tombstone_seconds=SESSION_TOMBSTONE_SECONDS,
+)
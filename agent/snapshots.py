@@ -0,0 +1,63 @@
+"""Latest ``InterviewResponse`` per session, for ``GET /interview/{id}``.
+
+Rebuilding the response through the graph means loading and deserializing the
+whole checkpoint, which is too much for clients that poll. The API stores the
+response here whenever ``start``/``submit_answer`` finish, keyed by the ID of
+the checkpoint it was projected from. A read first looks up the thread's
+newest checkpoint ID (a primary-key lookup, see
+``checkpointing.latest_checkpoint_id``). It serves the cached response only if
+that ID still matches, so a session advanced by another worker is reloaded
+instead of served stale. The checkpoint ID doubles as the ETag.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import SNAPSHOT_CACHE_MAX_ENTRIES
+
+
+class SnapshotCache:
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    def get(self, session_id: str, checkpoint_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The cached response if it was projected from ``checkpoint_id``."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != checkpoint_id:
+            self.stale += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, session_id: str, checkpoint_id: Optional[str], body: Dict[str, Any]) -> None:
+        if checkpoint_id is None:
+            return
+        self._entries[session_id] = (checkpoint_id, body)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+snapshot_cache = SnapshotCache(SNAPSHOT_CACHE_MAX_ENTRIES)
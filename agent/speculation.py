@@ -0,0 +1,122 @@
+"""Speculative next-question selection.
+
+While the graph is interrupted waiting for the candidate's answer, the next
+question is picked in a background task from the history as it stands. When
+the answer has been evaluated, ``confirm_speculation`` either accepts that pick
+or cheaply re-ranks it against the new score, so ``/submit_answer`` does not
+wait on a full selection call.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, List, Optional
+
+from .selector import difficulty_level, shortlist_questions, target_difficulty
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_SPECULATIONS = 10_000
+SPECULATION_TTL_SECONDS = 3600.0
+
+
+class _Speculation:
+    __slots__ = ("task", "started_at")
+
+    def __init__(self, task: asyncio.Task, started_at: float):
+        self.task = task
+        self.started_at = started_at
+
+
+_speculations: "OrderedDict[str, _Speculation]" = OrderedDict()
+
+_stats = {
+    "started": 0,
+    "hits": 0, # speculative pick used as is
+    "reranked": 0, # speculative pick replaced after the score arrived
+    "misses": 0, # nothing usable; selection ran on the critical path
+    "discarded": 0, # evicted or abandoned before being used
+}
+
+
+def _drop(thread_id: str) -> None:
+    entry = _speculations.pop(thread_id, None)
+    if entry is not None:
+        entry.task.cancel()
+        _stats["discarded"] += 1
+
+
+def _evict_stale(now: float) -> None:
+    while _speculations:
+        thread_id, entry = next(iter(_speculations.items()))
+        if len(_speculations) <= MAX_PENDING_SPECULATIONS and now - entry.started_at <= SPECULATION_TTL_SECONDS:
+            break
+        _drop(thread_id)
+
+
+def start_speculation(thread_id: str, selection: Awaitable[Optional[Dict[str, Any]]]) -> None:
+    """Run ``selection`` in the background and keep its result for ``thread_id``."""
+    _drop(thread_id)
+    now = time.monotonic()
+    _evict_stale(now)
+    # A fresh context keeps the background call out of the request's callbacks
+    # (tracing, event streaming), which may be gone by the time it finishes.
+    task = asyncio.get_running_loop().create_task(selection, context=contextvars.Context())
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _speculations[thread_id] = _Speculation(task, now)
+    _stats["started"] += 1
+
+
+def discard_speculation(thread_id: str) -> None:
+    _drop(thread_id)
+
+
+async def confirm_speculation(
+        thread_id: str,
+        available_questions: List[Dict[str, Any]],
+        interview_history: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Return the question to ask next from the speculative pick, or None to select normally."""
+    entry = _speculations.pop(thread_id, None)
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+
+    try:
+        decision = await entry.task
+    except Exception as e:
+        logger.warning("Speculative selection failed: %s", e)
+        decision = None
+
+    pool_by_id = {q.get("id"): q for q in available_questions}
+    # An early end was decided without the latest answer, so re-run selection.
+    if not decision or decision.get("action") == "end_interview" or decision.get("id") not in pool_by_id:
+        _stats["misses"] += 1
+        return None
+
+    speculative = pool_by_id[decision["id"]]
+    target = target_difficulty(interview_history, [difficulty_level(q.get("difficulty")) for q in available_questions])
+    if difficulty_level(speculative.get("difficulty")) == target:
+        _stats["hits"] += 1
+        logger.debug("Speculative pick %s confirmed.", speculative['id'])
+        return speculative
+
+    # Keep the speculative topic but move to the difficulty the new score calls for.
+    same_topic = [q for q in available_questions if q.get("topic") == speculative.get("topic")]
+    candidates = same_topic or shortlist_questions(available_questions, interview_history)
+    reranked = min(candidates, key=lambda q: abs(difficulty_level(q.get("difficulty")) - target))
+    _stats["reranked"] += 1
+    logger.debug("Speculative pick %s re-ranked to %s (target difficulty %s).", speculative['id'], reranked['id'], target)
+    return reranked
+
+
+def speculation_stats() -> Dict[str, Any]:
+    used = _stats["hits"] + _stats["reranked"]
+    confirmations = used + _stats["misses"]
+    return {
+        **_stats,
+        "pending": len(_speculations),
+        "hit_rate": _stats["hits"] / confirmations if confirmations else 0.0,
+        "use_rate": used / confirmations if confirmations else 0.0,
+    }
@@ -0,0 +1,206 @@
+"""Reply schemas for the JSON-returning LLM calls, and a tolerant parser for them.
+
+The schemas mirror the formats documented in the selection and evaluation
+prompts. They are sent to Gemini as ``response_schema`` (JSON output mode), and
+every reply is validated against them. Models still add Markdown fences, copy
+the ``//`` comments from the prompt or leave trailing commas, so
+``parse_reply`` repairs those before giving up. A reply it cannot use is
+re-asked once by the caller. Outcomes are counted in
+``interview_llm_parse_total``.
+"""
+import functools
+import json
+import logging
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from .metrics import llm_parse_total
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionSelection(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    action: Literal["ask_question", "end_interview"]
+    selected_question_id: Optional[str] = None
+    reason: Optional[str] = None
+
+
+# The prompts invite the model to add fields of its own, so extras are kept.
+class ResponseAnalysis(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    key_points_extracted: List[str] = Field(default_factory=list)
+    relevance_to_question: Optional[str] = None
+    clarity_assessment: Optional[str] = None
+    technical_accuracy_assessment: Optional[str] = None
+    confidence_level: Optional[str] = None
+    sentiment: Optional[str] = None
+    keywords: List[str] = Field(default_factory=list)
+
+
+class ResponseEvaluation(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    score: Optional[float] # required, null when not scorable
+    overall_evaluation_summary: Optional[str] = None
+    relevance_judgment: Optional[str] = None
+    strengths: List[str] = Field(default_factory=list)
+    areas_for_improvement: List[str] = Field(default_factory=list)
+
+
+class AnalysisAndEvaluation(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    analysis: ResponseAnalysis
+    evaluation: ResponseEvaluation
+
+
+class EvaluationWithFeedback(AnalysisAndEvaluation):
+    model_config = ConfigDict(extra="allow", str_strip_whitespace=True)
+
+    feedback: str = Field(min_length=1)
+
+
+@functools.lru_cache(maxsize=None)
+def response_schema(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema for Gemini's ``response_schema``: no ``$defs`` and no open objects."""
+    def inline(node: Any, defs: Dict[str, Any]) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(defs[node["$ref"].split("/")[-1]], defs)
+            return {k: inline(v, defs) for k, v in node.items() if k not in ("$defs", "additionalProperties", "title")}
+        if isinstance(node, list):
+            return [inline(v, defs) for v in node]
+        return node
+
+    json_schema = schema.model_json_schema()
+    return inline(json_schema, json_schema.get("$defs", {}))
+
+
+def _strip_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _skip_string(text: str, i: int) -> int:
+    """Return the index just past the JSON string starting at ``text[i]``."""
+    i += 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+            continue
+        if text[i] == '"':
+            return i + 1
+        i += 1
+    return i
+
+
+def _strip_comments(text: str) -> str:
+    out, i = [], 0
+    while i < len(text):
+        if text[i] == '"':
+            end = _skip_string(text, i)
+            out.append(text[i:end])
+            i = end
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = len(text) if newline == -1 else newline
+        elif text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = len(text) if close == -1 else close + 2
+        else:
+            out.append(text[i])
+            i += 1
+    return "".join(out)
+
+
+def _strip_trailing_commas(text: str) -> str:
+    out, i = [], 0
+    while i < len(text):
+        if text[i] == '"':
+            end = _skip_string(text, i)
+            out.append(text[i:end])
+            i = end
+            continue
+        if text[i] == ",":
+            j = i + 1
+            while j < len(text) and text[j].isspace():
+                j += 1
+            if j < len(text) and text[j] in "}]":
+                i += 1
+                continue
+        out.append(text[i])
+        i += 1
+    return "".join(out)
+
+
+def repair_json(text: str) -> str:
+    """Fix the defects models commonly leave in JSON: surrounding prose, comments and trailing commas."""
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    return _strip_trailing_commas(_strip_comments(text))
+
+
+def _validation_summary(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or 'reply'}: {e['msg']}" for e in error.errors()[:5]
+    )
+
+
+def parse_reply(
+        content: Any,
+        schema: Type[BaseModel],
+        call: str,
+        attempt: str = "first",
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parse and validate an LLM reply.
+
+    Returns ``(result, None)`` with the validated reply as a dict, or
+    ``(None, error)`` with a short description to put in a re-ask prompt.
+    """
+    result, error, outcome = None, None, "ok"
+    if not isinstance(content, str) or not content.strip():
+        error = "The reply was empty."
+    else:
+        text = _strip_fence(content)
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            outcome = "repaired"
+            try:
+                data = json.loads(repair_json(text))
+            except json.JSONDecodeError as e:
+                error = f"The reply is not valid JSON ({e})."
+        if error is None:
+            try:
+                result = schema.model_validate(data).model_dump()
+            except ValidationError as e:
+                error = f"The reply does not match the required format: {_validation_summary(e)}."
+
+    if error is not None:
+        outcome = "failed"
+        logger.warning("Unusable %s reply (%s attempt): %s", call, attempt, error)
+    elif outcome == "repaired":
+        logger.info("Repaired malformed JSON in %s reply.", call)
+    llm_parse_total.inc(call=call, attempt=attempt, outcome=outcome)
+    return result, error
+
+
+def reask_prompt(prompt_text: str, content: Any, error: str) -> str:
+    previous = content[:2000] if isinstance(content, str) else ""
+    return f"""{prompt_text}
+
+    Your previous reply could not be used: {error}
+    Previous reply:
+    {previous}
+
+    Reply again with ONLY the corrected JSON object in the required format.
+    """
@@ -0,0 +1,127 @@
+"""Background warm-up started with the API.
+
+Importing the agent no longer touches the network, so the first requests would
+otherwise pay for connecting to Mongo, loading question catalogs and building
+the Gemini client. ``Warmup.run`` does that work after startup: it waits for
+Mongo (retrying every ``MONGO_RETRY_SECONDS``), preloads the catalog and
+search index of each configured role, then opens the LLM connection.
+Failed preloads are retried with backoff. Whatever is still missing after
+``WARMUP_DEADLINE_SECONDS`` is left to the first requests: warm-up ends as
+``degraded``, and ``GET /health/ready`` reports ready once it has finished
+either way, since the API can serve cold.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import MONGO_RETRY_SECONDS, WARMUP_DEADLINE_SECONDS, get_db, get_llm
+from .question_cache import aget_question_index
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+
+class _DeadlineReached(Exception):
+    pass
+
+
+async def _sleep_before_retry(deadline: float, delay: float) -> None:
+    # The last retry happens at the deadline rather than being skipped.
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise _DeadlineReached()
+    await asyncio.sleep(min(delay, remaining))
+
+
+def _open_llm_connection() -> None:
+    # count_tokens is a cheap authenticated round trip that sets up the channel
+    # without spending generation quota.
+    get_llm().get_num_tokens("warm-up")
+
+
+class Warmup:
+    def __init__(self):
+        self.status = "pending" # pending | waiting_for_mongo | loading | done | degraded
+        self.roles: Dict[str, int] = {}
+        self.llm: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.duration_seconds: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """Finished, completely or degraded; either way there is nothing left to wait for."""
+        return self.status in ("done", "degraded")
+
+    async def _preload_roles(self, job_roles: List[str], deadline: float) -> None:
+        pending = list(job_roles)
+        attempt = 0
+        while True:
+            failed = []
+            for job_role in pending:
+                try:
+                    index = await aget_question_index(job_role)
+                except Exception as e:
+                    failed.append(job_role)
+                    self.error = f"Preloading role '{job_role}' failed: {e}"
+                    logger.warning("Warm-up could not preload role '%s' (attempt %s): %s", job_role, attempt + 1, e)
+                    continue
+                self.roles[job_role] = len(index)
+                if not len(index):
+                    logger.warning("Warm-up found no questions for role '%s'.", job_role)
+            if not failed:
+                return
+            pending = failed
+            await _sleep_before_retry(deadline, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+            attempt += 1
+
+    async def run(self, job_roles: List[str], warm_llm: bool) -> None:
+        started = time.perf_counter()
+        deadline = time.monotonic() + WARMUP_DEADLINE_SECONDS
+        try:
+            self.status = "waiting_for_mongo"
+            while await asyncio.to_thread(get_db) is None:
+                self.error = "MongoDB is unavailable."
+                await _sleep_before_retry(deadline, MONGO_RETRY_SECONDS)
+
+            self.status = "loading"
+            self.error = None
+            await self._preload_roles(job_roles, deadline)
+            self.error = None
+
+            if warm_llm:
+                try:
+                    await asyncio.to_thread(_open_llm_connection)
+                    self.llm = True
+                except Exception as e:
+                    # Not fatal: the first real call will connect instead.
+                    self.llm = False
+                    logger.warning("LLM warm-up failed: %s", e)
+
+            self.status = "done"
+            logger.info("Warm-up finished in %.2fs (roles: %s).", time.perf_counter() - started, self.roles or "none")
+        except asyncio.CancelledError:
+            raise
+        except _DeadlineReached:
+            self.status = "degraded"
+            logger.warning("Warm-up gave up after %ss, serving cold: %s", WARMUP_DEADLINE_SECONDS, self.error)
+        except Exception as e:
+            self.status = "degraded"
+            self.error = str(e)
+            logger.error("Warm-up failed, serving cold: %s", e, exc_info=True)
+        finally:
+            self.duration_seconds = round(time.perf_counter() - started, 3)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "roles": dict(self.roles),
+            "llm": self.llm,
+            "error": self.error,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+warmup = Warmup()
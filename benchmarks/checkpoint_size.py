@@ -0,0 +1,102 @@
+"""Measure how many checkpoint bytes each interview turn writes.
+
+Runs one interview through the compiled graph against a throwaway SQLite
+checkpointer, wrapped as the API wraps it, and reports the bytes added to the
+``checkpoints``, ``checkpoint_deltas`` and ``writes`` tables after the opening
+segment and after every answered question. ``--max-growth`` turns it into a
+check: it exits non-zero if the last full turn writes more than that multiple
+of the first.
+
+    python -m benchmarks.checkpoint_size --questions 300 --turns 10
+    python -m benchmarks.checkpoint_size --turns 30 --max-growth 1.5
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+from .fakes import FakeChatModel, FakeDatabase, install_fakes, make_question_docs
+
+
+def _thread_bytes(db_path: str, thread_id: str) -> tuple[int, int, int]:
+    with sqlite3.connect(db_path) as conn:
+        checkpoint_bytes, checkpoint_rows = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0), COUNT(*) FROM checkpoints WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchone()
+        checkpoint_bytes += conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM checkpoint_deltas WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchone()[0]
+        write_bytes = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchone()[0]
+    return checkpoint_bytes, write_bytes, checkpoint_rows
+
+
+async def run(num_questions: int, turns: int) -> list:
+    os.environ["NUM_QUESTIONS"] = str(turns)
+    install_fakes(FakeChatModel(), FakeDatabase(make_question_docs("Software Engineer", num_questions)))
+
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    from langgraph.types import Command
+    from agent.checkpointing import DeltaCheckpointSaver
+    from agent.graph import workflow
+    from agent.models import APPEND_ONLY_CHANNELS, InterviewState
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "checkpoints.db")
+        async with AsyncSqliteSaver.from_conn_string(db_path) as saver:
+            checkpointer = DeltaCheckpointSaver(saver, APPEND_ONLY_CHANNELS)
+            await checkpointer.setup()
+            app = workflow.compile(checkpointer=checkpointer)
+            thread_id = "benchmark-thread"
+            config = {"configurable": {"thread_id": thread_id}}
+
+            state = await app.ainvoke(
+                InterviewState(job_role="Software Engineer", candidate_id=thread_id, total_questions_planned=turns),
+                config=config,
+            )
+            previous = _thread_bytes(db_path, thread_id)
+            print(f"{'segment':>8} {'checkpoint B':>13} {'writes B':>10} {'rows':>5} {'total B':>10}")
+            print(f"{'start':>8} {previous[0]:>13} {previous[1]:>10} {previous[2]:>5} {previous[0] + previous[1]:>10}")
+
+            turn = 0
+            per_turn = []
+            while state.get("interview_status") == "in_progress":
+                turn += 1
+                state = await app.ainvoke(Command(resume=f"Answer number {turn} with some detail."), config=config)
+                current = _thread_bytes(db_path, thread_id)
+                delta = [c - p for c, p in zip(current, previous)]
+                per_turn.append(delta[0] + delta[1])
+                print(f"{'turn ' + str(turn):>8} {delta[0]:>13} {delta[1]:>10} {delta[2]:>5} {delta[0] + delta[1]:>10}")
+                previous = current
+
+            total = previous[0] + previous[1]
+            print(f"\nquestions in bank: {num_questions}, turns: {turn}, status: {state.get('interview_status')}")
+            if per_turn:
+                print(f"mean bytes per turn: {sum(per_turn) / len(per_turn):,.0f}, thread total: {total:,} bytes")
+    return per_turn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=300, help="Questions in the role's bank.")
+    parser.add_argument("--turns", type=int, default=10, help="Questions asked per interview.")
+    parser.add_argument("--max-growth", type=float, default=0,
+                        help="Fail if the last full turn writes more than this multiple of the first.")
+    args = parser.parse_args()
+    per_turn = asyncio.run(run(args.questions, args.turns))
+    if args.max_growth and len(per_turn) >= 3:
+        # The final turn ends the interview and skips selection, so compare the last full one.
+        growth = per_turn[-2] / per_turn[0]
+        print(f"growth from turn 1 to turn {len(per_turn) - 1}: {growth:.2f}x (limit {args.max_growth}x)")
+        if growth > args.max_growth:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure checkpoint write throughput as concurrent sessions grow, per shard count.
+
+Every simulated session writes ``--steps`` checkpoints (each followed by a
+pending write, as a graph superstep does) through ``ShardedCheckpointSaver``
+over fresh SQLite files, carrying an interview-sized state that grows each
+step. One shard is the same single-file layout the API uses by default.
+
+    python -m benchmarks.checkpoint_writes --shards 1 2 4 8 --sessions 1 8 32 128 --steps 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from agent.checkpointing import ShardedCheckpointSaver, open_sqlite_shards, shard_paths
+
+ANSWER = "I would put a cache in front of the index, batch the writes and measure p95 latency under load. " * 3
+
+
+def _state(step: int) -> dict:
+    return {
+        "job_role": "Software Engineer",
+        "interview_status": "in_progress",
+        "asked_question_ids": [f"sof-{i:04d}" for i in range(step)],
+        "interview_history": [
+            {"question_id": f"sof-{i:04d}", "response": ANSWER, "evaluation": {"score": 7, "summary": ANSWER[:120]}}
+            for i in range(step)
+        ],
+        "overall_score": 7.0 * step,
+    }
+
+
+async def _session(saver: ShardedCheckpointSaver, steps: int, latencies: list) -> None:
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    for step in range(steps):
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = _state(step)
+        checkpoint["channel_versions"] = {key: step + 1 for key in checkpoint["channel_values"]}
+        started = time.perf_counter()
+        config = await saver.aput(config, checkpoint, {"source": "loop", "step": step}, checkpoint["channel_versions"])
+        await saver.aput_writes(config, [("feedback", ANSWER)], str(uuid.uuid4()))
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(shards: int, sessions: int, steps: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = shard_paths(os.path.join(tmp, "checkpoints.db"), shards)
+        async with open_sqlite_shards(paths) as savers:
+            saver = ShardedCheckpointSaver(savers)
+            latencies = []
+            started = time.perf_counter()
+            await asyncio.gather(*(_session(saver, steps, latencies) for _ in range(sessions)))
+            elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "supersteps_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+    }
+
+
+async def run(shard_counts, session_counts, steps: int) -> None:
+    print(f"{'shards':>6} {'sessions':>8} {'steps/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for sessions in session_counts:
+        for shards in shard_counts:
+            result = await measure(shards, sessions, steps)
+            print(f"{shards:>6} {sessions:>8} {result['supersteps_per_second']:>9.0f} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32, 128],
+                        help="Concurrent sessions writing at once.")
+    parser.add_argument("--steps", type=int, default=20, help="Checkpoints written per session.")
+    args = parser.parse_args()
+    asyncio.run(run(args.shards, args.sessions, args.steps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure API cold start: import time, startup time and time until ready.
+
+Each measurement runs in a fresh interpreter. ``import agent.models`` is what
+any tool importing the agent pays; ``startup`` is the FastAPI startup hooks;
+``ready`` is the time until ``GET /health/ready`` answers 200 with the
+background warm-up done. By default Mongo is the offline fake with
+``--bank-size`` questions per warmed role; ``--real-clients`` keeps the
+configured Mongo and Gemini instead (pair with an unreachable MONGODB_URI to
+see that startup no longer waits on it).
+
+    python -m benchmarks.cold_start --runs 5 --roles "Software Engineer" "Data Scientist"
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import agent.models
+imported_models = time.perf_counter() - started
+if not {real_clients}:
+    from benchmarks.fakes import FakeChatModel, FakeDatabase, install_fakes, make_question_docs
+    install_fakes(FakeChatModel(), FakeDatabase([d for r in {roles!r} for d in make_question_docs(r, {bank_size})]))
+import httpx
+from agent import api
+imported_api = time.perf_counter() - started
+
+async def main():
+    t0 = time.perf_counter()
+    async with api.api.router.lifespan_context(api.api):
+        startup = time.perf_counter() - t0
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.api), base_url="http://cold-start") as client:
+            live = (await client.get("/health/live")).status_code
+            while (await client.get("/health/ready")).status_code != 200:
+                if time.perf_counter() - t0 > {timeout}:
+                    return startup, None, live
+                await asyncio.sleep(0.005)
+            return startup, time.perf_counter() - t0, live
+
+startup, ready, live = asyncio.run(main())
+print(json.dumps({{"import_models": imported_models, "import_api": imported_api,
+                   "startup": startup, "ready": ready, "live_status": live}}))
+"""
+
+
+def _run_once(args) -> dict:
+    env = dict(os.environ)
+    env["WARMUP_JOB_ROLES"] = ",".join(args.roles)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    if not args.real_clients:
+        env["WARMUP_LLM"] = "false"
+    code = _CHILD.format(real_clients=args.real_clients, roles=args.roles, bank_size=args.bank_size, timeout=args.timeout)
+    with tempfile.TemporaryDirectory() as tmp:
+        env["CHECKPOINT_DB_PATH"] = os.path.join(tmp, "checkpoints.db")
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--roles", nargs="*", default=["Software Engineer"], help="WARMUP_JOB_ROLES for the run.")
+    parser.add_argument("--bank-size", type=int, default=300, help="Fake questions per role.")
+    parser.add_argument("--real-clients", action="store_true", help="Use the configured Mongo and Gemini.")
+    parser.add_argument("--timeout", type=float, default=60, help="Give up waiting for readiness after this.")
+    args = parser.parse_args()
+
+    runs = [_run_once(args) for _ in range(args.runs)]
+    print(f"{'phase':<14} {'median s':>9} {'max s':>7}")
+    for phase in ("import_models", "import_api", "startup", "ready"):
+        values = [r[phase] for r in runs if r[phase] is not None]
+        if values:
+            print(f"{phase:<14} {statistics.median(values):>9.3f} {max(values):>7.3f}")
+        else:
+            print(f"{phase:<14} {'not ready':>9}")
+
+
+if __name__ == "__main__":
+    main()
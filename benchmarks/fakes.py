@@ -0,0 +1,164 @@
+"""Offline stand-ins for Gemini and the Mongo ``questions`` collection.
+
+Benchmarks import this module before anything from ``agent`` so the agent can
+run without an API key, a database, or network access.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+os.environ.setdefault("NUM_QUESTIONS", "10")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("WARMUP_LLM", "false")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_QUESTION_ID_RE = re.compile(r"- ID: ([^,]+),")
+
+TOPICS = ["algorithms", "system design", "databases", "networking", "testing", "concurrency"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+FEEDBACK_TEXT = ("Your response covered the main idea clearly and mentioned relevant trade-offs. "
+                 "To improve, discuss failure modes and quantify the impact. Score: 7/10.")
+
+
+def make_question_docs(job_role: str, count: int) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{job_role}:{count}")
+    docs = []
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        docs.append({
+            "_id": f"{job_role[:3].lower()}-{i:04d}",
+            "job_role": job_role,
+            "text": f"Question {i} on {topic}: " + " ".join(
+                rng.choice(["explain", "compare", "design", "debug", "trade-offs", "scale", "cache", "index",
+                            "latency", "consistency", "queue", "retry"]) for _ in range(30)),
+            "topic": topic,
+            "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)],
+        })
+    return docs
+
+
+class FakeQuestionsCollection:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+        self.find_calls = 0
+
+    def find(self, filter: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        self.find_calls += 1
+        return iter([dict(doc) for doc in self.docs if all(doc.get(k) == v for k, v in filter.items())])
+
+
+class FakeDatabase:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.questions = FakeQuestionsCollection(docs)
+
+
+def scripted_reply(prompt: str, rng: random.Random) -> str:
+    """Answer each of the agent's prompts with a well-formed reply of realistic size."""
+    if "select the best next question" in prompt:
+        ids = _QUESTION_ID_RE.findall(prompt)
+        if not ids:
+            return json.dumps({"action": "end_interview", "reason": "No questions left."})
+        return "```json\n" + json.dumps({"action": "ask_question", "selected_question_id": rng.choice(ids)}) + "\n```"
+    if "evaluating a candidate's response" in prompt:
+        score = rng.randint(3, 9)
+        reply = {
+            "analysis": {
+                "key_points_extracted": ["point one about the approach", "point two about trade-offs"],
+                "relevance_to_question": "high",
+                "clarity_assessment": "clear",
+                "technical_accuracy_assessment": "mostly accurate",
+                "confidence_level": "medium",
+                "sentiment": "neutral",
+                "keywords": ["cache", "latency", "index"],
+            },
+            "evaluation": {
+                "score": score,
+                "overall_evaluation_summary": "Solid answer that covers the main idea but misses some edge cases.",
+                "relevance_judgment": "Relevant",
+                "strengths": ["Clear structure", "Mentions trade-offs"],
+                "areas_for_improvement": ["Discuss failure modes", "Quantify the impact"],
+            },
+        }
+        if '"feedback":' in prompt:
+            reply["feedback"] = FEEDBACK_TEXT
+        return json.dumps(reply)
+    return FEEDBACK_TEXT
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers with scripted, well-formed replies.
+
+    Each call takes ``latency_seconds`` plus or minus up to ``jitter_seconds``.
+    When streamed, the reply arrives in ``stream_chunks`` pieces spread over
+    that time, like the feedback tokens from Gemini.
+    """
+
+    seed: int = 0
+    calls: int = 0
+    latency_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    stream_chunks: int = 8
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-interview"
+
+    def _script(self, messages: List[BaseMessage]) -> tuple[str, float]:
+        self.calls += 1
+        rng = random.Random(f"{self.seed}:{self.calls}")
+        content = scripted_reply(str(messages[-1].content), rng)
+        delay = max(0.0, self.latency_seconds + rng.uniform(-self.jitter_seconds, self.jitter_seconds))
+        return content, delay
+
+    @staticmethod
+    def _result(content: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _pieces(self, content: str) -> List[str]:
+        size = max(1, -(-len(content) // max(1, self.stream_chunks)))
+        return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content, delay = self._script(messages)
+        time.sleep(delay)
+        return self._result(content)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content, delay = self._script(messages)
+        await asyncio.sleep(delay)
+        return self._result(content)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        content, delay = self._script(messages)
+        pieces = self._pieces(content)
+        for piece in pieces:
+            time.sleep(delay / len(pieces))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        content, delay = self._script(messages)
+        pieces = self._pieces(content)
+        for piece in pieces:
+            await asyncio.sleep(delay / len(pieces))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+
+def install_fakes(llm: BaseChatModel, database: FakeDatabase) -> None:
+    """Point the agent's lazily created clients at the fakes."""
+    import agent.config
+
+    agent.config.llm = llm
+    agent.config.db = database
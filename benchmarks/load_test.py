@@ -0,0 +1,273 @@
+"""Drive the FastAPI app with concurrent simulated candidates.
+
+Each candidate starts an interview and answers until it completes, against the
+fake chat model (with configurable latency and jitter) and an in-memory
+question bank, through the real ASGI app, graph and SQLite checkpointer. The
+report covers per-endpoint latency percentiles, throughput, time per graph
+node and in the LLM, checkpoint database growth and process RSS.
+
+    python -m benchmarks.load_test --candidates 50 --questions-per-interview 5 --llm-latency 0.3 --llm-jitter 0.1
+
+Pass ``--json report.json`` to keep a machine-readable baseline.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from .fakes import FakeChatModel, FakeDatabase, install_fakes, make_question_docs
+
+JOB_ROLE = "Software Engineer"
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Wall time of every graph node run and every chat model call."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[Any, tuple[str, float]] = {}
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and name == node:
+            self._started[run_id] = (f"node:{node}", time.perf_counter())
+
+    def _stop(self, run_id) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.samples[started[0]].append(time.perf_counter() - started[1])
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._stop(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        # The node waiting for the answer ends by interrupting the graph, which surfaces as an error.
+        self._stop(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = ("llm", time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._stop(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._stop(run_id)
+
+
+_node_timer: ContextVar[Optional[NodeTimer]] = ContextVar("benchmark_node_timer", default=None)
+register_configure_hook(_node_timer, inheritable=True)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _db_stats(db_paths: List[str]) -> Dict[str, int]:
+    stats = {"bytes": 0, "checkpoints": 0, "writes": 0}
+    for db_path in db_paths:
+        stats["bytes"] += sum(os.path.getsize(db_path + s) for s in ("", "-wal") if os.path.exists(db_path + s))
+        if not os.path.exists(db_path):
+            continue
+        with sqlite3.connect(db_path) as conn:
+            try:
+                stats["checkpoints"] += conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+                stats["writes"] += conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+            except sqlite3.OperationalError:
+                pass
+    return stats
+
+
+async def _candidate(client, index: int, args, latencies: Dict[str, List[float]], outcomes: Dict[str, int]) -> None:
+    started = time.perf_counter()
+    response = await client.post("/interview/start", json={"job_role": JOB_ROLE, "candidate_id": f"candidate-{index}"})
+    latencies["POST /interview/start"].append(time.perf_counter() - started)
+    data = response.json()
+    session_id = data.get("session_id")
+
+    submit_path = "/interview/{id}/submit_answer/stream" if args.stream else "/interview/{id}/submit_answer"
+    turn = 0
+    while response.status_code == 200 and data.get("status") == "in_progress":
+        turn += 1
+        if args.think_ms:
+            await asyncio.sleep(args.think_ms / 1000)
+        answer = f"Answer {turn}: I would cache hot reads, index the lookups and measure latency under load."
+        if not args.repeat_answers:
+            answer = f"Candidate {index}. " + answer
+        started = time.perf_counter()
+        response = await client.post(submit_path.format(id=session_id), json={"candidate_response": answer})
+        latencies[f"POST {submit_path}"].append(time.perf_counter() - started)
+        if args.stream:
+            data = {"status": "error"}
+            for block in response.text.split("\n\n"):
+                if block.startswith("event: result"):
+                    data = json.loads(block.split("data: ", 1)[1])
+        else:
+            data = response.json()
+
+    outcomes[data.get("status", f"http_{response.status_code}")] += 1
+
+
+async def run(args) -> Dict[str, Any]:
+    os.environ["NUM_QUESTIONS"] = str(args.questions_per_interview)
+    if args.llm_rate is not None:
+        os.environ["LLM_RATE_PER_MINUTE"] = str(args.llm_rate)
+    tmp = tempfile.TemporaryDirectory()
+    db_path = os.path.join(tmp.name, "checkpoints.db")
+    os.environ["CHECKPOINT_DB_PATH"] = db_path
+    os.environ["CHECKPOINT_SHARDS"] = str(args.checkpoint_shards)
+
+    llm = FakeChatModel(latency_seconds=args.llm_latency, jitter_seconds=args.llm_jitter)
+    database = FakeDatabase(make_question_docs(JOB_ROLE, args.bank_size))
+    install_fakes(llm, database)
+
+    import httpx
+    from agent import api as api_module
+    from agent.checkpointing import shard_paths
+    from agent.llm_dispatcher import llm_dispatcher
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    timer = NodeTimer()
+    _node_timer.set(timer)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    outcomes: Dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency or args.candidates)
+    rss_before = _rss_bytes()
+    db_paths = shard_paths(db_path, args.checkpoint_shards)
+
+    async def limited(client, index):
+        async with semaphore:
+            await _candidate(client, index, args, latencies, outcomes)
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        async with api_module.api.router.lifespan_context(api_module.api):
+            db_before = _db_stats(db_paths)
+            transport = httpx.ASGITransport(app=api_module.api)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+                started = time.perf_counter()
+                await asyncio.gather(*(limited(client, i) for i in range(args.candidates)))
+                elapsed = time.perf_counter() - started
+            db_after = _db_stats(db_paths)
+
+    rss_after = _rss_bytes()
+    requests = sum(len(v) for v in latencies.values())
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "elapsed_seconds": elapsed,
+        "requests": requests,
+        "requests_per_second": requests / elapsed if elapsed else 0.0,
+        "interviews_per_second": args.candidates / elapsed if elapsed else 0.0,
+        "outcomes": dict(outcomes),
+        "llm_calls": llm.calls,
+        "question_finds": database.questions.find_calls,
+        "endpoints": {name: _percentiles(samples) for name, samples in sorted(latencies.items())},
+        "timings": {name: _percentiles(samples) for name, samples in sorted(timer.samples.items())},
+        "checkpoint_db": {
+            "before": db_before,
+            "after": db_after,
+            "growth_bytes": db_after["bytes"] - db_before["bytes"],
+            "bytes_per_interview": (db_after["bytes"] - db_before["bytes"]) / max(1, args.candidates),
+        },
+        "llm_dispatcher": llm_dispatcher.stats(),
+        "rss": {
+            "before_bytes": rss_before,
+            "after_bytes": rss_after,
+            # ru_maxrss is reported in kilobytes on Linux.
+            "peak_bytes": max(rss_after, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024),
+        },
+    }
+    tmp.cleanup()
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"candidates: {report['config']['candidates']}, outcomes: {report['outcomes']}, "
+          f"elapsed: {report['elapsed_seconds']:.2f}s, {report['requests_per_second']:.1f} req/s, "
+          f"{report['interviews_per_second']:.2f} interviews/s, LLM calls: {report['llm_calls']}")
+
+    for title, section in (("endpoint", report["endpoints"]), ("node / llm", report["timings"])):
+        print(f"\n{title:<44} {'count':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        for name, stats in section.items():
+            if not stats["count"]:
+                continue
+            print(f"{name:<44} {stats['count']:>6} {stats['mean_ms']:>8.1f} {stats['p50_ms']:>8.1f} "
+                  f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+
+    db = report["checkpoint_db"]
+    print(f"\ncheckpoint db: {db['before']['bytes']:,} -> {db['after']['bytes']:,} bytes "
+          f"({db['bytes_per_interview']:,.0f} per interview), "
+          f"{db['after']['checkpoints']} checkpoints, {db['after']['writes']} writes")
+    dispatcher = report["llm_dispatcher"]
+    print(f"llm dispatcher: max queue depth {dispatcher['max_queue_depth']}, "
+          f"wait p50 {dispatcher['wait_seconds_p50'] * 1000:.1f} ms, p95 {dispatcher['wait_seconds_p95'] * 1000:.1f} ms, "
+          f"retries {dispatcher['retries']}, failed {dispatcher['failed']}")
+    rss = report["rss"]
+    print(f"rss: {rss['before_bytes'] / 2**20:.1f} -> {rss['after_bytes'] / 2**20:.1f} MiB "
+          f"(peak {rss['peak_bytes'] / 2**20:.1f} MiB)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20, help="Simulated candidates, one interview each.")
+    parser.add_argument("--concurrency", type=int, default=0, help="Candidates active at once (default: all).")
+    parser.add_argument("--questions-per-interview", type=int, default=5)
+    parser.add_argument("--bank-size", type=int, default=300, help="Questions in the role's bank.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mean fake LLM latency in seconds.")
+    parser.add_argument("--llm-jitter", type=float, default=0.05, help="Uniform jitter around the mean, in seconds.")
+    parser.add_argument("--llm-rate", type=float, default=None, help="Override LLM_RATE_PER_MINUTE (0 = unlimited).")
+    parser.add_argument("--checkpoint-shards", type=int, default=1, help="CHECKPOINT_SHARDS for the run.")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause before each answer.")
+    parser.add_argument("--stream", action="store_true", help="Submit answers through the SSE endpoint.")
+    parser.add_argument("--repeat-answers", action="store_true",
+                        help="Give every candidate the same answers (exercises the LLM result cache).")
+    parser.add_argument("--json", help="Also write the report to this file.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the agent's own output.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.json}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare the classic and lean graph topologies per interview turn.
+
+Runs ``--sessions`` concurrent interviews of ``--turns`` questions through each
+topology, compiled against a throwaway SQLite checkpointer wrapped as the API
+wraps it, and reports the latency of each answered turn (the resume call the
+submit endpoint makes) along with the checkpoints and pending writes stored per
+turn. ``--llm-latency`` adds a fake model delay; at the default of 0 the
+latency is mostly graph and checkpoint overhead.
+
+    python -m benchmarks.topology --sessions 8 --turns 10
+    python -m benchmarks.topology --llm-latency 0.2 --evaluation-mode fused
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+from .fakes import FakeChatModel, FakeDatabase, install_fakes, make_question_docs
+
+
+def _row_counts(db_path: str) -> tuple[int, int]:
+    with sqlite3.connect(db_path) as conn:
+        checkpoints = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        writes = conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+    return checkpoints, writes
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+
+async def _interview(app, session: int, turns: int, latencies: list) -> dict:
+    from langgraph.types import Command
+    from agent.models import InterviewState
+
+    thread_id = f"topology-{session}"
+    config = {"configurable": {"thread_id": thread_id}}
+    state = await app.ainvoke(
+        InterviewState(job_role="Software Engineer", candidate_id=thread_id, total_questions_planned=turns),
+        config=config,
+    )
+    turn = 0
+    while state.get("interview_status") == "in_progress":
+        turn += 1
+        started = time.perf_counter()
+        state = await app.ainvoke(Command(resume=f"Answer number {turn} with some detail."), config=config)
+        latencies.append(time.perf_counter() - started)
+    return state
+
+
+async def measure(topology: str, sessions: int, turns: int, llm: FakeChatModel) -> dict:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    from agent.checkpointing import DeltaCheckpointSaver
+    from agent.graph import build_workflow
+    from agent.models import APPEND_ONLY_CHANNELS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "checkpoints.db")
+        async with AsyncSqliteSaver.from_conn_string(db_path) as saver:
+            checkpointer = DeltaCheckpointSaver(saver, APPEND_ONLY_CHANNELS)
+            await checkpointer.setup()
+            app = build_workflow(topology).compile(checkpointer=checkpointer)
+            latencies = []
+            calls_before = llm.calls
+            started = time.perf_counter()
+            states = await asyncio.gather(*(_interview(app, i, turns, latencies) for i in range(sessions)))
+            elapsed = time.perf_counter() - started
+            checkpoints, writes = _row_counts(db_path)
+
+    answered = len(latencies)
+    latencies.sort()
+    return {
+        "topology": topology,
+        "turns": answered,
+        "completed": sum(state.get("interview_status") == "completed" for state in states),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "checkpoints_per_turn": checkpoints / answered,
+        "writes_per_turn": writes / answered,
+        "llm_calls_per_turn": (llm.calls - calls_before) / answered,
+        "mean_score": sum(state.get("overall_score", 0.0) for state in states) / sessions,
+        "elapsed_s": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topologies", nargs="*", default=["classic", "lean"])
+    parser.add_argument("--sessions", type=int, default=8, help="Interviews run concurrently per topology.")
+    parser.add_argument("--turns", type=int, default=10, help="Questions asked per interview.")
+    parser.add_argument("--questions", type=int, default=300, help="Questions in the role's bank.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake model latency per call, in seconds.")
+    parser.add_argument("--evaluation-mode", choices=["two_call", "fused"], help="Override EVALUATION_MODE.")
+    args = parser.parse_args()
+
+    if args.evaluation_mode:
+        os.environ["EVALUATION_MODE"] = args.evaluation_mode
+    # Both topologies should make the same model calls: no rate limit to queue
+    # behind and no cached evaluations carried from one run to the next.
+    os.environ["LLM_RATE_PER_MINUTE"] = "0"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    database = FakeDatabase(make_question_docs("Software Engineer", args.questions))
+
+    print(f"{'topology':<9} {'turns':>5} {'done':>5} {'p50 ms':>8} {'p95 ms':>8} {'ckpt/turn':>10} "
+          f"{'writes/turn':>12} {'llm/turn':>9} {'score':>6}")
+    for topology in args.topologies:
+        llm = FakeChatModel(latency_seconds=args.llm_latency)
+        install_fakes(llm, database)
+        r = asyncio.run(measure(topology, args.sessions, args.turns, llm))
+        print(f"{r['topology']:<9} {r['turns']:>5} {r['completed']:>5} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['checkpoints_per_turn']:>10.1f} {r['writes_per_turn']:>12.1f} {r['llm_calls_per_turn']:>9.1f} "
+              f"{r['mean_score']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
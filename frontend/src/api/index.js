@@ -9,11 +9,61 @@ export const startInterview = async (jobRole, candidateId) => {
   return response.json();
 };
 
-export const submitAnswer = async (sessionId, candidateResponse) => {
+const withIdempotencyKey = (headers, idempotencyKey) =>
+  idempotencyKey ? { ...headers, 'Idempotency-Key': idempotencyKey } : headers;
+
+// Pass the same `idempotencyKey` when retrying an answer so the server replays
+// its first response instead of answering twice.
+export const submitAnswer = async (sessionId, candidateResponse, idempotencyKey) => {
   const response = await fetch(`${API_BASE}/interview/${sessionId}/submit_answer`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: withIdempotencyKey({ 'Content-Type': 'application/json' }, idempotencyKey),
     body: JSON.stringify({ candidate_response: candidateResponse })
   });
   return response.json();
-};
\ No newline at end of file
+};
+// Streams the answer through the server-sent events endpoint. `onEvent(event, data)`
+// is called for every event (node_start, node_end, feedback_token, feedback,
+// question, result, error); the promise resolves with the final response.
+export const submitAnswerStream = async (sessionId, candidateResponse, onEvent, idempotencyKey) => {
+  const response = await fetch(`${API_BASE}/interview/${sessionId}/submit_answer/stream`, {
+    method: 'POST',
+    headers: withIdempotencyKey({ 'Content-Type': 'application/json', Accept: 'text/event-stream' }, idempotencyKey),
+    body: JSON.stringify({ candidate_response: candidateResponse })
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Streaming request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+
+  const dispatch = (block) => {
+    let event = 'message';
+    const dataLines = [];
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+    }
+    if (dataLines.length === 0) return;
+    const data = JSON.parse(dataLines.join('\n'));
+    if (event === 'result' || event === 'error') result = data;
+    if (onEvent) onEvent(event, data);
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      dispatch(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+    }
+  }
+  if (buffer.trim()) dispatch(buffer);
+
+  return result;
+};
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useInterview } from '../context/InterviewContext';
-import { submitAnswer } from '../api';
+import { submitAnswerStream } from '../api';
 import {
   Container,
   TextField,
@@ -17,6 +17,7 @@ export default function Interview() {
   const { sessionId, interviewData, updateInterviewData } = useInterview();
   const [answer, setAnswer] = useState('');
   const [loading, setLoading] = useState(false);
+  const [streamingFeedback, setStreamingFeedback] = useState('');
 
   if (!sessionId) {
     return (
@@ -45,8 +46,17 @@ export default function Interview() {
     }
 
     setLoading(true);
+    setStreamingFeedback('');
+    // One key per question, so resubmitting after a lost response replays it.
+    const idempotencyKey = `${sessionId}:${interviewData?.current_question?.id}`;
     try {
-      const response = await submitAnswer(sessionId, answer);
+      const response = await submitAnswerStream(sessionId, answer, (event, data) => {
+        if (event === 'feedback_token') {
+          setStreamingFeedback((text) => text + data.text);
+        } else if (event === 'feedback') {
+          setStreamingFeedback(data.text);
+        }
+      }, idempotencyKey);
       updateInterviewData(response);
       setAnswer('');
     } catch (error) {
@@ -54,9 +64,11 @@ export default function Interview() {
       alert('Failed to submit answer. Please try again.');
     } finally {
       setLoading(false);
+      setStreamingFeedback('');
     }
   };
 
+  const feedbackText = loading && streamingFeedback ? streamingFeedback : interviewData?.feedback;
   const hasQuestion = interviewData && interviewData.current_question;
   const isInterviewOver = interviewData && interviewData.overall_score != null;
 
@@ -125,9 +137,9 @@ export default function Interview() {
               <Typography variant="h6" gutterBottom>
                 Feedback
               </Typography>
-              {interviewData?.feedback ? (
+              {feedbackText ? (
                 <Typography variant="body1">
-                  {interviewData.feedback}
+                  {feedbackText}
                 </Typography>
               ) : (
                 <Typography variant="body2" color="textSecondary">